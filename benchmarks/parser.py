@@ -0,0 +1,69 @@
+import sys
+import timeit
+import tomllib
+from pathlib import Path
+
+import typer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dsmr import TelegramParser  # noqa: E402
+from dsmr.TelegramParser import crc16  # noqa: E402
+
+FIELDS = (
+    'EQUIPMENT_IDENTIFIER',
+    'ELECTRICITY_USED_TARIFF_1',
+    'ELECTRICITY_USED_TARIFF_2',
+    'CURRENT_ELECTRICITY_USAGE',
+    'CURRENT_ELECTRICITY_DELIVERY',
+)
+
+app = typer.Typer()
+
+
+def _sample_telegram() -> str:
+    with open(ROOT / 'meteread.toml', 'rb') as f:
+        raw = tomllib.load(f)['meters']['raw']['reader']['reader']['raw']
+    body = raw[:raw.index('!') + 1]
+    return raw.replace('!0000', f'!{crc16(body.encode()):04X}')
+
+
+def _read_telegram(parse, raw: str) -> None:
+    telegram = parse(raw)
+    for name in FIELDS:
+        getattr(telegram, name).value
+    for device in telegram.MBUS_DEVICES:
+        device.MBUS_METER_READING.value
+
+
+def _read_reading(parse, raw: str) -> None:
+    reading = parse(raw)
+    reading.sn, reading.t1, reading.t2, reading.current, reading.returned
+    reading.mbus[3].reading
+
+
+@app.command()
+def parser(runs: int = 5, number: int = 2000, checksum: bool = True):
+    from dsmr_parser import telegram_specifications
+    from dsmr_parser.parsers import TelegramParser as DsmrTelegramParser
+
+    raw = _sample_telegram()
+    parsers = (
+        ('dsmr_parser', _read_telegram, DsmrTelegramParser(telegram_specifications.V5, apply_checksum_validation=checksum)),
+        ('telegram', _read_telegram, TelegramParser(validate_checksum=checksum)),
+        ('reading', _read_reading, TelegramParser(validate_checksum=checksum, output='reading')),
+    )
+
+    baseline = None
+    for label, read, telegram_parser in parsers:
+        best = min(timeit.repeat(lambda: read(telegram_parser.parse, raw), number=number, repeat=runs)) / number
+        baseline = baseline or best
+        typer.echo(
+            f"{label:<12} {best * 1e6:8.1f}us/telegram {1 / best:10.0f} telegrams/s "
+            f"{baseline / best:5.1f}x (checksum={'on' if checksum else 'off'})"
+        )
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,234 @@
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import tomllib
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from itertools import cycle
+from pathlib import Path
+from time import perf_counter_ns
+from unittest.mock import patch
+
+import typer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dsmr import TelegramParser  # noqa: E402
+from dsmr.TelegramParser import crc16  # noqa: E402
+from meter import GenericMeter  # noqa: E402
+from processor import ChainProcessor, DSMRElectricityProcessor, DSMRGasProcessor, PassProcessor  # noqa: E402
+from reader import AbstractReader, DSMRv5RawReader, RandomReader  # noqa: E402
+from storage import AbstractStorage, CsvStorage  # noqa: E402
+
+SCENARIOS = (
+    'raw/electricity/memory',
+    'raw/gas/memory',
+    'raw/chain/memory',
+    'synthetic/chain/memory',
+    'synthetic/chain/csv',
+    'synthetic/chain/influx',
+    'random/pass/none',
+)
+
+app = typer.Typer()
+
+
+def _sample_telegram() -> str:
+    with open(ROOT / 'meteread.toml', 'rb') as f:
+        return tomllib.load(f)['meters']['raw']['reader']['reader']['raw']
+
+
+def _sign(raw: str) -> str:
+    body = raw[:raw.index('!') + 1]
+    return f"{body}{crc16(body.encode()):04X}\r\n"
+
+
+class SyntheticReader(AbstractReader):
+    def __init__(self, raw: str, count: int = 1000):
+        start = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        telegrams = []
+        for i in range(count):
+            stamp = (start + timedelta(seconds=i)).strftime('%y%m%d%H%M%S')
+            telegram = (
+                raw.replace('210101000000W', f'{stamp}W')
+                .replace('001234.567*kWh', f'{1234.567 + i / 1000:010.3f}*kWh')
+                .replace('01.500*kW', f'{(i % 5000) / 1000:06.3f}*kW')
+            )
+            telegrams.append(_sign(telegram))
+        self._telegrams = cycle(telegrams)
+        self._parser = TelegramParser(output='reading')
+
+    def __next__(self):
+        return self._parser.parse(next(self._telegrams))
+
+
+class MemoryStorage(AbstractStorage):
+    def __init__(self):
+        self.points = 0
+        self.last = None
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        self.points += 1
+        self.last = (measurement, tags, fields, timestamp)
+
+
+class _DiscardingClient:
+    def __init__(self, **kwargs):
+        self.lines = 0
+
+    def write(self, record) -> None:
+        for point in record if isinstance(record, list) else [record]:
+            point.to_line_protocol()
+            self.lines += 1
+
+    def close(self) -> None:
+        pass
+
+
+def _reader(name: str, raw: str) -> AbstractReader:
+    if name == 'raw':
+        return DSMRv5RawReader(raw)
+    if name == 'synthetic':
+        return SyntheticReader(raw)
+    if name == 'random':
+        return RandomReader()
+    raise typer.BadParameter(f"unknown reader {name!r}")
+
+
+def _storage(name: str, directory: Path) -> AbstractStorage | None:
+    if name == 'none':
+        return None
+    if name == 'memory':
+        return MemoryStorage()
+    if name == 'csv':
+        return CsvStorage(str(directory / 'readings.csv'), buffer_size=100)
+    if name == 'influx':
+        from storage import InfluxDBStorage
+
+        with patch('influxdb_client_3.InfluxDBClient3', _DiscardingClient):
+            return InfluxDBStorage(host='http://localhost', database='bench', batch_size=100)
+    raise typer.BadParameter(f"unknown storage {name!r}")
+
+
+def _processor(name: str, storage: AbstractStorage | None):
+    if name == 'electricity':
+        return DSMRElectricityProcessor(storage=storage)
+    if name == 'gas':
+        return DSMRGasProcessor(storage=storage)
+    if name == 'chain':
+        return ChainProcessor(DSMRElectricityProcessor(storage=storage), DSMRGasProcessor(storage=storage))
+    if name == 'pass':
+        return PassProcessor()
+    raise typer.BadParameter(f"unknown processor {name!r}")
+
+
+def _meter(scenario: str, raw: str, directory: Path) -> tuple[GenericMeter, AbstractStorage | None]:
+    reader, processor, storage = scenario.split('/')
+    storage = _storage(storage, directory)
+    return GenericMeter(scenario, _reader(reader, raw), _processor(processor, storage)), storage
+
+
+def _time(meter, number: int) -> dict:
+    timings = []
+    gc.collect()
+    started = perf_counter_ns()
+    for _ in range(number):
+        before = perf_counter_ns()
+        meter()
+        timings.append(perf_counter_ns() - before)
+    elapsed = perf_counter_ns() - started
+    return {
+        'telegrams_per_s': number / (elapsed / 1e9),
+        'p50_us': statistics.median(timings) / 1000,
+        'p99_us': statistics.quantiles(timings, n=100)[98] / 1000,
+    }
+
+
+def _run(scenario: str, raw: str, number: int, warmup: int, repeats: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        meter, storage = _meter(scenario, raw, Path(directory))
+        for _ in range(warmup):
+            meter()
+
+        runs = [_time(meter, number) for _ in range(repeats)]
+
+        tracemalloc.start()
+        blocks = sys.getallocatedblocks()
+        for _ in range(number):
+            meter()
+        retained = sys.getallocatedblocks() - blocks
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        if storage is not None:
+            storage.close()
+
+    result = {}
+    for metric in ('telegrams_per_s', 'p50_us', 'p99_us'):
+        values = [run[metric] for run in runs]
+        result[metric] = statistics.median(values)
+        # Relative spread between repeats, used as extra allowance when comparing.
+        result[f'{metric}_spread'] = (max(values) - min(values)) / result[metric]
+    return {
+        **result,
+        'repeats': repeats,
+        'peak_kib': peak / 1024,
+        'retained_blocks_per_telegram': retained / number,
+    }
+
+
+def _regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    failures = []
+    for scenario, result in results.items():
+        expected = baseline.get(scenario)
+        if expected is None:
+            continue
+        # Medians over the repeats are compared; p99 is too noisy for a single host to gate on.
+        allowance = tolerance + result.get('telegrams_per_s_spread', 0)
+        if result['telegrams_per_s'] < expected['telegrams_per_s'] * (1 - allowance):
+            failures.append(
+                f"{scenario}: {result['telegrams_per_s']:.0f} telegrams/s, baseline {expected['telegrams_per_s']:.0f}"
+            )
+        allowance = tolerance + result.get('p50_us_spread', 0)
+        if result['p50_us'] > expected['p50_us'] * (1 + allowance):
+            failures.append(f"{scenario}: p50 {result['p50_us']:.1f}us, baseline {expected['p50_us']:.1f}us")
+    return failures
+
+
+@app.command()
+def pipeline(
+    scenarios: list[str] = typer.Argument(None, help=f"reader/processor/storage, default: {' '.join(SCENARIOS)}"),
+    number: int = 5000,
+    warmup: int = 500,
+    repeats: int = typer.Option(5, min=1, help="timed runs per scenario; the median is reported"),
+    save: Path = typer.Option(None, help="write the results to this baseline file"),
+    compare: Path = typer.Option(None, help="fail if results regress against this baseline file"),
+    tolerance: float = 0.2,
+):
+    raw = _sign(_sample_telegram())
+    results = {}
+    for scenario in scenarios or SCENARIOS:
+        result = results[scenario] = _run(scenario, raw, number, warmup, repeats)
+        typer.echo(
+            f"{scenario:<24} {result['telegrams_per_s']:10.0f} telegrams/s (±{result['telegrams_per_s_spread']:4.0%}) "
+            f"p50={result['p50_us']:7.1f}us p99={result['p99_us']:7.1f}us "
+            f"peak={result['peak_kib']:8.1f}KiB retained={result['retained_blocks_per_telegram']:.2f} blocks/telegram"
+        )
+
+    if save is not None:
+        save.write_text(json.dumps(results, indent=2) + '\n')
+        typer.echo(f"baseline saved to {save}")
+    if compare is not None:
+        failures = _regressions(results, json.loads(compare.read_text()), tolerance)
+        for failure in failures:
+            typer.echo(f"regression: {failure}", err=True)
+        if failures:
+            raise typer.Exit(1)
+        typer.echo(f"no regressions against {compare} (tolerance {tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,42 @@
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import typer
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('influxdb_client_3', 'pyarrow', 'dsmr_parser', 'serial')
+
+app = typer.Typer()
+
+
+def _time(args: list[str], runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _loaded_heavy_modules() -> list[str]:
+    code = f"import sys, main; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+@app.command()
+def startup(runs: int = 10):
+    for label, args in (('import main', ['-c', 'import main']), ('main.py main', ['main.py', 'main'])):
+        timings = _time(args, runs)
+        typer.echo(
+            f"{label:<14} median={statistics.median(timings) * 1000:7.1f}ms "
+            f"min={min(timings) * 1000:7.1f}ms max={max(timings) * 1000:7.1f}ms runs={runs}"
+        )
+    typer.echo(f"heavy modules loaded by 'import main': {', '.join(_loaded_heavy_modules()) or 'none'}")
+
+
+if __name__ == '__main__':
+    app()
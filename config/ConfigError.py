@@ -0,0 +1,2 @@
+class ConfigError(ValueError):
+    pass
@@ -0,0 +1,348 @@
+import inspect
+import os
+import re
+import tomllib
+import types
+import typing
+from pathlib import Path
+from typing import NamedTuple
+
+import processor
+import reader
+import storage
+from config import ConfigError, MeterGraph
+from meter import GenericMeter
+from metrics import Metrics, MetricsServer, StatsLogger
+from reader import BroadcastReader
+from storage import AbstractStorage, InstrumentedStorage
+
+PACKAGES = {'reader': reader, 'processor': processor, 'storage': storage}
+SECTIONS = {'readers': 'reader', 'processors': 'processor', 'storages': 'storage'}
+COMPONENT_KEYS = {
+    'reader': 'reader',
+    'processor': 'processor',
+    'processors': 'processor',
+    'storage': 'storage',
+    'storages': 'storage',
+}
+METRICS_KEYS = {'enabled': bool, 'host': str, 'port': int, 'log_interval': (int, float)}
+ENV_VAR = re.compile(r'\$\{(\w+)(?::-([^}]*))?\}')
+INTEGER = re.compile(r'[+-]?\d+')
+BOOLEANS = {'true': True, 'false': False}
+
+
+class _Ref(NamedTuple):
+    kind: str
+    name: str
+
+
+class _New(NamedTuple):
+    kind: str
+    cls: type
+    args: tuple
+    kwargs: dict
+
+
+class MeterConfig:
+    def __init__(self, data: dict, source: str = '<config>'):
+        self.source = source
+
+        unknown = set(data) - set(SECTIONS) - {'meters', 'metrics'}
+        if unknown:
+            raise ConfigError(f"{source}: unknown section(s) {', '.join(sorted(unknown))}")
+
+        self.metrics = self._compile_metrics(data.get('metrics'))
+
+        self.components: dict[tuple[str, str], _New] = {}
+        for section, kind in SECTIONS.items():
+            for name, spec in data.get(section, {}).items():
+                self.components[(kind, name)] = self._compile(kind, spec, f"{section}.{name}")
+
+        self.meters: dict[str, tuple[str, object, object]] = {}
+        self.batch_sizes: dict[str, int] = {}
+        for key, spec in data.get('meters', {}).items():
+            path = f"meters.{key}"
+            if not isinstance(spec, dict):
+                raise ConfigError(f"{path}: expected a table")
+            missing = {'reader', 'processor'} - set(spec)
+            if missing:
+                raise ConfigError(f"{path}: missing {', '.join(sorted(missing))}")
+            extra = set(spec) - {'name', 'reader', 'processor', 'batch_size'}
+            if extra:
+                raise ConfigError(f"{path}: unknown key(s) {', '.join(sorted(extra))}")
+            if 'batch_size' in spec:
+                batch_size = _expand(spec['batch_size'], (int,))
+                if not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size < 1:
+                    raise ConfigError(f"{path}.batch_size: must be a positive integer")
+                self.batch_sizes[key] = batch_size
+            self.meters[key] = (
+                spec.get('name', key),
+                self._compile('reader', spec['reader'], f"{path}.reader"),
+                self._compile('processor', spec['processor'], f"{path}.processor"),
+            )
+
+        for (kind, name), component in self.components.items():
+            self._check_cycles(component, [(kind, name)])
+        for _, reader_plan, processor_plan in self.meters.values():
+            self._check_cycles([reader_plan, processor_plan], [])
+
+    @classmethod
+    def load(cls, path: str) -> 'MeterConfig':
+        resolved = Path(path).resolve()
+        try:
+            with open(resolved, 'rb') as f:
+                data = tomllib.load(f)
+        except FileNotFoundError:
+            raise ConfigError(f"{path}: file not found") from None
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError(f"{resolved}: {e}") from None
+        return cls(data, source=str(resolved))
+
+    def build(
+        self,
+        names: list[str] | None = None,
+        storages: dict[str, AbstractStorage] | None = None,
+        metrics: bool = True,
+    ) -> MeterGraph:
+        names = self._check_names(names)
+        metrics = self._metrics() if metrics else None
+        shared = {('storage', name): storage for name, storage in (storages or {}).items()}
+        created = []
+        wrapped = set()
+        meters = {}
+        for key in names:
+            name, reader_plan, processor_plan = self.meters[key]
+            meters[key] = GenericMeter(
+                name=name,
+                reader=self._instantiate(reader_plan, shared, created, wrapped, metrics),
+                processor=self._instantiate(processor_plan, shared, created, wrapped, metrics),
+                metrics=metrics,
+                batch_size=self.batch_sizes.get(key),
+            )
+
+        return MeterGraph(
+            meters=meters,
+            storages=[s for s in created if id(s) not in wrapped],
+            metrics=metrics,
+            exporters=self._exporters(metrics),
+        )
+
+    def build_storages(self, names: list[str] | None = None) -> MeterGraph:
+        metrics = self._metrics()
+        shared = {}
+        created = []
+        wrapped = set()
+        named = {
+            name: self._instantiate(_Ref('storage', name), shared, created, wrapped, metrics)
+            for name in self.storage_references(names)
+        }
+        return MeterGraph(
+            meters={},
+            storages=[s for s in created if id(s) not in wrapped],
+            metrics=metrics,
+            exporters=self._exporters(metrics),
+            named_storages=named,
+        )
+
+    def references(self, key: str, kind: str) -> list[str]:
+        _, reader_plan, processor_plan = self.meters[key]
+        found = []
+        self._collect_references([reader_plan, processor_plan], kind, found)
+        return found
+
+    def storage_references(self, names: list[str] | None = None) -> list[str]:
+        found = []
+        for key in self._check_names(names):
+            found.extend(name for name in self.references(key, 'storage') if name not in found)
+        return found
+
+    def _check_names(self, names: list[str] | None) -> list[str]:
+        names = list(names or self.meters)
+        unknown = [name for name in names if name not in self.meters]
+        if unknown:
+            raise ConfigError(f"{self.source}: unknown meter(s) {', '.join(unknown)}")
+        return names
+
+    def _collect_references(self, plan, kind: str, found: list) -> None:
+        for child in _children(plan):
+            if isinstance(child, _Ref) and child.kind == kind:
+                if child.name not in found:
+                    found.append(child.name)
+            elif isinstance(child, _Ref):
+                self._collect_references(self.components[(child.kind, child.name)], kind, found)
+            else:
+                self._collect_references(child, kind, found)
+
+    def _metrics(self) -> Metrics | None:
+        if self.metrics is not None and self.metrics.get('enabled', True):
+            return Metrics()
+        return None
+
+    def _exporters(self, metrics: Metrics | None) -> list:
+        exporters = []
+        if metrics is not None:
+            if 'port' in self.metrics:
+                exporters.append(MetricsServer(metrics, self.metrics['port'], self.metrics.get('host', '127.0.0.1')))
+            if 'log_interval' in self.metrics:
+                exporters.append(StatsLogger(metrics, self.metrics['log_interval']))
+        return exporters
+
+    def _compile_metrics(self, spec) -> dict | None:
+        if spec is None:
+            return None
+        if not isinstance(spec, dict):
+            raise ConfigError(f"{self.source}: metrics: expected a table")
+
+        options = {}
+        for key, value in spec.items():
+            if key not in METRICS_KEYS:
+                raise ConfigError(f"{self.source}: metrics: unknown key {key!r}")
+            value = _expand(value, _as_tuple(METRICS_KEYS[key]))
+            if not isinstance(value, METRICS_KEYS[key]) or (key != 'enabled' and isinstance(value, bool)):
+                raise ConfigError(f"{self.source}: metrics.{key}: invalid value {value!r}")
+            options[key] = value
+        if options.get('log_interval', 1) <= 0:
+            raise ConfigError(f"{self.source}: metrics.log_interval: must be positive")
+        return options
+
+    def _compile(self, kind: str, spec, path: str):
+        if isinstance(spec, str):
+            return _Ref(kind, spec)
+        if not isinstance(spec, dict) or 'type' not in spec:
+            raise ConfigError(f"{path}: expected a {kind} name or a table with 'type'")
+
+        type_name = spec['type']
+        try:
+            cls = getattr(PACKAGES[kind], type_name)
+        except AttributeError:
+            raise ConfigError(f"{path}: unknown {kind} type {type_name!r}") from None
+
+        args = ()
+        kwargs = {}
+        parameters = inspect.signature(cls).parameters
+        for key, value in spec.items():
+            if key == 'type':
+                continue
+            if key in COMPONENT_KEYS:
+                value = self._compile_nested(COMPONENT_KEYS[key], value, f"{path}.{key}")
+            else:
+                value = _expand(value, _accepted_types(parameters.get(key)))
+            if key in parameters and parameters[key].kind is inspect.Parameter.VAR_POSITIONAL:
+                args = tuple(value)
+            else:
+                kwargs[key] = value
+
+        try:
+            inspect.signature(cls).bind(*args, **kwargs)
+        except TypeError as e:
+            raise ConfigError(f"{path}: invalid arguments for {type_name}: {e}") from None
+        return _New(kind, cls, args, kwargs)
+
+    def _compile_nested(self, kind: str, value, path: str):
+        if isinstance(value, list):
+            return [self._compile(kind, item, f"{path}[{i}]") for i, item in enumerate(value)]
+        return self._compile(kind, value, path)
+
+    def _check_cycles(self, plan, seen: list) -> None:
+        for child in _children(plan):
+            if isinstance(child, _Ref):
+                key = (child.kind, child.name)
+                if key not in self.components:
+                    raise ConfigError(f"{self.source}: unknown {child.kind} {child.name!r}")
+                if key in seen:
+                    raise ConfigError(f"{self.source}: reference cycle through {child.kind} {child.name!r}")
+                self._check_cycles(self.components[key], seen + [key])
+            else:
+                self._check_cycles(child, seen)
+
+    def _instantiate(self, plan, shared: dict, storages: list, wrapped: set, metrics: Metrics | None):
+        if isinstance(plan, list):
+            return [self._instantiate(item, shared, storages, wrapped, metrics) for item in plan]
+
+        if isinstance(plan, _Ref):
+            key = (plan.kind, plan.name)
+            if key not in shared:
+                shared[key] = self._create(self.components[key], shared, storages, wrapped, metrics, plan.name)
+            instance = shared[key]
+        else:
+            instance = self._create(plan, shared, storages, wrapped, metrics, plan.cls.__name__)
+
+        if isinstance(instance, BroadcastReader):
+            return instance.subscribe()
+        return instance
+
+    def _create(self, plan: _New, shared: dict, storages: list, wrapped: set, metrics: Metrics | None, label: str):
+        args = [self._instantiate(arg, shared, storages, wrapped, metrics) for arg in plan.args]
+        kwargs = {
+            key: self._instantiate(value, shared, storages, wrapped, metrics) if key in COMPONENT_KEYS else value
+            for key, value in plan.kwargs.items()
+        }
+
+        if metrics is not None and isinstance(kwargs.get('storage'), AbstractStorage):
+            child = plan.kwargs['storage']
+            name = child.name if isinstance(child, _Ref) else child.cls.__name__
+            instance = plan.cls(*args, **{**kwargs, 'storage': InstrumentedStorage(kwargs['storage'], metrics, name)})
+        else:
+            instance = plan.cls(*args, **kwargs)
+
+        if metrics is not None and callable(getattr(instance, 'stats', None)):
+            metrics.register(plan.kind, label, instance)
+        if isinstance(instance, AbstractStorage):
+            storages.append(instance)
+            for key in ('storage', 'storages'):
+                for child in _as_list(kwargs.get(key)):
+                    wrapped.add(id(child))
+        return instance
+
+
+def _children(plan) -> list:
+    if isinstance(plan, list):
+        return plan
+    if isinstance(plan, _New):
+        children = list(plan.args)
+        for key, value in plan.kwargs.items():
+            if key in COMPONENT_KEYS:
+                children.extend(_as_list(value))
+        return children
+    return []
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _as_tuple(value) -> tuple:
+    return value if isinstance(value, tuple) else (value,)
+
+
+def _accepted_types(parameter: inspect.Parameter | None) -> tuple:
+    if parameter is None or not isinstance(parameter.annotation, type | types.UnionType):
+        return ()
+    return typing.get_args(parameter.annotation) or (parameter.annotation,)
+
+
+def _expand(value, accepted: tuple = ()):
+    if isinstance(value, list):
+        return [_expand(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _expand(item) for key, item in value.items()}
+    if not isinstance(value, str):
+        return value
+
+    expanded = ENV_VAR.sub(lambda m: os.environ.get(m.group(1), m.group(2) or ''), value)
+    if not ENV_VAR.fullmatch(value) or str in accepted:
+        return expanded
+
+    text = expanded.strip()
+    if bool in accepted and text.lower() in BOOLEANS:
+        return BOOLEANS[text.lower()]
+    if int in accepted and INTEGER.fullmatch(text):
+        return int(text)
+    if float in accepted:
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    return expanded
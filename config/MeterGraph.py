@@ -0,0 +1,27 @@
+from meter import AbstractMeter
+from metrics import Metrics
+from storage import AbstractStorage
+
+
+class MeterGraph:
+    def __init__(
+        self,
+        meters: dict[str, AbstractMeter],
+        storages: list[AbstractStorage],
+        metrics: Metrics | None = None,
+        exporters: list | None = None,
+        named_storages: dict[str, AbstractStorage] | None = None,
+    ):
+        self.meters = meters
+        self.storages = storages
+        self.metrics = metrics
+        self.exporters = exporters or []
+        self.named_storages = named_storages or {}
+
+    def close(self) -> None:
+        for meter in self.meters.values():
+            meter.processor.close()
+        for storage in self.storages:
+            storage.close()
+        for exporter in self.exporters:
+            exporter.close()
@@ -0,0 +1,3 @@
+from config.ConfigError import ConfigError
+from config.MeterGraph import MeterGraph
+from config.MeterConfig import MeterConfig
@@ -0,0 +1,5 @@
+from dsmr import TelegramError
+
+
+class ChecksumError(TelegramError):
+    pass
@@ -0,0 +1,25 @@
+from decimal import InvalidOperation
+from typing import Callable
+
+from dsmr import CosemValue, TelegramError
+
+
+class CosemObjects:
+    def __init__(self, lines: dict[str, tuple[Callable[[str], CosemValue], str]]):
+        self._lines = lines
+
+    def __getattr__(self, name: str) -> CosemValue:
+        try:
+            convert, raw = self.__dict__['_lines'][name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}") from None
+
+        try:
+            value = convert(raw)
+        except (ValueError, IndexError, InvalidOperation):
+            raise TelegramError(f"invalid value for {name}: {raw}") from None
+        setattr(self, name, value)
+        return value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._lines
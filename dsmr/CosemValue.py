@@ -0,0 +1,16 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+Timestamp = Optional[datetime]
+
+
+class CosemValue(NamedTuple):
+    value: Decimal | int | str | datetime
+    unit: str | None = None
+    datetime: Timestamp = None
+
+
+def value_of(obj, name: str):
+    cosem = getattr(obj, name, None)
+    return None if cosem is None else cosem.value
@@ -0,0 +1,45 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple
+
+from dsmr import MBusReading
+from dsmr.CosemValue import value_of
+
+
+class DSMRReading(NamedTuple):
+    timestamp: datetime | None
+    sn: str | None
+    t1: Decimal | None
+    t2: Decimal | None
+    current: Decimal | None
+    returned: Decimal | None
+    mbus: dict[int, MBusReading]
+
+    OBJECTS = (
+        'P1_MESSAGE_TIMESTAMP',
+        'EQUIPMENT_IDENTIFIER',
+        'ELECTRICITY_USED_TARIFF_1',
+        'ELECTRICITY_USED_TARIFF_2',
+        'CURRENT_ELECTRICITY_USAGE',
+        'CURRENT_ELECTRICITY_DELIVERY',
+        'MBUS_DEVICE_TYPE',
+        'MBUS_EQUIPMENT_IDENTIFIER',
+        'MBUS_METER_READING',
+    )
+
+    @classmethod
+    def from_telegram(cls, telegram) -> 'DSMRReading':
+        mbus = {}
+        for device in getattr(telegram, 'MBUS_DEVICES', ()):
+            reading = MBusReading.from_device(device)
+            mbus.setdefault(reading.type, reading)
+
+        return cls(
+            timestamp=value_of(telegram, 'P1_MESSAGE_TIMESTAMP'),
+            sn=value_of(telegram, 'EQUIPMENT_IDENTIFIER'),
+            t1=value_of(telegram, 'ELECTRICITY_USED_TARIFF_1'),
+            t2=value_of(telegram, 'ELECTRICITY_USED_TARIFF_2'),
+            current=value_of(telegram, 'CURRENT_ELECTRICITY_USAGE'),
+            returned=value_of(telegram, 'CURRENT_ELECTRICITY_DELIVERY'),
+            mbus=mbus,
+        )
@@ -0,0 +1,75 @@
+from typing import Iterator
+
+
+class FrameBuffer:
+    def __init__(self, size: int = 64 * 1024):
+        if size < 1024:
+            raise ValueError("size must be at least 1024 bytes")
+
+        self.size = size
+        self.dropped = 0
+        self._data = bytearray(size)
+        self._start = 0
+        self._end = 0
+        self._scan = 0
+        self._frame = -1
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def feed(self, data: bytes) -> None:
+        if len(data) > self.size - self._end:
+            self._compact()
+        if len(data) > self.size - self._end:
+            if self._frame >= 0:
+                self.dropped += 1
+            self._frame = -1
+            self._start = self._end = self._scan = 0
+            data = data[-self.size:]
+
+        end = self._end + len(data)
+        self._data[self._end:end] = data
+        self._end = end
+
+    def frames(self) -> Iterator[bytes]:
+        data = self._data
+        while True:
+            if self._frame < 0:
+                start = data.find(b'/', self._scan, self._end)
+                if start < 0:
+                    self._start = self._scan = self._end
+                    return
+                self._frame = self._start = start
+                self._scan = start + 1
+
+            bang = data.find(b'!', self._scan, self._end)
+            restart = data.find(b'/', self._scan, self._end if bang < 0 else bang)
+            if restart >= 0:
+                self.dropped += 1
+                self._frame = -1
+                self._scan = restart
+                continue
+            if bang < 0:
+                self._scan = self._end
+                return
+
+            newline = data.find(b'\n', bang, self._end)
+            if newline < 0:
+                self._scan = bang
+                return
+
+            frame = bytes(data[self._frame:newline + 1])
+            self._frame = -1
+            self._start = self._scan = newline + 1
+            yield frame
+
+    def _compact(self) -> None:
+        offset = self._start
+        if not offset:
+            return
+        self._data[:self._end - offset] = self._data[offset:self._end]
+        self._end -= offset
+        self._scan -= offset
+        if self._frame >= 0:
+            self._frame -= offset
+        self._start = 0
@@ -0,0 +1,7 @@
+from dsmr import CosemObjects
+
+
+class MBusDevice(CosemObjects):
+    def __init__(self, channel_id: int, lines: dict):
+        super().__init__(lines)
+        self.channel_id = channel_id
@@ -0,0 +1,26 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple
+
+from dsmr.CosemValue import value_of
+
+
+class MBusReading(NamedTuple):
+    channel: int
+    type: int
+    sn: str | None
+    reading: Decimal | None
+    unit: str | None
+    timestamp: datetime | None
+
+    @classmethod
+    def from_device(cls, device) -> 'MBusReading':
+        reading = getattr(device, 'MBUS_METER_READING', None)
+        return cls(
+            channel=getattr(device, 'channel_id', None),
+            type=value_of(device, 'MBUS_DEVICE_TYPE'),
+            sn=value_of(device, 'MBUS_EQUIPMENT_IDENTIFIER'),
+            reading=None if reading is None else reading.value,
+            unit=None if reading is None else reading.unit,
+            timestamp=None if reading is None else getattr(reading, 'datetime', None),
+        )
@@ -0,0 +1,8 @@
+from dsmr import CosemObjects, MBusDevice
+
+
+class Telegram(CosemObjects):
+    def __init__(self, header: str, lines: dict, mbus_devices: list[MBusDevice]):
+        super().__init__(lines)
+        self.header = header
+        self.MBUS_DEVICES = mbus_devices
@@ -0,0 +1,2 @@
+class TelegramError(ValueError):
+    pass
@@ -0,0 +1,204 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable
+
+from dsmr import ChecksumError, CosemValue, DSMRReading, MBusDevice, Telegram, TelegramError
+
+logger = logging.getLogger(__name__)
+
+ERRORS = ('raise', 'skip')
+OUTPUTS = ('telegram', 'reading')
+DST = {'W': timezone(timedelta(hours=1)), 'S': timezone(timedelta(hours=2))}
+
+
+def _crc16_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+CRC16_TABLE = _crc16_table()
+
+
+def crc16(data: bytes, crc: int = 0) -> int:
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def _datetime(raw: str) -> datetime:
+    local = datetime(
+        2000 + int(raw[0:2]), int(raw[2:4]), int(raw[4:6]),
+        int(raw[6:8]), int(raw[8:10]), int(raw[10:12]),
+        tzinfo=DST.get(raw[12:13], DST['W']),
+    )
+    return local.astimezone(timezone.utc)
+
+
+def _text(raw: str) -> CosemValue:
+    return CosemValue(raw[1:-1])
+
+
+def _integer(raw: str) -> CosemValue:
+    return CosemValue(int(raw[1:-1]))
+
+
+def _timestamp(raw: str) -> CosemValue:
+    return CosemValue(_datetime(raw[1:-1]))
+
+
+def _quantity(raw: str) -> CosemValue:
+    value, _, unit = raw[1:-1].partition('*')
+    return CosemValue(Decimal(value), unit or None)
+
+
+def _mbus_reading(raw: str) -> CosemValue:
+    timestamp, _, reading = raw[1:-1].partition(')(')
+    value, _, unit = reading.partition('*')
+    return CosemValue(Decimal(value), unit or None, _datetime(timestamp))
+
+
+OBJECTS = {
+    '0.2.8': ('P1_MESSAGE_HEADER', _text),
+    '1.0.0': ('P1_MESSAGE_TIMESTAMP', _timestamp),
+    '96.1.1': ('EQUIPMENT_IDENTIFIER', _text),
+    '1.8.0': ('ELECTRICITY_IMPORTED_TOTAL', _quantity),
+    '1.8.1': ('ELECTRICITY_USED_TARIFF_1', _quantity),
+    '1.8.2': ('ELECTRICITY_USED_TARIFF_2', _quantity),
+    '2.8.1': ('ELECTRICITY_DELIVERED_TARIFF_1', _quantity),
+    '2.8.2': ('ELECTRICITY_DELIVERED_TARIFF_2', _quantity),
+    '96.14.0': ('ELECTRICITY_ACTIVE_TARIFF', _text),
+    '1.7.0': ('CURRENT_ELECTRICITY_USAGE', _quantity),
+    '2.7.0': ('CURRENT_ELECTRICITY_DELIVERY', _quantity),
+    '96.7.9': ('LONG_POWER_FAILURE_COUNT', _integer),
+    '96.7.21': ('SHORT_POWER_FAILURE_COUNT', _integer),
+    '32.32.0': ('VOLTAGE_SAG_L1_COUNT', _integer),
+    '52.32.0': ('VOLTAGE_SAG_L2_COUNT', _integer),
+    '72.32.0': ('VOLTAGE_SAG_L3_COUNT', _integer),
+    '32.36.0': ('VOLTAGE_SWELL_L1_COUNT', _integer),
+    '52.36.0': ('VOLTAGE_SWELL_L2_COUNT', _integer),
+    '72.36.0': ('VOLTAGE_SWELL_L3_COUNT', _integer),
+    '32.7.0': ('INSTANTANEOUS_VOLTAGE_L1', _quantity),
+    '52.7.0': ('INSTANTANEOUS_VOLTAGE_L2', _quantity),
+    '72.7.0': ('INSTANTANEOUS_VOLTAGE_L3', _quantity),
+    '31.7.0': ('INSTANTANEOUS_CURRENT_L1', _quantity),
+    '51.7.0': ('INSTANTANEOUS_CURRENT_L2', _quantity),
+    '71.7.0': ('INSTANTANEOUS_CURRENT_L3', _quantity),
+    '96.13.0': ('TEXT_MESSAGE', _text),
+    '21.7.0': ('INSTANTANEOUS_ACTIVE_POWER_L1_POSITIVE', _quantity),
+    '41.7.0': ('INSTANTANEOUS_ACTIVE_POWER_L2_POSITIVE', _quantity),
+    '61.7.0': ('INSTANTANEOUS_ACTIVE_POWER_L3_POSITIVE', _quantity),
+    '22.7.0': ('INSTANTANEOUS_ACTIVE_POWER_L1_NEGATIVE', _quantity),
+    '42.7.0': ('INSTANTANEOUS_ACTIVE_POWER_L2_NEGATIVE', _quantity),
+    '62.7.0': ('INSTANTANEOUS_ACTIVE_POWER_L3_NEGATIVE', _quantity),
+}
+MBUS_OBJECTS = {
+    '24.1.0': ('MBUS_DEVICE_TYPE', _integer),
+    '96.1.0': ('MBUS_EQUIPMENT_IDENTIFIER', _text),
+    '96.1.1': ('MBUS_EQUIPMENT_IDENTIFIER', _text),
+    '24.4.0': ('MBUS_VALVE_POSITION', _integer),
+    '24.2.1': ('MBUS_METER_READING', _mbus_reading),
+    '24.2.3': ('MBUS_METER_READING', _mbus_reading),
+}
+
+
+class TelegramParser:
+    def __init__(
+        self,
+        objects: Iterable[str] | None = None,
+        validate_checksum: bool = True,
+        errors: str = 'raise',
+        output: str = 'telegram',
+    ):
+        if errors not in ERRORS:
+            raise ValueError(f"errors must be one of {', '.join(ERRORS)}")
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {', '.join(OUTPUTS)}")
+        if objects is None and output == 'reading':
+            objects = DSMRReading.OBJECTS
+
+        if objects is not None:
+            objects = set(objects)
+            unknown = objects - {name for name, _ in (*OBJECTS.values(), *MBUS_OBJECTS.values())}
+            if unknown:
+                raise ValueError(f"unknown DSMR object(s) {', '.join(sorted(unknown))}")
+
+        self.validate_checksum = validate_checksum
+        self.errors = errors
+        self.output = output
+        self._objects = {code: entry for code, entry in OBJECTS.items() if objects is None or entry[0] in objects}
+        self._mbus_objects = {
+            code: entry for code, entry in MBUS_OBJECTS.items() if objects is None or entry[0] in objects
+        }
+
+    def parse(self, raw: str, *_) -> Telegram | DSMRReading | None:
+        try:
+            telegram = self._parse(raw)
+            return DSMRReading.from_telegram(telegram) if self.output == 'reading' else telegram
+        except TelegramError as e:
+            if self.errors == 'raise':
+                raise
+            logger.warning(f"skipping telegram: {e}")
+            return None
+
+    def _parse(self, raw: str) -> Telegram:
+        if not raw.startswith('/'):
+            raise TelegramError("telegram does not start with '/'")
+
+        validate = self.validate_checksum
+        objects = self._objects
+        mbus_objects = self._mbus_objects
+        lines = {}
+        devices = {}
+        crc = 0
+
+        telegram_lines = iter(raw.splitlines(keepends=True))
+        header = next(telegram_lines)
+        if validate:
+            if not raw.isascii():
+                raise ChecksumError("telegram contains non-ASCII characters")
+            crc = crc16(header.encode('ascii'))
+
+        for line in telegram_lines:
+            if line[0] == '!':
+                if validate:
+                    self._check(crc16(b'!', crc), line[1:].rstrip())
+                return Telegram(
+                    header.rstrip(),
+                    lines,
+                    [MBusDevice(channel, devices[channel]) for channel in sorted(devices)],
+                )
+
+            if validate:
+                crc = crc16(line.encode('ascii'), crc)
+
+            paren = line.find('(')
+            if paren < 0:
+                continue
+            colon = line.find(':', 0, paren)
+            code = line[colon + 1:paren]
+            if line[colon - 1] == '0':
+                entry = objects.get(code)
+                if entry is not None:
+                    lines[entry[0]] = (entry[1], line[paren:].rstrip())
+            else:
+                entry = mbus_objects.get(code)
+                if entry is not None:
+                    devices.setdefault(int(line[colon - 1]), {})[entry[0]] = (entry[1], line[paren:].rstrip())
+
+        raise TelegramError("telegram has no '!' checksum line")
+
+    @staticmethod
+    def _check(crc: int, checksum: str) -> None:
+        try:
+            expected = int(checksum, 16)
+        except ValueError:
+            raise ChecksumError(f"invalid checksum {checksum!r}") from None
+        if expected != crc:
+            raise ChecksumError(f"checksum mismatch: telegram has {checksum}, computed {crc:04X}")
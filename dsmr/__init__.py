@@ -0,0 +1,10 @@
+from dsmr.TelegramError import TelegramError
+from dsmr.ChecksumError import ChecksumError
+from dsmr.CosemValue import CosemValue
+from dsmr.CosemObjects import CosemObjects
+from dsmr.MBusDevice import MBusDevice
+from dsmr.Telegram import Telegram
+from dsmr.MBusReading import MBusReading
+from dsmr.DSMRReading import DSMRReading
+from dsmr.TelegramParser import TelegramParser
+from dsmr.FrameBuffer import FrameBuffer
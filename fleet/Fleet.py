@@ -0,0 +1,324 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from time import monotonic, sleep
+
+from config import ConfigError, MeterConfig, MeterGraph
+from meter import MeterRuntime
+from storage import ForwardingStorage
+
+logger = logging.getLogger(__name__)
+
+
+class _Worker:
+    __slots__ = (
+        'index', 'names', 'process', 'channel', 'started_at', 'restart_at', 'last_seen', 'failures', 'restarts',
+        'finished', 'health',
+    )
+
+    def __init__(self, index: int, names: list[str]):
+        self.index = index
+        self.names = names
+        self.process = None
+        self.channel = None
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.last_seen = 0.0
+        self.failures = 0
+        self.restarts = 0
+        self.finished = False
+        self.health = {}
+
+
+class Fleet:
+    def __init__(
+        self,
+        config_path: str,
+        names: list[str] | None = None,
+        workers: int | None = None,
+        batch_size: int = 500,
+        heartbeat: float = 5.0,
+        timeout: float = 30.0,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        maxsize: int = 1000,
+        report_interval: float = 60.0,
+    ):
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if timeout <= heartbeat:
+            raise ValueError("timeout must be longer than heartbeat")
+
+        self.config_path = config_path
+        self.config = MeterConfig.load(config_path)
+        self.names = list(names or self.config.meters)
+        self.batch_size = batch_size
+        self.heartbeat = heartbeat
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.report_interval = report_interval
+
+        self.shards = self.shard(self.config, self.names, workers or os.cpu_count() or 1)
+        self.written = 0
+        self.failed = 0
+
+        self._context = multiprocessing.get_context('spawn')
+        self._messages = self._context.Queue(maxsize)
+        self._workers = [_Worker(index, names) for index, names in enumerate(self.shards)]
+        self._graph: MeterGraph | None = None
+        self._writer = None
+        self._reported_at = 0.0
+
+    @staticmethod
+    def shard(config: MeterConfig, names: list[str], count: int) -> list[list[str]]:
+        unknown = [name for name in names if name not in config.meters]
+        if unknown:
+            raise ConfigError(f"{config.source}: unknown meter(s) {', '.join(unknown)}")
+
+        groups = []
+        for key in names:
+            members, readers = [key], set(config.references(key, 'reader'))
+            for group in [group for group in groups if group[1] & readers]:
+                groups.remove(group)
+                members = group[0] + members
+                readers |= group[1]
+            groups.append((members, readers))
+
+        shards = [[] for _ in range(min(count, len(groups)))]
+        for members, _ in sorted(groups, key=lambda group: -len(group[0])):
+            min(shards, key=len).extend(members)
+        return shards
+
+    def __call__(self) -> None:
+        previous = signal.signal(signal.SIGTERM, _terminate)
+        try:
+            self.start()
+            while self.supervise():
+                sleep(self.heartbeat)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            try:
+                self.stop()
+            finally:
+                signal.signal(signal.SIGTERM, previous)
+
+    def start(self) -> None:
+        self._graph = self.config.build_storages(self.names)
+        if self._graph.metrics is not None:
+            self._graph.metrics.register('fleet', 'workers', self)
+        self._writer = threading.Thread(target=self._write, name='Fleet', daemon=True)
+        self._writer.start()
+        for worker in self._workers:
+            self._spawn(worker)
+        self._reported_at = monotonic()
+        logger.info(f"fleet: {len(self.names)} meters on {len(self._workers)} workers")
+
+    def supervise(self) -> bool:
+        now = monotonic()
+        running = False
+        for worker in self._workers:
+            self._receive(worker)
+            if worker.finished:
+                continue
+            running = True
+            if worker.process is None:
+                if now >= worker.restart_at:
+                    self._spawn(worker)
+                continue
+
+            if worker.process.is_alive():
+                if now - worker.last_seen <= self.timeout:
+                    continue
+                logger.warning(f"fleet: worker {worker.index} sent no heartbeat for {self.timeout:.0f}s, stopping it")
+                self._terminate(worker)
+            elif worker.process.exitcode == 0:
+                worker.finished = True
+                worker.process = None
+                logger.info(f"fleet: worker {worker.index} finished")
+                continue
+            self._restart(worker, now)
+
+        if now - self._reported_at >= self.report_interval:
+            self._reported_at = now
+            self._report()
+        return running
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "worker": worker.index,
+                "meters": len(worker.names),
+                "running": int(worker.process is not None and worker.process.is_alive()),
+                "restarts": worker.restarts,
+                "points": worker.health.get('points', 0),
+                "failed_meters": worker.health.get('failed', 0),
+            }
+            for worker in self._workers
+        ]
+
+    def stop(self) -> None:
+        for worker in self._workers:
+            if worker.process is not None and worker.process.is_alive():
+                worker.process.terminate()
+        for worker in self._workers:
+            if worker.process is None:
+                continue
+            worker.process.join(self.timeout)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.process = None
+            self._receive(worker)
+
+        if self._writer is not None:
+            self._messages.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._graph is not None:
+            self._graph.close()
+            self._graph = None
+        self._report()
+
+    def _spawn(self, worker: _Worker) -> None:
+        if worker.channel is not None:
+            worker.channel.close()
+        worker.channel, channel = self._context.Pipe(duplex=False)
+        worker.process = self._context.Process(
+            target=_work,
+            args=(
+                self.config_path, worker.names, worker.index, self._messages, channel,
+                self.heartbeat, self.batch_size, logging.getLogger().level,
+            ),
+            name=f'meteread-worker-{worker.index}',
+            daemon=True,
+        )
+        worker.process.start()
+        channel.close()
+        worker.started_at = worker.last_seen = monotonic()
+
+    def _receive(self, worker: _Worker) -> None:
+        if worker.channel is None:
+            return
+        try:
+            while worker.channel.poll():
+                worker.health = worker.channel.recv()
+                worker.last_seen = monotonic()
+        except (EOFError, OSError):
+            worker.channel.close()
+            worker.channel = None
+
+    def _terminate(self, worker: _Worker) -> None:
+        worker.process.terminate()
+        worker.process.join(self.heartbeat)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+
+    def _restart(self, worker: _Worker, now: float) -> None:
+        exitcode = worker.process.exitcode
+        worker.process = None
+        worker.failures = 1 if now - worker.started_at >= self.max_backoff else worker.failures + 1
+        worker.restarts += 1
+        delay = min(self.backoff * 2 ** (worker.failures - 1), self.max_backoff)
+        worker.restart_at = now + delay
+        logger.warning(f"fleet: worker {worker.index} exited with {exitcode}, restarting in {delay:.1f}s")
+
+    def _report(self) -> None:
+        running = sum(worker.process is not None and worker.process.is_alive() for worker in self._workers)
+        restarts = sum(worker.restarts for worker in self._workers)
+        logger.info(
+            f"fleet: {running}/{len(self._workers)} workers running, {restarts} restarts, "
+            f"{self.written} points written, {self.failed} failed"
+        )
+
+    def _write(self) -> None:
+        while True:
+            message = self._messages.get()
+            batches = {}
+            count = 0
+            while message is not None:
+                _, name, points = message
+                batches.setdefault(name, []).extend(points)
+                count += len(points)
+                if count >= self.batch_size:
+                    break
+                try:
+                    message = self._messages.get_nowait()
+                except queue.Empty:
+                    break
+
+            for name, points in batches.items():
+                try:
+                    self._graph.named_storages[name].write_batch(points)
+                    self.written += len(points)
+                except Exception:
+                    self.failed += len(points)
+                    logger.exception(f"fleet: writing {len(points)} points to {name} failed")
+            if message is None:
+                return
+
+
+def _work(
+    path: str, names: list[str], index: int, messages, channel, heartbeat: float, batch_size: int, level: int
+) -> None:
+    logging.basicConfig(level=level, format=f'[%(asctime)s - %(levelname)s]: worker {index}: %(message)s')
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _terminate)
+
+    config = MeterConfig.load(path)
+    forwarders = {
+        name: ForwardingStorage(messages, name, batch_size, heartbeat) for name in config.storage_references(names)
+    }
+    graph = config.build(names, storages=forwarders, metrics=False)
+    runtime = MeterRuntime(*graph.meters.values(), fail_fast=True)
+    stopped = threading.Event()
+    threads = [
+        threading.Thread(target=_report, args=(channel, forwarders, runtime, heartbeat, stopped), name='FleetHealth'),
+        threading.Thread(target=_flush, args=(forwarders, heartbeat, stopped), name='FleetFlush'),
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    try:
+        runtime()
+    except Exception:
+        raise SystemExit(1)
+    finally:
+        stopped.set()
+        for thread in threads:
+            thread.join()
+        graph.close()
+        for forwarder in forwarders.values():
+            forwarder.flush()
+        _health(channel, forwarders, runtime)
+
+
+def _report(channel, forwarders: dict, runtime: MeterRuntime, heartbeat: float, stopped) -> None:
+    while True:
+        if not runtime.failed:
+            _health(channel, forwarders, runtime)
+        if stopped.wait(heartbeat):
+            return
+
+
+def _flush(forwarders: dict, heartbeat: float, stopped) -> None:
+    while not stopped.wait(heartbeat):
+        for forwarder in forwarders.values():
+            forwarder.flush()
+
+
+def _health(channel, forwarders: dict, runtime: MeterRuntime) -> None:
+    points = sum(forwarder.forwarded for forwarder in forwarders.values())
+    channel.send({'pid': os.getpid(), 'points': points, 'failed': runtime.failed})
+
+
+def _terminate(signum, frame) -> None:
+    raise SystemExit(0)
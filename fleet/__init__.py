@@ -0,0 +1 @@
+from fleet.Fleet import Fleet
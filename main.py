@@ -1,124 +1,72 @@
 import logging
-import os
+import signal
 
 import typer
 from dotenv import load_dotenv
 
-from meter import GenericMeter
-from processor import PassProcessor, DSMRElectricityProcessor, DSMRGasProcessor, ChainProcessor
-from reader import DelayReader, RandomReader, DSMRv5SerialReader, DSMRv5RawReader
-from storage import InfluxDBStorage
+from config import ConfigError, MeterConfig
+from fleet import Fleet
+from meter import MeterRuntime
 
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s - %(levelname)s]: %(message)s')
 app = typer.Typer()
 
+DEFAULT_CONFIG = 'meteread.toml'
+
+
 @app.command()
 def main():
     typer.echo("Hello, I am Meteread!")
 
 @app.command()
-def read(name: str):
-    storage = InfluxDBStorage(host=os.getenv('INFLUXDB_URL'), database='meteread')
-
-    meters = {
-        'water': GenericMeter(
-            name='cold water',
-            reader=DelayReader(
-                reader=RandomReader(),
-                delay=1.0
-            ),
-            processor=PassProcessor()
-        ),
-        'electricity': GenericMeter(
-            name='electricity meter',
-            reader=DSMRv5SerialReader(
-                device='/dev/ttyUSB0'
-            ),
-            processor=DSMRElectricityProcessor()
-        ),
-        'gas': GenericMeter(
-            name='gas meter',
-            reader=DSMRv5SerialReader(
-                device='/dev/ttyUSB0'
-            ),
-            processor=DSMRGasProcessor()
-        ),
-        'electricity_and_gas': GenericMeter(
-            name='electricity and gas meter',
-            reader=DSMRv5SerialReader(
-                device='/dev/ttyUSB0'
-            ),
-            processor=ChainProcessor(
-                DSMRElectricityProcessor(
-                    storage=storage
-                ),
-                DSMRGasProcessor(
-                    storage=storage
-                ),
-            )        ),
-        'raw': GenericMeter(
-            name='raw electricity and gas meter',
-            reader=DelayReader(
-                reader=DSMRv5RawReader(
-                    raw=(
-                        '/ISk5\\2MT382-1000\r\n'
-                        '\r\n'
-                        '5-3:0.2.8(50)\r\n'
-                        '0-0:1.0.0(210101000000W)\r\n'
-                        '0-0:96.1.1(4530303334303034363639353537343136)\r\n'
-                        '1-0:1.8.1(001234.567*kWh)\r\n'
-                        '1-0:1.8.2(002345.678*kWh)\r\n'
-                        '1-0:2.8.1(000001.000*kWh)\r\n'
-                        '1-0:2.8.2(000002.000*kWh)\r\n'
-                        '0-0:96.14.0(0002)\r\n'
-                        '1-0:1.7.0(01.500*kW)\r\n'
-                        '1-0:2.7.0(00.000*kW)\r\n'
-                        '0-0:96.7.21(00000)\r\n'
-                        '0-0:96.7.9(00000)\r\n'
-                        '1-0:32.32.0(00000)\r\n'
-                        '1-0:52.32.0(00000)\r\n'
-                        '1-0:72.32.0(00000)\r\n'
-                        '1-0:32.36.0(00000)\r\n'
-                        '1-0:52.36.0(00000)\r\n'
-                        '1-0:72.36.0(00000)\r\n'
-                        '1-0:32.7.0(230.1*V)\r\n'
-                        '1-0:52.7.0(230.2*V)\r\n'
-                        '1-0:72.7.0(230.0*V)\r\n'
-                        '1-0:31.7.0(001*A)\r\n'
-                        '1-0:51.7.0(002*A)\r\n'
-                        '1-0:71.7.0(003*A)\r\n'
-                        '1-0:21.7.0(00.500*kW)\r\n'
-                        '1-0:41.7.0(00.500*kW)\r\n'
-                        '1-0:61.7.0(00.500*kW)\r\n'
-                        '1-0:22.7.0(00.000*kW)\r\n'
-                        '1-0:42.7.0(00.000*kW)\r\n'
-                        '1-0:62.7.0(00.000*kW)\r\n'
-                        '0-1:24.1.0(003)\r\n'
-                        '0-1:96.1.0(4730303233353631323930333635383137)\r\n'
-                        '0-1:24.2.1(210101120000W)(01234.567*m3)\r\n'
-                        '!0000\r\n'
-                    )
-                )
-            ),
-            processor=ChainProcessor(
-                DSMRElectricityProcessor(
-                    storage=storage
-                ),
-                DSMRGasProcessor(
-                    storage=storage
-                ),
-            )
-        ),
-    }
-    meter = meters.get(name)
-
-    while True:
-        meter()
+def read(
+    names: list[str] = typer.Argument(None),
+    config_path: str = typer.Option(DEFAULT_CONFIG, '--config', '-c', envvar='METEREAD_CONFIG'),
+):
+    graph = MeterConfig.load(config_path).build(names)
+    signal.signal(signal.SIGTERM, _terminate)
+
+    try:
+        if len(graph.meters) == 1:
+            meter, = graph.meters.values()
+            try:
+                while True:
+                    meter()
+            except StopIteration:
+                pass
+        else:
+            MeterRuntime(*graph.meters.values())()
+    finally:
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        graph.close()
 
 
 @app.command()
-def config():
-    raise NotImplementedError
+def fleet(
+    names: list[str] = typer.Argument(None),
+    config_path: str = typer.Option(DEFAULT_CONFIG, '--config', '-c', envvar='METEREAD_CONFIG'),
+    workers: int = typer.Option(None, '--workers', '-w', help="worker processes, default: one per core"),
+    batch_size: int = typer.Option(500, help="points per write to a shared storage"),
+    heartbeat: float = typer.Option(5.0, help="seconds between worker health reports"),
+    timeout: float = typer.Option(30.0, help="restart a worker after this many seconds without a report"),
+):
+    Fleet(config_path, names, workers=workers, batch_size=batch_size, heartbeat=heartbeat, timeout=timeout)()
+
+
+@app.command()
+def config(path: str = typer.Argument(DEFAULT_CONFIG, envvar='METEREAD_CONFIG')):
+    try:
+        meter_config = MeterConfig.load(path)
+    except ConfigError as e:
+        typer.echo(f"invalid config: {e}", err=True)
+        raise typer.Exit(1)
+
+    for key, (name, _, _) in meter_config.meters.items():
+        typer.echo(f"{key}: {name}")
+
+
+def _terminate(signum, frame) -> None:
+    raise SystemExit(0)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,59 @@
+from time import perf_counter
+
+from metrics import Metrics
 from processor import AbstractProcessor
 from reader import AbstractReader
 
 
 class AbstractMeter():
-    def __init__(self, name: str, reader: AbstractReader, processor: AbstractProcessor):
+    def __init__(
+        self,
+        name: str,
+        reader: AbstractReader,
+        processor: AbstractProcessor,
+        metrics: Metrics | None = None,
+        batch_size: int | None = None,
+    ):
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
         self.name = name
         self.reader = reader
         self.processor = processor
+        self.metrics = metrics
+        self.batch_size = batch_size
+        if metrics is not None:
+            help = 'Time spent per pipeline stage; read includes waiting for the next value.'
+            self._read_seconds = metrics.histogram('meteread_stage_seconds', help, meter=name, stage='read')
+            self._process_seconds = metrics.histogram('meteread_stage_seconds', help, meter=name, stage='process')
 
     def __call__(self, *args, **kwargs):
-        while self.processor(next(self.reader)):
-            pass
\ No newline at end of file
+        if self.batch_size is not None:
+            self._call_batch()
+            return
+
+        if self.metrics is None:
+            while self.processor(next(self.reader)):
+                pass
+            return
+
+        while True:
+            started = perf_counter()
+            data = next(self.reader)
+            read = perf_counter()
+            self._read_seconds.observe(read - started)
+            result = self.processor(data)
+            self._process_seconds.observe(perf_counter() - read)
+            if not result:
+                return
+
+    def _call_batch(self) -> None:
+        started = perf_counter()
+        batch = self.reader.read_batch(self.batch_size)
+        if not batch:
+            raise StopIteration
+        read = perf_counter()
+        self.processor.process_batch(batch)
+        if self.metrics is not None:
+            self._read_seconds.observe(read - started)
+            self._process_seconds.observe(perf_counter() - read)
@@ -0,0 +1,74 @@
+from time import perf_counter
+
+from meter import AbstractMeter
+from metrics import Metrics
+from processor import AbstractAsyncProcessor, AbstractProcessor, AsyncProcessorAdapter
+from reader import AbstractAsyncReader, AbstractReader, AsyncReaderAdapter
+
+
+class AsyncMeter(AbstractMeter):
+    def __init__(
+        self,
+        name: str,
+        reader: AbstractReader | AbstractAsyncReader,
+        processor: AbstractProcessor | AbstractAsyncProcessor,
+        metrics: Metrics | None = None,
+        batch_size: int | None = None,
+    ):
+        super().__init__(
+            name=name,
+            reader=AsyncReaderAdapter.wrap(reader),
+            processor=AsyncProcessorAdapter.wrap(processor),
+            metrics=metrics,
+            batch_size=batch_size,
+        )
+
+    @classmethod
+    def from_meter(cls, meter: AbstractMeter) -> 'AsyncMeter':
+        if isinstance(meter, AsyncMeter):
+            return meter
+        return cls(
+            name=meter.name,
+            reader=meter.reader,
+            processor=meter.processor,
+            metrics=meter.metrics,
+            batch_size=meter.batch_size,
+        )
+
+    async def __call__(self, *args, **kwargs):
+        if self.batch_size is not None:
+            await self._call_batch()
+            return
+
+        if self.metrics is None:
+            while await self.processor(await anext(self.reader)):
+                pass
+            return
+
+        while True:
+            started = perf_counter()
+            data = await anext(self.reader)
+            read = perf_counter()
+            self._read_seconds.observe(read - started)
+            result = await self.processor(data)
+            self._process_seconds.observe(perf_counter() - read)
+            if not result:
+                return
+
+    async def _call_batch(self) -> None:
+        started = perf_counter()
+        batch = await self.reader.read_batch(self.batch_size)
+        if not batch:
+            raise StopAsyncIteration
+        read = perf_counter()
+        await self.processor.process_batch(batch)
+        if self.metrics is not None:
+            self._read_seconds.observe(read - started)
+            self._process_seconds.observe(perf_counter() - read)
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await self()
+        except StopAsyncIteration:
+            pass
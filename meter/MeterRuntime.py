@@ -0,0 +1,28 @@
+import asyncio
+import logging
+
+from meter import AbstractMeter, AsyncMeter
+
+logger = logging.getLogger(__name__)
+
+
+class MeterRuntime:
+    def __init__(self, *meters: AbstractMeter, fail_fast: bool = False):
+        self.meters = [AsyncMeter.from_meter(meter) for meter in meters]
+        self.fail_fast = fail_fast
+        self.failed = 0
+
+    def __call__(self) -> None:
+        asyncio.run(self.run())
+
+    async def run(self) -> None:
+        await asyncio.gather(*(self._run_meter(meter) for meter in self.meters))
+
+    async def _run_meter(self, meter: AsyncMeter) -> None:
+        try:
+            await meter.run()
+        except Exception:
+            self.failed += 1
+            logger.exception(f"meter {meter.name} stopped")
+            if self.fail_fast:
+                raise
@@ -1,2 +1,4 @@
 from meter.AbstractMeter import AbstractMeter
-from meter.GenericMeter import GenericMeter
\ No newline at end of file
+from meter.GenericMeter import GenericMeter
+from meter.AsyncMeter import AsyncMeter
+from meter.MeterRuntime import MeterRuntime
@@ -0,0 +1,86 @@
+import threading
+from numbers import Number
+
+from metrics import Histogram
+from metrics.Histogram import LATENCY_BUCKETS
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + '}'
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: dict[str, str] = {}
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._sources: dict[str, tuple[str, object]] = {}
+
+    def histogram(self, name: str, help: str, buckets: tuple = LATENCY_BUCKETS, **labels) -> Histogram:
+        key = tuple(labels.items())
+        with self._lock:
+            self._help.setdefault(name, help)
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(buckets)
+            return series[key]
+
+    def register(self, kind: str, name: str, source) -> str:
+        with self._lock:
+            unique = name
+            index = 1
+            while unique in self._sources:
+                index += 1
+                unique = f"{name}_{index}"
+            self._sources[unique] = (kind, source)
+        return unique
+
+    def histograms(self) -> list[tuple[str, dict, Histogram]]:
+        with self._lock:
+            return [
+                (name, dict(key), histogram)
+                for name, series in self._histograms.items()
+                for key, histogram in series.items()
+            ]
+
+    def gauges(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            sources = list(self._sources.items())
+
+        result = []
+        for component, (kind, source) in sources:
+            stats = source.stats()
+            for index, entry in enumerate(stats if isinstance(stats, list) else [stats]):
+                labels = {'kind': kind, 'component': component}
+                if isinstance(stats, list):
+                    labels['child'] = index
+                labels.update((key, value) for key, value in entry.items() if isinstance(value, str))
+                for key, value in entry.items():
+                    if isinstance(value, Number) and not isinstance(value, bool):
+                        result.append((f"meteread_{kind}_{key}", labels, value))
+        return result
+
+    def render(self) -> str:
+        lines = []
+        histograms: dict[str, list] = {}
+        for name, labels, histogram in self.histograms():
+            histograms.setdefault(name, []).append((labels, histogram))
+        for name, series in histograms.items():
+            lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series:
+                for bound, total in zip((*histogram.buckets, '+Inf'), histogram.cumulative()):
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {total}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+        typed = set()
+        for name, labels, value in self.gauges():
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
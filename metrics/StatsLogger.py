@@ -0,0 +1,50 @@
+import logging
+import threading
+from time import monotonic
+
+from metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class StatsLogger:
+    def __init__(self, metrics: Metrics, interval: float = 60.0):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.metrics = metrics
+        self.interval = interval
+        self._counts: dict[tuple, int] = {}
+        self._logged_at = monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='StatsLogger', daemon=True)
+        self._thread.start()
+
+    def log(self) -> None:
+        now = monotonic()
+        elapsed = max(now - self._logged_at, 1e-9)
+        self._logged_at = now
+
+        for name, labels, histogram in self.metrics.histograms():
+            key = (name, *labels.items())
+            count = histogram.count - self._counts.get(key, 0)
+            self._counts[key] = histogram.count
+            series = ' '.join(f"{label}={value}" for label, value in labels.items())
+            logger.info(
+                f"stats: {name} {series} "
+                f"rate={count / elapsed:.2f}/s "
+                f"p50={histogram.quantile(0.5)} "
+                f"p99={histogram.quantile(0.99)} "
+                f"count={histogram.count}"
+            )
+        for name, labels, value in self.metrics.gauges():
+            if name.endswith('_depth'):
+                logger.info(f"stats: {name} component={labels['component']} {value}")
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.log()
@@ -0,0 +1,4 @@
+from metrics.Histogram import Histogram
+from metrics.Metrics import Metrics
+from metrics.MetricsServer import MetricsServer
+from metrics.StatsLogger import StatsLogger
@@ -0,0 +1,16 @@
+from abc import abstractmethod, ABC
+
+from storage.AbstractAsyncStorage import AbstractAsyncStorage
+
+
+class AbstractAsyncProcessor(ABC):
+    def __init__(self, storage: AbstractAsyncStorage | None = None):
+        self.storage = storage
+
+    @abstractmethod
+    async def __call__(self, data) -> None:
+        pass
+
+    async def process_batch(self, batch: list) -> None:
+        for data in batch:
+            await self(data)
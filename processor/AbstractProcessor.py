@@ -9,4 +9,11 @@ class AbstractProcessor(ABC):
 
     @abstractmethod
     def __call__(self, data) -> None:
-        pass
\ No newline at end of file
+        pass
+
+    def process_batch(self, batch: list) -> None:
+        for data in batch:
+            self(data)
+
+    def close(self) -> None:
+        pass
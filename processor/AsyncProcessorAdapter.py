@@ -0,0 +1,21 @@
+import asyncio
+
+from processor import AbstractAsyncProcessor, AbstractProcessor
+
+
+class AsyncProcessorAdapter(AbstractAsyncProcessor):
+    def __init__(self, processor: AbstractProcessor):
+        super().__init__()
+        self.processor = processor
+
+    @classmethod
+    def wrap(cls, processor: AbstractProcessor | AbstractAsyncProcessor) -> AbstractAsyncProcessor:
+        if isinstance(processor, AbstractAsyncProcessor):
+            return processor
+        return cls(processor)
+
+    async def __call__(self, data) -> None:
+        return await asyncio.to_thread(self.processor, data)
+
+    async def process_batch(self, batch: list) -> None:
+        await asyncio.to_thread(self.processor.process_batch, batch)
@@ -1,11 +1,107 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from time import perf_counter
+
 from processor import AbstractProcessor
 
+logger = logging.getLogger(__name__)
+
 
 class ChainProcessor(AbstractProcessor):
-    def __init__(self, *processors: AbstractProcessor):
+    def __init__(self, *processors: AbstractProcessor, parallel: bool = False, timeout: float | None = None):
+        if timeout is not None and not parallel:
+            raise ValueError("timeout requires parallel=True")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+
         super().__init__()
         self.processors = processors
+        self.parallel = parallel
+        self.timeout = timeout
+
+        self.calls = [0] * len(processors)
+        self.errors = [0] * len(processors)
+        self.timeouts = [0] * len(processors)
+        self.skipped = [0] * len(processors)
+        self.last_latency = [0.0] * len(processors)
+        self.max_latency = [0.0] * len(processors)
+        self._total_latency = [0.0] * len(processors)
+        self._pending = [None] * len(processors)
+        self._executor = None
+        if parallel and processors:
+            self._executor = ThreadPoolExecutor(max_workers=len(processors), thread_name_prefix='ChainProcessor')
 
     def __call__(self, data) -> None:
+        self._dispatch(data, False)
+
+    def process_batch(self, batch: list) -> None:
+        self._dispatch(batch, True)
+
+    def _dispatch(self, data, batch: bool) -> None:
+        if not self.parallel:
+            for index, processor in enumerate(self.processors):
+                self._run(index, processor, data, batch)
+            return
+
+        futures = []
+        for index, processor in enumerate(self.processors):
+            pending = self._pending[index]
+            if pending is not None and not pending.done():
+                self.skipped[index] += 1
+                logger.warning(
+                    f"chain: {type(processor).__name__} is still busy with the previous call, "
+                    f"skipping ({self.skipped[index]} skipped)"
+                )
+                continue
+            self._pending[index] = self._executor.submit(self._run_isolated, index, processor, data, batch)
+            futures.append((index, processor, self._pending[index], perf_counter()))
+
+        for index, processor, future, submitted in futures:
+            remaining = None if self.timeout is None else max(0.0, submitted + self.timeout - perf_counter())
+            try:
+                future.result(timeout=remaining)
+            except TimeoutError:
+                self.timeouts[index] += 1
+                logger.warning(f"chain: {type(processor).__name__} timed out after {self.timeout}s")
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
         for processor in self.processors:
-            processor(data)
+            processor.close()
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "processor": type(processor).__name__,
+                "calls": self.calls[index],
+                "errors": self.errors[index],
+                "timeouts": self.timeouts[index],
+                "skipped": self.skipped[index],
+                "last_latency": self.last_latency[index],
+                "max_latency": self.max_latency[index],
+                "mean_latency": self._total_latency[index] / self.calls[index] if self.calls[index] else 0.0,
+            }
+            for index, processor in enumerate(self.processors)
+        ]
+
+    def _run_isolated(self, index: int, processor: AbstractProcessor, data, batch: bool) -> None:
+        try:
+            self._run(index, processor, data, batch)
+        except Exception:
+            self.errors[index] += 1
+            logger.exception(f"chain: {type(processor).__name__} failed")
+
+    def _run(self, index: int, processor: AbstractProcessor, data, batch: bool) -> None:
+        started = perf_counter()
+        try:
+            if batch:
+                processor.process_batch(data)
+            else:
+                processor(data)
+        finally:
+            latency = perf_counter() - started
+            self.calls[index] += 1
+            self.last_latency[index] = latency
+            self.max_latency[index] = max(self.max_latency[index], latency)
+            self._total_latency[index] += latency
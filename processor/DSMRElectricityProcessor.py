@@ -1,7 +1,8 @@
 import logging
 
+from dsmr import DSMRReading
 from processor import AbstractProcessor
-from storage.AbstractStorage import AbstractStorage
+from storage import AbstractStorage, PointTable
 
 logger = logging.getLogger(__name__)
 
@@ -11,28 +12,41 @@ class DSMRElectricityProcessor(AbstractProcessor):
         super().__init__(storage=storage)
 
     def __call__(self, data) -> None:
-        sn = data.EQUIPMENT_IDENTIFIER.value
-        t1 = data.ELECTRICITY_USED_TARIFF_1
-        t2 = data.ELECTRICITY_USED_TARIFF_2
-        current = data.CURRENT_ELECTRICITY_USAGE
-        returned = data.CURRENT_ELECTRICITY_DELIVERY
+        if not isinstance(data, DSMRReading):
+            data = DSMRReading.from_telegram(data)
 
         logger.info(
-            f"electricity sn={sn} "
-            f"t1={t1.value}{t1.unit} "
-            f"t2={t2.value}{t2.unit} "
-            f"now={current.value}{current.unit} "
-            f"returned={returned.value}{returned.unit}"
+            f"electricity sn={data.sn} "
+            f"t1={data.t1}kWh "
+            f"t2={data.t2}kWh "
+            f"now={data.current}kW "
+            f"returned={data.returned}kW"
         )
 
         if self.storage:
             self.storage.write(
                 "electricity",
-                {"sn": sn},
+                {"sn": data.sn},
                 {
-                    "t1": t1.value,
-                    "t2": t2.value,
-                    "current": current.value,
-                    "returned": returned.value,
+                    "t1": data.t1,
+                    "t2": data.t2,
+                    "current": data.current,
+                    "returned": data.returned,
                 },
+                data.timestamp,
             )
+
+    def process_batch(self, batch: list) -> None:
+        readings = [data if isinstance(data, DSMRReading) else DSMRReading.from_telegram(data) for data in batch]
+        if not readings:
+            return
+
+        logger.info(f"electricity batch: {len(readings)} readings")
+        if self.storage:
+            timestamp, sn, t1, t2, current, returned, _ = zip(*readings)
+            self.storage.write_table(PointTable.from_columns(
+                "electricity",
+                timestamp,
+                {"sn": sn},
+                {"t1": t1, "t2": t2, "current": current, "returned": returned},
+            ))
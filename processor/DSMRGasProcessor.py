@@ -1,7 +1,8 @@
 import logging
 
+from dsmr import DSMRReading
 from processor import AbstractProcessor
-from storage.AbstractStorage import AbstractStorage
+from storage import AbstractStorage, PointTable
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +14,34 @@ class DSMRGasProcessor(AbstractProcessor):
         super().__init__(storage=storage)
 
     def __call__(self, data) -> None:
-        for device in data.MBUS_DEVICES:
-            if device.MBUS_DEVICE_TYPE.value == GAS_DEVICE_TYPE:
-                sn = device.MBUS_EQUIPMENT_IDENTIFIER.value
-                reading = device.MBUS_METER_READING
-                logger.info(f"gas sn={sn} reading={reading.value} {reading.unit}")
-                if self.storage:
-                    self.storage.write(
-                        "gas",
-                        {"sn": sn},
-                        {"reading": reading.value},
-                    )
-                return
+        if not isinstance(data, DSMRReading):
+            data = DSMRReading.from_telegram(data)
+
+        device = data.mbus.get(GAS_DEVICE_TYPE)
+        if device is None:
+            return
+
+        logger.info(f"gas sn={device.sn} reading={device.reading} {device.unit}")
+        if self.storage:
+            self.storage.write(
+                "gas",
+                {"sn": device.sn},
+                {"reading": device.reading},
+                data.timestamp,
+            )
+
+    def process_batch(self, batch: list) -> None:
+        rows = []
+        for data in batch:
+            if not isinstance(data, DSMRReading):
+                data = DSMRReading.from_telegram(data)
+            device = data.mbus.get(GAS_DEVICE_TYPE)
+            if device is not None:
+                rows.append((data.timestamp, device.sn, device.reading))
+        if not rows:
+            return
+
+        logger.info(f"gas batch: {len(rows)} readings")
+        if self.storage:
+            timestamp, sn, reading = zip(*rows)
+            self.storage.write_table(PointTable.from_columns("gas", timestamp, {"sn": sn}, {"reading": reading}))
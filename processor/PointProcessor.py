@@ -0,0 +1,15 @@
+from processor import AbstractProcessor
+from storage.AbstractStorage import AbstractStorage
+
+
+class PointProcessor(AbstractProcessor):
+    def __init__(self, storage: AbstractStorage | None = None):
+        super().__init__(storage=storage)
+
+    def __call__(self, data) -> None:
+        if self.storage:
+            self.storage.write(*data)
+
+    def process_batch(self, batch: list) -> None:
+        if self.storage:
+            self.storage.write_batch(list(batch))
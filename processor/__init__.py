@@ -1,6 +1,9 @@
 from processor.AbstractProcessor import AbstractProcessor
+from processor.AbstractAsyncProcessor import AbstractAsyncProcessor
 from processor.NoneProcessor import NoneProcessor
 from processor.PassProcessor import PassProcessor
 from processor.DSMRElectricityProcessor import DSMRElectricityProcessor
 from processor.DSMRGasProcessor import DSMRGasProcessor
-from processor.ChainProcessor import ChainProcessor
\ No newline at end of file
+from processor.ChainProcessor import ChainProcessor
+from processor.PointProcessor import PointProcessor
+from processor.AsyncProcessorAdapter import AsyncProcessorAdapter
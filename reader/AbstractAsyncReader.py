@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+
+
+class AbstractAsyncReader(AsyncIterator, ABC):
+    @abstractmethod
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def read_batch(self, size: int) -> list:
+        batch = []
+        try:
+            while len(batch) < size:
+                batch.append(await anext(self))
+        except StopAsyncIteration:
+            pass
+        return batch
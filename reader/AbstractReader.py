@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
+from itertools import islice
 
 
 class AbstractReader(Iterator, ABC):
     @abstractmethod
     def __next__(self):
-        raise StopIteration
\ No newline at end of file
+        raise StopIteration
+
+    def read_batch(self, size: int) -> list:
+        return list(islice(self, size))
\ No newline at end of file
@@ -0,0 +1,35 @@
+import asyncio
+from typing import Iterable
+
+from dsmr import TelegramParser
+from reader import AbstractAsyncReader
+
+
+class AsyncDSMRv5SerialReader(AbstractAsyncReader):
+    def __init__(self, device: str = '/dev/ttyUSB0', objects: Iterable[str] | None = None, output: str = 'reading'):
+        from dsmr_parser import telegram_specifications
+        from dsmr_parser.clients import AsyncSerialReader, SERIAL_SETTINGS_V5
+
+        self.reader = AsyncSerialReader(
+            device=device,
+            serial_settings=SERIAL_SETTINGS_V5,
+            telegram_specification=telegram_specifications.V5
+        )
+        self.reader.telegram_parser = TelegramParser(objects, errors='skip', output=output)
+        self._queue = None
+        self._task = None
+
+    async def __anext__(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self.reader.read_as_object(self._queue))
+
+        while True:
+            get = asyncio.ensure_future(self._queue.get())
+            await asyncio.wait((get, self._task), return_when=asyncio.FIRST_COMPLETED)
+            if not get.done():
+                get.cancel()
+                self._task.result()
+                raise StopAsyncIteration
+            if get.result() is not None:
+                return get.result()
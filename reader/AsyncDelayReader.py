@@ -0,0 +1,33 @@
+import asyncio
+from typing import Iterable
+
+from reader import AbstractAsyncReader
+from reader.PollSchedule import PollSchedule
+
+
+class AsyncDelayReader(AbstractAsyncReader):
+    def __init__(
+        self,
+        reader: AbstractAsyncReader,
+        delay: float = 1.0,
+        mode: str = 'delay',
+        min_delay: float | None = None,
+        max_delay: float | None = None,
+        factor: float = 2.0,
+        tolerance: float = 0.0,
+        fields: Iterable[str] | None = None,
+        jitter: float = 0.0,
+        schedule: PollSchedule | None = None,
+    ):
+        self.reader = reader
+        self.delay = delay
+        self.schedule = schedule or PollSchedule(delay, mode, min_delay, max_delay, factor, tolerance, fields, jitter)
+
+    async def __anext__(self):
+        await asyncio.sleep(self.schedule.wait())
+        data = await anext(self.reader)
+        self.schedule.update(data)
+        return data
+
+    def stats(self) -> dict:
+        return self.schedule.stats()
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Iterable
+
+from dsmr import TelegramParser
+from reader import AbstractAsyncReader
+from reader.P1ConnectionPool import P1ConnectionPool
+
+
+class AsyncP1TcpReader(AbstractAsyncReader):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        objects: Iterable[str] | None = None,
+        output: str = 'reading',
+        maxsize: int = 100,
+        pool: P1ConnectionPool | None = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.pool = pool or P1ConnectionPool.shared()
+
+        self.parser = TelegramParser(objects, errors='skip', output=output)
+        self.telegrams = 0
+        self.invalid = 0
+        self.dropped = 0
+        self._frames: asyncio.Queue | None = None
+        self._loop = None
+
+    async def __anext__(self):
+        if self._frames is None:
+            self._loop = asyncio.get_running_loop()
+            self._frames = asyncio.Queue(self.maxsize)
+            self.pool.subscribe(self.host, self.port, self._receive)
+
+        while True:
+            item = self.parser.parse((await self._frames.get()).decode('ascii', errors='replace'))
+            if item is not None:
+                self.telegrams += 1
+                return item
+            self.invalid += 1
+
+    def stats(self) -> dict:
+        return {
+            "telegrams": self.telegrams,
+            "invalid": self.invalid,
+            "dropped": self.dropped,
+            "queued": self._frames.qsize() if self._frames is not None else 0,
+        }
+
+    def close(self) -> None:
+        if self._frames is not None:
+            self.pool.unsubscribe(self.host, self.port, self._receive)
+            self._frames = None
+
+    def _receive(self, frame: bytes) -> None:
+        self._loop.call_soon_threadsafe(self._put, frame)
+
+    def _put(self, frame: bytes) -> None:
+        if self._frames is None:
+            return
+        if self._frames.full():
+            self._frames.get_nowait()
+            self.dropped += 1
+        self._frames.put_nowait(frame)
@@ -0,0 +1,67 @@
+import asyncio
+import queue
+import threading
+
+from reader import AbstractAsyncReader, AbstractReader
+
+_EXHAUSTED = object()
+
+
+class AsyncReaderAdapter(AbstractAsyncReader):
+    def __init__(self, reader: AbstractReader):
+        self.reader = reader
+        self._calls = None
+
+    @classmethod
+    def wrap(cls, reader: AbstractReader | AbstractAsyncReader) -> AbstractAsyncReader:
+        from reader.AsyncDelayReader import AsyncDelayReader
+        from reader.AsyncP1TcpReader import AsyncP1TcpReader
+        from reader.DelayReader import DelayReader
+        from reader.P1TcpReader import P1TcpReader
+
+        if isinstance(reader, AbstractAsyncReader):
+            return reader
+        if isinstance(reader, DelayReader):
+            return AsyncDelayReader(reader=cls.wrap(reader.reader), delay=reader.delay, schedule=reader.schedule)
+        if isinstance(reader, P1TcpReader):
+            return AsyncP1TcpReader(reader.host, reader.port, reader.objects, reader.output, reader.maxsize, reader.pool)
+        return cls(reader)
+
+    async def __anext__(self):
+        data = await self._call(next, self.reader, _EXHAUSTED)
+        if data is _EXHAUSTED:
+            raise StopAsyncIteration
+        return data
+
+    async def read_batch(self, size: int) -> list:
+        return await self._call(self.reader.read_batch, size)
+
+    def _call(self, function, *args) -> asyncio.Future:
+        # a blocking read can take forever, so each reader gets its own thread instead of the loop's executor
+        if self._calls is None:
+            self._calls = queue.SimpleQueue()
+            threading.Thread(target=self._serve, name='AsyncReaderAdapter', daemon=True).start()
+        future = asyncio.get_running_loop().create_future()
+        self._calls.put((future, function, args))
+        return future
+
+    def _serve(self) -> None:
+        while True:
+            future, function, args = self._calls.get()
+            try:
+                result, error = function(*args), None
+            except Exception as e:
+                result, error = None, e
+            try:
+                future.get_loop().call_soon_threadsafe(_settle, future, result, error)
+            except RuntimeError:
+                pass
+
+
+def _settle(future: asyncio.Future, result, error: Exception | None) -> None:
+    if future.done():
+        return
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
@@ -0,0 +1,29 @@
+import threading
+
+from reader import AbstractReader, BroadcastSubscriber
+
+
+class BroadcastReader:
+    def __init__(self, reader: AbstractReader, maxsize: int = 16):
+        self.reader = reader
+        self.maxsize = maxsize
+        self.subscribers: list[BroadcastSubscriber] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, maxsize: int | None = None) -> BroadcastSubscriber:
+        subscriber = BroadcastSubscriber(self, maxsize=maxsize or self.maxsize)
+        with self._lock:
+            self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: BroadcastSubscriber) -> None:
+        with self._lock:
+            self.subscribers.remove(subscriber)
+
+    def pull(self, subscriber: BroadcastSubscriber) -> None:
+        with self._lock:
+            if subscriber.buffer:
+                return
+            data = next(self.reader)
+            for each in self.subscribers:
+                each.push(data)
@@ -0,0 +1,22 @@
+from collections import deque
+
+from reader import AbstractReader
+
+
+class BroadcastSubscriber(AbstractReader):
+    def __init__(self, broadcast, maxsize: int = 16):
+        self.broadcast = broadcast
+        self.buffer = deque(maxlen=maxsize)
+        self.dropped = 0
+
+    def push(self, data) -> None:
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(data)
+
+    def __next__(self):
+        while True:
+            try:
+                return self.buffer.popleft()
+            except IndexError:
+                self.broadcast.pull(self)
@@ -1,11 +1,12 @@
-from dsmr_parser import telegram_specifications
-from dsmr_parser.parsers import TelegramParser
+from typing import Iterable
+
+from dsmr import TelegramParser
 from reader import AbstractReader
 
 
 class DSMRv5RawReader(AbstractReader):
-    def __init__(self, raw: str):
-        self._telegram = TelegramParser(telegram_specifications.V5, apply_checksum_validation=False).parse(raw)
+    def __init__(self, raw: str, objects: Iterable[str] | None = None, output: str = 'reading'):
+        self._telegram = TelegramParser(objects, validate_checksum=False, output=output).parse(raw)
 
     def __next__(self):
         return self._telegram
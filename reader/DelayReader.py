@@ -1,12 +1,32 @@
 from time import sleep
+from typing import Iterable
 
 from reader import AbstractReader
+from reader.PollSchedule import PollSchedule
+
 
 class DelayReader(AbstractReader):
-    def __init__(self, reader: AbstractReader, delay: float = 1.0):
+    def __init__(
+        self,
+        reader: AbstractReader,
+        delay: float = 1.0,
+        mode: str = 'delay',
+        min_delay: float | None = None,
+        max_delay: float | None = None,
+        factor: float = 2.0,
+        tolerance: float = 0.0,
+        fields: Iterable[str] | None = None,
+        jitter: float = 0.0,
+    ):
         self.reader = reader
         self.delay = delay
+        self.schedule = PollSchedule(delay, mode, min_delay, max_delay, factor, tolerance, fields, jitter)
 
     def __next__(self):
-        sleep(self.delay)
-        return next(self.reader)
\ No newline at end of file
+        sleep(self.schedule.wait())
+        data = next(self.reader)
+        self.schedule.update(data)
+        return data
+
+    def stats(self) -> dict:
+        return self.schedule.stats()
@@ -0,0 +1,285 @@
+import errno
+import logging
+import selectors
+import socket
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from time import monotonic
+from typing import Callable
+
+from dsmr import FrameBuffer
+
+logger = logging.getLogger(__name__)
+
+Endpoint = tuple[str, int]
+
+
+class _Connection:
+    __slots__ = (
+        'endpoint', 'subscribers', 'buffer', 'sock', 'connecting', 'resolving', 'deadline', 'retry_at',
+        'failures', 'frames', 'reconnects',
+    )
+
+    def __init__(self, endpoint: Endpoint, buffer_size: int):
+        self.endpoint = endpoint
+        self.subscribers: list[Callable[[bytes], None]] = []
+        self.buffer = FrameBuffer(buffer_size)
+        self.sock: socket.socket | None = None
+        self.connecting = False
+        self.resolving = False
+        self.deadline = 0.0
+        self.retry_at = 0.0
+        self.failures = 0
+        self.frames = 0
+        self.reconnects = 0
+
+
+class P1ConnectionPool:
+    def __init__(
+        self,
+        buffer_size: int = 64 * 1024,
+        chunk_size: int = 64 * 1024,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        connect_timeout: float = 10.0,
+        idle_timeout: float = 30.0,
+        resolvers: int = 4,
+    ):
+        self.buffer_size = buffer_size
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.connect_timeout = connect_timeout
+        self.idle_timeout = idle_timeout
+
+        self._connections: dict[Endpoint, _Connection] = {}
+        self._commands = deque()
+        self._receive = memoryview(bytearray(chunk_size))
+        self._selector = selectors.DefaultSelector()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, None)
+        self._resolver = ThreadPoolExecutor(max_workers=resolvers, thread_name_prefix='P1ConnectionPool-resolve')
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._next_timer = 0.0
+
+    @classmethod
+    @cache
+    def shared(cls) -> 'P1ConnectionPool':
+        return cls()
+
+    def subscribe(self, host: str, port: int, callback: Callable[[bytes], None]) -> None:
+        self._call(self._subscribe, (host, port), callback)
+
+    def unsubscribe(self, host: str, port: int, callback: Callable[[bytes], None]) -> None:
+        self._call(self._unsubscribe, (host, port), callback)
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "endpoint": f"{host}:{port}",
+                "connected": connection.sock is not None and not connection.connecting,
+                "subscribers": len(connection.subscribers),
+                "frames": connection.frames,
+                "dropped": connection.buffer.dropped,
+                "reconnects": connection.reconnects,
+            }
+            for (host, port), connection in list(self._connections.items())
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wake()
+        if thread is not None:
+            thread.join()
+        self._resolver.shutdown(wait=False, cancel_futures=True)
+        for connection in self._connections.values():
+            self._disconnect(connection)
+        self._connections.clear()
+        self._selector.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+
+    def _call(self, function, *args) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("connection pool is closed")
+            self._commands.append((function, args))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='P1ConnectionPool', daemon=True)
+                self._thread.start()
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run(self) -> None:
+        while not self._closed:
+            timeout = max(0.0, self._next_timer - monotonic()) if self._connections else None
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    self._drain_wake()
+                    continue
+                try:
+                    if key.data.connecting:
+                        self._connected(key.data)
+                    else:
+                        self._read(key.data)
+                except Exception as e:
+                    logger.exception(f"p1: {key.data.endpoint[0]}:{key.data.endpoint[1]} failed")
+                    self._fail(key.data, e)
+
+            while self._commands:
+                function, args = self._commands.popleft()
+                try:
+                    function(*args)
+                except Exception:
+                    logger.exception(f"p1: {function.__name__} failed")
+            if monotonic() >= self._next_timer:
+                self._check_timers()
+
+    def _drain_wake(self) -> None:
+        try:
+            while self._wake_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _subscribe(self, endpoint: Endpoint, callback) -> None:
+        connection = self._connections.get(endpoint)
+        if connection is None:
+            connection = self._connections[endpoint] = _Connection(endpoint, self.buffer_size)
+            self._connect(connection)
+        connection.subscribers.append(callback)
+
+    def _unsubscribe(self, endpoint: Endpoint, callback) -> None:
+        connection = self._connections.get(endpoint)
+        if connection is None or callback not in connection.subscribers:
+            return
+        connection.subscribers.remove(callback)
+        if not connection.subscribers:
+            self._disconnect(connection)
+            del self._connections[endpoint]
+
+    def _connect(self, connection: _Connection) -> None:
+        connection.resolving = True
+        host, port = connection.endpoint
+        future = self._resolver.submit(socket.getaddrinfo, host, port, type=socket.SOCK_STREAM)
+        future.add_done_callback(lambda future: self._post(self._resolved, connection, future))
+
+    def _post(self, function, *args) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._commands.append((function, args))
+        self._wake()
+
+    def _resolved(self, connection: _Connection, future) -> None:
+        connection.resolving = False
+        if self._connections.get(connection.endpoint) is not connection:
+            return
+        try:
+            family, kind, proto, _, address = future.result()[0]
+            sock = socket.socket(family, kind, proto)
+            sock.setblocking(False)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            error = sock.connect_ex(address)
+            if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                sock.close()
+                raise OSError(error, f"connect failed: {errno.errorcode.get(error, error)}")
+        except OSError as e:
+            self._fail(connection, e)
+            return
+
+        connection.sock = sock
+        connection.connecting = True
+        self._schedule(connection, monotonic() + self.connect_timeout)
+        self._selector.register(sock, selectors.EVENT_WRITE, connection)
+
+    def _connected(self, connection: _Connection) -> None:
+        error = connection.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            self._fail(connection, OSError(error, f"connect failed: {errno.errorcode.get(error, error)}"))
+            return
+
+        connection.connecting = False
+        self._selector.modify(connection.sock, selectors.EVENT_READ, connection)
+        self._schedule(connection, monotonic() + self.idle_timeout)
+        if connection.failures:
+            logger.info(f"p1: {connection.endpoint[0]}:{connection.endpoint[1]} reconnected")
+
+    def _read(self, connection: _Connection) -> None:
+        try:
+            size = connection.sock.recv_into(self._receive)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._fail(connection, e)
+            return
+        if not size:
+            self._fail(connection, ConnectionResetError("connection closed by peer"))
+            return
+
+        connection.failures = 0
+        connection.deadline = monotonic() + self.idle_timeout
+        connection.buffer.feed(self._receive[:size])
+        for frame in connection.buffer.frames():
+            connection.frames += 1
+            for callback in connection.subscribers:
+                try:
+                    callback(frame)
+                except Exception:
+                    logger.exception(f"p1: {connection.endpoint[0]}:{connection.endpoint[1]} subscriber failed")
+
+    def _fail(self, connection: _Connection, error: Exception) -> None:
+        self._disconnect(connection)
+        connection.failures += 1
+        connection.reconnects += 1
+        delay = min(self.backoff * 2 ** (connection.failures - 1), self.max_backoff)
+        connection.retry_at = monotonic() + delay
+        self._next_timer = min(self._next_timer, connection.retry_at)
+        host, port = connection.endpoint
+        logger.warning(f"p1: {host}:{port} failed, reconnecting in {delay:.1f}s: {error}")
+
+    def _disconnect(self, connection: _Connection) -> None:
+        if connection.sock is None:
+            return
+        try:
+            self._selector.unregister(connection.sock)
+        except (KeyError, ValueError):
+            pass
+        connection.sock.close()
+        connection.sock = None
+        connection.connecting = False
+
+    def _schedule(self, connection: _Connection, deadline: float) -> None:
+        connection.deadline = deadline
+        self._next_timer = min(self._next_timer, deadline)
+
+    def _check_timers(self) -> None:
+        now = monotonic()
+        next_timer = now + self.idle_timeout
+        for connection in list(self._connections.values()):
+            if connection.resolving:
+                continue
+            if connection.sock is None:
+                if connection.retry_at <= now:
+                    self._connect(connection)
+                    continue
+            elif connection.deadline <= now:
+                state = 'connect' if connection.connecting else 'read'
+                self._fail(connection, TimeoutError(f"{state} timed out"))
+            if connection.sock is None:
+                next_timer = min(next_timer, connection.retry_at)
+            else:
+                next_timer = min(next_timer, connection.deadline)
+        self._next_timer = next_timer
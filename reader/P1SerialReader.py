@@ -0,0 +1,106 @@
+import logging
+from collections import deque
+from time import sleep
+from typing import Iterable
+
+from dsmr import FrameBuffer, TelegramParser
+from reader import AbstractReader
+
+logger = logging.getLogger(__name__)
+
+
+class P1SerialReader(AbstractReader):
+    def __init__(
+        self,
+        device: str = '/dev/ttyUSB0',
+        baudrate: int = 115200,
+        objects: Iterable[str] | None = None,
+        output: str = 'reading',
+        chunk_size: int = 4096,
+        buffer_size: int = 64 * 1024,
+        timeout: float = 1.0,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        import serial
+
+        self._serial = serial
+        self.device = device
+        self.baudrate = baudrate
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.parser = TelegramParser(objects, errors='skip', output=output)
+        self.buffer = FrameBuffer(buffer_size)
+        self.telegrams = 0
+        self.invalid = 0
+        self.reconnects = 0
+        self._pending = deque()
+        self._port = None
+        self._failures = 0
+
+    @property
+    def bad_frames(self) -> int:
+        return self.buffer.dropped + self.invalid
+
+    def __next__(self):
+        while not self._pending:
+            self._fill()
+        self.telegrams += 1
+        return self._pending.popleft()
+
+    def stats(self) -> dict:
+        return {
+            "telegrams": self.telegrams,
+            "bad_frames": self.bad_frames,
+            "reconnects": self.reconnects,
+            "buffered": len(self.buffer),
+        }
+
+    def close(self) -> None:
+        if self._port is not None:
+            self._port.close()
+            self._port = None
+
+    def _fill(self) -> None:
+        try:
+            port = self._open()
+            chunk = port.read(max(1, min(port.in_waiting, self.chunk_size)))
+        except (OSError, self._serial.SerialException) as e:
+            self._reconnect(e)
+            return
+
+        if not chunk:
+            return
+        self._failures = 0
+        self.buffer.feed(chunk)
+        for frame in self.buffer.frames():
+            item = self.parser.parse(frame.decode('ascii', errors='replace'))
+            if item is None:
+                self.invalid += 1
+            else:
+                self._pending.append(item)
+
+    def _open(self):
+        if self._port is None:
+            self._port = self._serial.serial_for_url(self.device, baudrate=self.baudrate, timeout=self.timeout)
+            if self._failures:
+                logger.info(f"p1: {self.device} reopened")
+        return self._port
+
+    def _reconnect(self, error: Exception) -> None:
+        try:
+            self.close()
+        except (OSError, self._serial.SerialException):
+            self._port = None
+
+        self._failures += 1
+        self.reconnects += 1
+        delay = min(self.backoff * 2 ** (self._failures - 1), self.max_backoff)
+        logger.warning(f"p1: {self.device} failed, reopening in {delay:.1f}s: {error}")
+        sleep(delay)
@@ -0,0 +1,71 @@
+import queue
+from typing import Iterable
+
+from dsmr import TelegramParser
+from reader import AbstractReader
+from reader.P1ConnectionPool import P1ConnectionPool
+
+
+class P1TcpReader(AbstractReader):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        objects: Iterable[str] | None = None,
+        output: str = 'reading',
+        maxsize: int = 100,
+        pool: P1ConnectionPool | None = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.host = host
+        self.port = port
+        self.objects = objects
+        self.output = output
+        self.maxsize = maxsize
+        self.pool = pool or P1ConnectionPool.shared()
+
+        self.parser = TelegramParser(objects, errors='skip', output=output)
+        self.telegrams = 0
+        self.invalid = 0
+        self.dropped = 0
+        self._frames = queue.Queue(maxsize)
+        self._subscribed = False
+
+    def __next__(self):
+        if not self._subscribed:
+            self.pool.subscribe(self.host, self.port, self._receive)
+            self._subscribed = True
+
+        while True:
+            item = self.parser.parse(self._frames.get().decode('ascii', errors='replace'))
+            if item is not None:
+                self.telegrams += 1
+                return item
+            self.invalid += 1
+
+    def stats(self) -> dict:
+        return {
+            "telegrams": self.telegrams,
+            "invalid": self.invalid,
+            "dropped": self.dropped,
+            "queued": self._frames.qsize(),
+        }
+
+    def close(self) -> None:
+        if self._subscribed:
+            self.pool.unsubscribe(self.host, self.port, self._receive)
+            self._subscribed = False
+
+    def _receive(self, frame: bytes) -> None:
+        while True:
+            try:
+                self._frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
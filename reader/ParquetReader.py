@@ -0,0 +1,116 @@
+import heapq
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from reader import AbstractReader
+from storage.ParquetStorage import TAGS_METADATA_KEY
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value: datetime | str | None) -> datetime | None:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class ParquetReader(AbstractReader):
+    def __init__(
+        self,
+        path: str,
+        measurements: list[str] | None = None,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        batch_size: int = 65_536,
+    ):
+        import pyarrow  # noqa: F401
+
+        self.path = Path(path)
+        self.measurements = measurements
+        self.start = _utc(start)
+        self.end = _utc(end)
+        self.batch_size = batch_size
+        self._points = None
+
+    def __next__(self) -> tuple[str, dict, dict, datetime]:
+        if self._points is None:
+            self._points = heapq.merge(*(self._read(m) for m in self._measurements()), key=lambda point: point[3])
+        return next(self._points)
+
+    def table(self, measurement: str) -> 'pyarrow.Table':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tables = [table for table in (self._read_file(pq, file) for file in self._files(measurement)) if table]
+        if not tables:
+            return pa.table({})
+        table = pa.concat_tables(tables, promote_options='permissive')
+        mask = self._mask(table['timestamp'])
+        return table if mask is None else table.filter(mask)
+
+    def _measurements(self) -> list[str]:
+        if self.measurements is not None:
+            return list(self.measurements)
+        return sorted(d.name.partition('=')[2] for d in self.path.glob('measurement=*') if d.is_dir())
+
+    def _files(self, measurement: str) -> list[Path]:
+        files = []
+        for directory in sorted((self.path / f"measurement={measurement}").glob('date=*')):
+            day = directory.name.partition('=')[2]
+            if self.start is not None and day < self.start.date().isoformat():
+                continue
+            if self.end is not None and day > self.end.date().isoformat():
+                continue
+            files.extend(sorted(directory.glob('part-*.parquet')))
+        return files
+
+    def _read_file(self, pq, file: Path):
+        try:
+            return pq.read_table(file)
+        except Exception as e:
+            logger.warning(f"parquet: skipping unreadable {file}: {e}")
+            return None
+
+    def _mask(self, timestamps):
+        import pyarrow.compute as pc
+
+        mask = None
+        if self.start is not None:
+            mask = pc.greater_equal(timestamps, self.start)
+        if self.end is not None:
+            before = pc.less(timestamps, self.end)
+            mask = before if mask is None else pc.and_(mask, before)
+        return mask
+
+    def _read(self, measurement: str):
+        import pyarrow.parquet as pq
+
+        for file in self._files(measurement):
+            try:
+                parquet_file = pq.ParquetFile(file)
+            except Exception as e:
+                logger.warning(f"parquet: skipping unreadable {file}: {e}")
+                continue
+
+            metadata = parquet_file.schema_arrow.metadata or {}
+            tag_names = json.loads(metadata.get(TAGS_METADATA_KEY, b'[]'))
+            for batch in parquet_file.iter_batches(batch_size=self.batch_size):
+                mask = self._mask(batch['timestamp'])
+                if mask is not None:
+                    batch = batch.filter(mask)
+
+                columns = batch.to_pydict()
+                timestamps = columns.pop('timestamp')
+                tags = [(name, columns.pop(name)) for name in tag_names if name in columns]
+                fields = list(columns.items())
+                for row, timestamp in enumerate(timestamps):
+                    yield (
+                        measurement,
+                        {name: values[row] for name, values in tags},
+                        {name: values[row] for name, values in fields if values[row] is not None},
+                        timestamp,
+                    )
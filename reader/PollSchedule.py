@@ -0,0 +1,99 @@
+from decimal import Decimal
+from random import uniform
+from time import monotonic
+from typing import Iterable
+
+MODES = ('delay', 'rate', 'adaptive')
+
+
+class PollSchedule:
+    def __init__(
+        self,
+        delay: float = 1.0,
+        mode: str = 'delay',
+        min_delay: float | None = None,
+        max_delay: float | None = None,
+        factor: float = 2.0,
+        tolerance: float = 0.0,
+        fields: Iterable[str] | None = None,
+        jitter: float = 0.0,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if delay < 0:
+            raise ValueError("delay must not be negative")
+        if jitter < 0:
+            raise ValueError("jitter must not be negative")
+
+        self.delay = delay
+        self.mode = mode
+        self.min_delay = delay if min_delay is None else min_delay
+        self.max_delay = delay * 10 if max_delay is None else max_delay
+        self.factor = factor
+        self.tolerance = tolerance
+        self.fields = tuple(fields) if fields is not None else None
+        self.jitter = jitter
+        if mode == 'adaptive':
+            if not 0 < self.min_delay <= delay <= self.max_delay:
+                raise ValueError("adaptive mode requires 0 < min_delay <= delay <= max_delay")
+            if factor <= 1:
+                raise ValueError("factor must be greater than 1")
+
+        self.interval = delay
+        self.late = 0
+        self._first = True
+        self._deadline: float | None = None
+        self._previous = None
+
+    def wait(self) -> float:
+        offset = 0.0
+        if self._first:
+            self._first = False
+            offset = uniform(0, self.jitter) if self.jitter else 0.0
+        if self.mode == 'delay':
+            return self.interval + offset
+
+        now = monotonic()
+        if self._deadline is None:
+            self._deadline = now + offset + self.interval
+        else:
+            self._deadline += self.interval
+            if self._deadline < now:
+                self.late += 1
+                self._deadline = now
+        return self._deadline - now
+
+    def update(self, value) -> None:
+        if self.mode != 'adaptive':
+            return
+
+        current = self._values(value)
+        if self._previous is not None:
+            if self._changed(self._previous, current):
+                self.interval = max(self.interval / self.factor, self.min_delay)
+            else:
+                self.interval = min(self.interval * self.factor, self.max_delay)
+        self._previous = current
+
+    def stats(self) -> dict:
+        return {"interval": self.interval, "late": self.late}
+
+    def _values(self, value) -> tuple:
+        if self.fields is None:
+            return (value,)
+        if isinstance(value, dict):
+            return tuple(value.get(field) for field in self.fields)
+        return tuple(getattr(value, field, None) for field in self.fields)
+
+    def _changed(self, previous: tuple, current: tuple) -> bool:
+        for old, new in zip(previous, current):
+            if _is_number(old) and _is_number(new):
+                if abs(new - old) > self.tolerance:
+                    return True
+            elif old != new:
+                return True
+        return False
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
@@ -0,0 +1,145 @@
+import csv
+import mmap
+from datetime import datetime
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Iterable, Iterator
+
+from dsmr import TelegramParser
+from dsmr.CosemValue import value_of
+from reader import AbstractReader
+
+FORMATS = ('auto', 'p1', 'csv')
+
+
+def _number(value: str):
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class ReplayReader(AbstractReader):
+    def __init__(
+        self,
+        path: str,
+        format: str = 'auto',
+        speed: float | None = None,
+        tags: Iterable[str] = ('sn',),
+        objects: Iterable[str] | None = None,
+        validate_checksum: bool = True,
+        output: str = 'reading',
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}")
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+
+        self.path = Path(path)
+        self.format = ('csv' if self.path.suffix == '.csv' else 'p1') if format == 'auto' else format
+        self.speed = speed
+        self.tags = set(tags)
+        self.parser = TelegramParser(objects, validate_checksum=validate_checksum, errors='skip', output=output)
+        self.skipped = 0
+        self._items = None
+        self._started = None
+
+    def __next__(self):
+        if self._items is None:
+            self._items = self._csv() if self.format == 'csv' else self._telegrams()
+
+        item = next(self._items)
+        if self.speed is not None:
+            self._pace(self._timestamp(item))
+        return item
+
+    def _map(self) -> mmap.mmap | None:
+        with open(self.path, 'rb') as f:
+            if not f.seek(0, 2):
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _telegrams(self) -> Iterator:
+        data = self._map()
+        if data is None:
+            return
+        with data:
+            position = data.find(b'/')
+            while position != -1:
+                bang = data.find(b'!', position)
+                if bang == -1:
+                    return
+                end = data.find(b'\n', bang)
+                end = len(data) if end == -1 else end + 1
+                following = data.find(b'/', position + 1, bang)
+                if following != -1:
+                    self.skipped += 1
+                    position = following
+                    continue
+
+                item = self.parser.parse(data[position:end].decode('ascii', errors='replace'))
+                if item is None:
+                    self.skipped += 1
+                else:
+                    yield item
+                position = data.find(b'/', end)
+
+    def _lines(self, data: mmap.mmap) -> Iterator[str]:
+        position = 0
+        size = len(data)
+        while position < size:
+            end = data.find(b'\n', position)
+            end = size if end == -1 else end + 1
+            yield data[position:end].decode()
+            position = end
+
+    def _csv(self) -> Iterator[tuple[str, dict, dict, datetime]]:
+        data = self._map()
+        if data is None:
+            return
+        with data:
+            header = None
+            for row in csv.reader(self._lines(data)):
+                if not row:
+                    continue
+                if row[0] == 'timestamp':
+                    header = row
+                    continue
+                if header is None:
+                    raise ValueError(f"{self.path}: missing CSV header")
+
+                tags = {}
+                fields = {}
+                for name, value in zip(header[2:], row[2:]):
+                    if value == '':
+                        continue
+                    if name in self.tags:
+                        tags[name] = value
+                    else:
+                        fields[name] = _number(value)
+                yield row[1], tags, fields, datetime.fromisoformat(row[0])
+
+    @staticmethod
+    def _timestamp(item) -> datetime | None:
+        if isinstance(item, tuple) and len(item) == 4:
+            return item[3]
+        timestamp = getattr(item, 'timestamp', None)
+        if isinstance(timestamp, datetime):
+            return timestamp
+        return value_of(item, 'P1_MESSAGE_TIMESTAMP')
+
+    def _pace(self, timestamp: datetime | None) -> None:
+        if timestamp is None:
+            return
+        if self._started is None:
+            self._started = (timestamp, monotonic())
+            return
+
+        first, started_at = self._started
+        delay = started_at + (timestamp - first).total_seconds() / self.speed - monotonic()
+        if delay > 0:
+            sleep(delay)
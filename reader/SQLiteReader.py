@@ -0,0 +1,33 @@
+import heapq
+from datetime import datetime
+
+from reader import AbstractReader
+from storage.SQLiteStorage import SQLiteStorage
+
+
+class SQLiteReader(AbstractReader):
+    def __init__(
+        self,
+        path: str,
+        measurements: list[str] | None = None,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        tags: dict | None = None,
+        batch_size: int = 1000,
+    ):
+        self.storage = SQLiteStorage(path)
+        self.measurements = measurements
+        self.start = start
+        self.end = end
+        self.tags = tags
+        self.batch_size = batch_size
+        self._points = None
+
+    def __next__(self) -> tuple[str, dict, dict, datetime]:
+        if self._points is None:
+            measurements = self.storage.measurements() if self.measurements is None else self.measurements
+            self._points = heapq.merge(
+                *(self.storage.query(m, self.start, self.end, self.tags, self.batch_size) for m in measurements),
+                key=lambda point: point[3],
+            )
+        return next(self._points)
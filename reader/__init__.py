@@ -1,6 +1,20 @@
 from reader.AbstractReader import AbstractReader
+from reader.AbstractAsyncReader import AbstractAsyncReader
+from reader.PollSchedule import PollSchedule
 from reader.DelayReader import DelayReader
 from reader.RandomReader import RandomReader
 from reader.ZeroReader import ZeroReader
 from reader.DSMRv5SerialReader import DSMRv5SerialReader
-from reader.DSMRv5RawReader import DSMRv5RawReader
\ No newline at end of file
+from reader.DSMRv5RawReader import DSMRv5RawReader
+from reader.P1SerialReader import P1SerialReader
+from reader.P1ConnectionPool import P1ConnectionPool
+from reader.P1TcpReader import P1TcpReader
+from reader.ParquetReader import ParquetReader
+from reader.SQLiteReader import SQLiteReader
+from reader.ReplayReader import ReplayReader
+from reader.BroadcastSubscriber import BroadcastSubscriber
+from reader.BroadcastReader import BroadcastReader
+from reader.AsyncDelayReader import AsyncDelayReader
+from reader.AsyncReaderAdapter import AsyncReaderAdapter
+from reader.AsyncDSMRv5SerialReader import AsyncDSMRv5SerialReader
+from reader.AsyncP1TcpReader import AsyncP1TcpReader
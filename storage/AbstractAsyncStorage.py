@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class AbstractAsyncStorage(ABC):
+    @abstractmethod
+    async def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        pass
+
+    async def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        for point in points:
+            await self.write(*point)
+
+    async def flush(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await self.flush()
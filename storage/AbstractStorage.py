@@ -1,8 +1,23 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from storage.PointTable import PointTable
+
 
 class AbstractStorage(ABC):
     @abstractmethod
     def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
         pass
+
+    def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        for point in points:
+            self.write(*point)
+
+    def write_table(self, points: PointTable) -> None:
+        self.write_batch(points.points())
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
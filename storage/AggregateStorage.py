@@ -0,0 +1,202 @@
+import math
+from collections import deque
+from datetime import datetime, timezone
+from decimal import Decimal
+from time import time
+
+from storage import AbstractStorage
+
+AGGREGATES = ('min', 'max', 'mean', 'last', 'count')
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def _energy(start: float, start_value: float, end: float, end_value: float) -> float:
+    return (start_value + end_value) / 2 * (end - start) / 3600
+
+
+class _Pane:
+    __slots__ = ('count', 'numbers', 'energy', 'others')
+
+    def __init__(self):
+        self.count = 0
+        self.numbers: dict[str, list[float]] = {}
+        self.energy: dict[str, float] = {}
+        self.others: dict = {}
+
+    def add(self, fields: dict) -> None:
+        self.count += 1
+        for name, value in fields.items():
+            if not _is_number(value):
+                self.others[name] = value
+                continue
+            value = float(value)
+            stats = self.numbers.get(name)
+            if stats is None:
+                self.numbers[name] = [value, value, value, 1, value]
+            else:
+                stats[0] = min(stats[0], value)
+                stats[1] = max(stats[1], value)
+                stats[2] += value
+                stats[3] += 1
+                stats[4] = value
+
+    def add_energy(self, energy: dict[str, float]) -> None:
+        for name, value in energy.items():
+            self.energy[name] = self.energy.get(name, 0.0) + value
+
+
+class _Series:
+    __slots__ = ('tags', 'pane_index', 'pane', 'closed', 'previous')
+
+    def __init__(self, tags: dict, pane_index: int, panes: int):
+        self.tags = tags
+        self.pane_index = pane_index
+        self.pane = _Pane()
+        self.closed: deque[_Pane | None] = deque(maxlen=panes)
+        self.previous: dict[str, tuple[float, float]] = {}
+
+
+class AggregateStorage(AbstractStorage):
+    def __init__(
+        self,
+        storage: AbstractStorage,
+        window: float = 60.0,
+        slide: float | None = None,
+        aggregates: list[str] = AGGREGATES,
+        integrate: list[str] = (),
+    ):
+        slide = window if slide is None else slide
+        if window <= 0 or slide <= 0:
+            raise ValueError("window and slide must be positive")
+        panes = window / slide
+        if not math.isclose(panes, round(panes)) or slide > window:
+            raise ValueError("window must be a whole multiple of slide")
+        unknown = set(aggregates) - set(AGGREGATES)
+        if unknown:
+            raise ValueError(f"aggregates must be among {AGGREGATES}")
+
+        self.storage = storage
+        self.window = window
+        self.slide = slide
+        self.aggregates = tuple(aggregates)
+        self.integrate = frozenset(integrate)
+        self._panes = round(panes)
+        self._series: dict[tuple, _Series] = {}
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        now = timestamp.timestamp() if timestamp is not None else time()
+        pane_index = math.floor(now / self.slide)
+        key = (measurement, *sorted(tags.items()))
+
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(tags, pane_index, self._panes)
+        segments = self._segments(series, fields, now)
+
+        if pane_index > series.pane_index:
+            elapsed = []
+            for index in range(series.pane_index + 1, pane_index + 1):
+                boundary = index * self.slide
+                energy = {}
+                for name, (start, start_value, value) in segments.items():
+                    if start < boundary:
+                        boundary_value = start_value + (value - start_value) * (boundary - start) / (now - start)
+                        energy[name] = _energy(start, start_value, boundary, boundary_value)
+                        segments[name] = (boundary, boundary_value, value)
+                elapsed.append(energy)
+            series.pane.add_energy(elapsed[0])
+            self._close(measurement, series, pane_index, elapsed[1:])
+
+        series.pane.add(fields)
+        series.pane.add_energy({
+            name: _energy(start, start_value, now, value) for name, (start, start_value, value) in segments.items()
+        })
+
+    def flush(self) -> None:
+        self.storage.flush()
+
+    def close(self) -> None:
+        for (measurement, *_), series in self._series.items():
+            if series.pane.count:
+                self._close(measurement, series, series.pane_index + 1)
+        self._series.clear()
+        self.storage.close()
+
+    def _segments(self, series: _Series, fields: dict, now: float) -> dict[str, tuple[float, float, float]]:
+        segments = {}
+        for name in self.integrate:
+            value = fields.get(name)
+            if not _is_number(value):
+                continue
+            value = float(value)
+            previous = series.previous.get(name)
+            if previous is not None and now > previous[0]:
+                segments[name] = (previous[0], previous[1], value)
+            series.previous[name] = (now, value)
+        return segments
+
+    def _close(self, measurement: str, series: _Series, pane_index: int, skipped: list[dict] = ()) -> None:
+        # a skipped pane without energy is empty, and once the window holds only those nothing is emitted
+        if not any(skipped):
+            skipped = skipped[:self._panes]
+        end = series.pane_index + 1
+        series.closed.append(series.pane)
+        self._emit(measurement, series, end)
+        for offset, energy in enumerate(skipped, 1):
+            pane = None
+            if energy:
+                pane = _Pane()
+                pane.add_energy(energy)
+            series.closed.append(pane)
+            self._emit(measurement, series, end + offset)
+
+        series.pane_index = pane_index
+        series.pane = _Pane()
+
+    def _emit(self, measurement: str, series: _Series, end: int) -> None:
+        fields = self._fields(series.closed)
+        if fields:
+            start = datetime.fromtimestamp(end * self.slide - self.window, timezone.utc)
+            self.storage.write(measurement, series.tags, fields, start)
+
+    def _fields(self, panes) -> dict:
+        count = 0
+        merged: dict[str, list[float]] = {}
+        energy: dict[str, float] = {}
+        others = {}
+        for pane in panes:
+            if pane is None:
+                continue
+            count += pane.count
+            others.update(pane.others)
+            for name, value in pane.energy.items():
+                energy[name] = energy.get(name, 0.0) + value
+            for name, stats in pane.numbers.items():
+                total = merged.get(name)
+                if total is None:
+                    merged[name] = list(stats)
+                else:
+                    total[0] = min(total[0], stats[0])
+                    total[1] = max(total[1], stats[1])
+                    total[2] += stats[2]
+                    total[3] += stats[3]
+                    total[4] = stats[4]
+        if not count and not energy:
+            return {}
+
+        fields = dict(others)
+        for name, (low, high, total, samples, last) in merged.items():
+            values = {'min': low, 'max': high, 'mean': total / samples, 'last': last}
+            for aggregate in self.aggregates:
+                if aggregate in values:
+                    fields[f"{name}_{aggregate}"] = values[aggregate]
+            if name in self.integrate:
+                fields[f"{name}_energy"] = energy.pop(name, 0.0)
+        for name, value in energy.items():
+            fields[f"{name}_energy"] = value
+        if 'count' in self.aggregates:
+            fields['count'] = count
+        return fields
@@ -0,0 +1,21 @@
+import asyncio
+from datetime import datetime
+
+from storage import AbstractAsyncStorage, AbstractStorage
+
+
+class AsyncStorageAdapter(AbstractAsyncStorage):
+    def __init__(self, storage: AbstractStorage):
+        self.storage = storage
+
+    async def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        await asyncio.to_thread(self.storage.write, measurement, tags, fields, timestamp)
+
+    async def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        await asyncio.to_thread(self.storage.write_batch, points)
+
+    async def flush(self) -> None:
+        await asyncio.to_thread(self.storage.flush)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.storage.close)
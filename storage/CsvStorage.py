@@ -1,28 +1,174 @@
 import csv
 import logging
-from datetime import datetime, timezone
+import mmap
+import os
+from datetime import date, datetime, timezone
 from pathlib import Path
+from time import monotonic
 
-from storage import AbstractStorage
+from storage import AbstractStorage, PointTable
 
 logger = logging.getLogger(__name__)
 
+FSYNC_POLICIES = ('never', 'flush', 'close')
+
 
 class CsvStorage(AbstractStorage):
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = 1,
+        flush_interval: float | None = None,
+        fsync: str = 'never',
+        rotate_daily: bool = False,
+        max_bytes: int | None = None,
+    ):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+
         self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.rotate_daily = rotate_daily
+        self.max_bytes = max_bytes
+
+        self._file = None
+        self._day: date | None = None
+        self._writers: dict[tuple, csv.DictWriter] = {}
+        self._header: tuple | None = None
+        self._rows: list[dict] = []
+        self._first_row_at = 0.0
+
+        if rotate_daily and self.path.exists():
+            self._day = datetime.fromtimestamp(self.path.stat().st_mtime, timezone.utc).date()
 
     def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
         if timestamp is None:
             timestamp = datetime.now(timezone.utc)
 
-        row = {"timestamp": timestamp.isoformat(), "measurement": measurement, **tags, **fields}
-
-        write_header = not self.path.exists()
-        with open(self.path, "a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=row.keys())
-            if write_header:
-                writer.writeheader()
-            writer.writerow(row)
+        if self.rotate_daily and self._day is not None and timestamp.date() != self._day:
+            self._rotate(self._day.isoformat())
+        self._day = timestamp.date()
 
+        if not self._rows:
+            self._first_row_at = monotonic()
+        self._rows.append({"timestamp": timestamp.isoformat(), "measurement": measurement, **tags, **fields})
         logger.info(f"csv write: {measurement} {fields}")
+
+        if len(self._rows) >= self.buffer_size or self._is_stale():
+            self.flush()
+
+    def write_table(self, points: PointTable) -> None:
+        if self.rotate_daily:
+            super().write_table(points)
+            return
+        if not len(points):
+            return
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pacsv
+
+        self.flush()
+        table = points.table
+        timestamps = pc.strftime(table.column('timestamp').cast(pa.timestamp('us')), format='%Y-%m-%dT%H:%M:%S')
+        timestamps = pc.replace_substring_regex(timestamps, pattern=r'\.000000$', replacement='')
+        columns = {
+            'timestamp': pc.binary_join_element_wise(timestamps, '+00:00', ''),
+            'measurement': pa.repeat(points.measurement, len(points)),
+            **{name: table.column(name) for name in (*points.tags, *points.fields)},
+        }
+
+        f = self._open()
+        header = tuple(columns)
+        include_header = header != self._header
+        buffer = pa.BufferOutputStream()
+        table = pa.table(columns)
+        try:
+            options = pacsv.WriteOptions(include_header=include_header, quoting_style='none', quoting_header='none', eol='\r\n')
+            pacsv.write_csv(table, buffer, options)
+        except pa.ArrowInvalid:
+            buffer = pa.BufferOutputStream()
+            options = pacsv.WriteOptions(include_header=include_header, quoting_header='none', eol='\r\n')
+            pacsv.write_csv(table, buffer, options)
+        f.write(buffer.getvalue().to_pybytes().decode())
+        self._header = header
+        f.flush()
+        if self.fsync == 'flush':
+            os.fsync(f.fileno())
+        logger.info(f"csv write table: {points.measurement} {len(points)} rows")
+
+        if self.max_bytes is not None and f.tell() >= self.max_bytes:
+            self._rotate()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+
+        rows, self._rows = self._rows, []
+        f = self._open()
+        for row in rows:
+            self._writer(f, row).writerow(row)
+        f.flush()
+        if self.fsync == 'flush':
+            os.fsync(f.fileno())
+
+        if self.max_bytes is not None and f.tell() >= self.max_bytes:
+            self._rotate()
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            if self.fsync != 'never':
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            self._writers.clear()
+            self._header = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a", newline="")
+            self._header = self._last_header() if self._file.tell() else None
+        return self._file
+
+    def _writer(self, f, row: dict) -> csv.DictWriter:
+        key = tuple(row)
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = self._writers[key] = csv.DictWriter(f, fieldnames=key)
+        if key != self._header:
+            writer.writeheader()
+            self._header = key
+        return writer
+
+    def _last_header(self) -> tuple | None:
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = data.rfind(b'timestamp,')
+            while start > 0 and data[start - 1] != ord('\n'):
+                start = data.rfind(b'timestamp,', 0, start)
+            if start == -1:
+                return None
+            end = data.find(b'\n', start)
+            line = data[start:len(data) if end == -1 else end].decode().rstrip('\r')
+        return tuple(next(csv.reader([line])))
+
+    def _rotate(self, label: str = '') -> None:
+        self.close()
+        if not self.path.exists():
+            return
+
+        base = f"{self.path.name}.{label}" if label else self.path.name
+        target = self.path.with_name(base) if label else None
+        index = 0
+        while target is None or target.exists():
+            index += 1
+            target = self.path.with_name(f"{base}.{index}")
+        self.path.rename(target)
+        logger.info(f"csv rotate: {self.path} -> {target}")
+
+    def _is_stale(self) -> bool:
+        return self.flush_interval is not None and monotonic() - self._first_row_at >= self.flush_interval
@@ -0,0 +1,76 @@
+from datetime import datetime
+from decimal import Decimal
+from time import time
+
+from storage import AbstractStorage
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+class DeadbandStorage(AbstractStorage):
+    def __init__(
+        self,
+        storage: AbstractStorage,
+        absolute: float | dict[str, float] = 0.0,
+        relative: float | dict[str, float] = 0.0,
+        heartbeat: float | None = 300.0,
+    ):
+        for deadband in (absolute, relative):
+            values = deadband.values() if isinstance(deadband, dict) else [deadband]
+            if any(value < 0 for value in values):
+                raise ValueError("deadband must not be negative")
+        if heartbeat is not None and heartbeat <= 0:
+            raise ValueError("heartbeat must be positive")
+
+        self.storage = storage
+        self.absolute = absolute
+        self.relative = relative
+        self.heartbeat = heartbeat
+
+        self.written = 0
+        self.suppressed = 0
+        self._series: dict[tuple, tuple[dict, float]] = {}
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        now = timestamp.timestamp() if timestamp is not None else time()
+        key = (measurement, *sorted(tags.items()))
+
+        last = self._series.get(key)
+        if last is not None:
+            last_fields, written_at = last
+            if not self._heartbeat_due(written_at, now) and not self._moved(last_fields, fields):
+                self.suppressed += 1
+                return
+
+        self.storage.write(measurement, tags, fields, timestamp)
+        self._series[key] = (dict(fields), now)
+        self.written += 1
+
+    def flush(self) -> None:
+        self.storage.flush()
+
+    def close(self) -> None:
+        self.storage.close()
+
+    def _heartbeat_due(self, written_at: float, now: float) -> bool:
+        return self.heartbeat is not None and now - written_at >= self.heartbeat
+
+    def _moved(self, last_fields: dict, fields: dict) -> bool:
+        if last_fields.keys() != fields.keys():
+            return True
+
+        for name, value in fields.items():
+            last = last_fields[name]
+            if not (_is_number(value) and _is_number(last)):
+                if value != last:
+                    return True
+                continue
+
+            delta = abs(float(value) - float(last))
+            absolute = self.absolute.get(name, 0.0) if isinstance(self.absolute, dict) else self.absolute
+            relative = self.relative.get(name, 0.0) if isinstance(self.relative, dict) else self.relative
+            if delta > absolute and delta > relative * abs(float(last)):
+                return True
+        return False
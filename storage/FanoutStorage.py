@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+from storage import AbstractStorage, QueuedStorage
+
+
+class FanoutStorage(AbstractStorage):
+    def __init__(
+        self,
+        storages: list[AbstractStorage],
+        maxsize: int = 1000,
+        overflow: str = 'drop_oldest',
+        batch_size: int = 1,
+        retries: int = 0,
+        backoff: float = 1.0,
+    ):
+        if not storages:
+            raise ValueError("storages must not be empty")
+
+        self.storages = [
+            storage if isinstance(storage, QueuedStorage) else QueuedStorage(
+                storage,
+                maxsize=maxsize,
+                overflow=overflow,
+                batch_size=batch_size,
+                retries=retries,
+                backoff=backoff,
+            )
+            for storage in storages
+        ]
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        for storage in self.storages:
+            storage.write(measurement, tags, fields, timestamp)
+
+    def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        now = datetime.now(timezone.utc)
+        points = [(measurement, tags, fields, timestamp or now) for measurement, tags, fields, timestamp in points]
+        for storage in self.storages:
+            storage.write_batch(points)
+
+    def flush(self) -> None:
+        for storage in self.storages:
+            storage.flush()
+
+    def close(self) -> None:
+        for storage in self.storages:
+            storage.close()
+
+    def stats(self) -> list[dict]:
+        return [{"storage": type(storage.storage).__name__, **storage.stats()} for storage in self.storages]
@@ -0,0 +1,54 @@
+import threading
+from datetime import datetime, timezone
+from time import monotonic
+
+from storage import AbstractStorage
+
+
+class ForwardingStorage(AbstractStorage):
+    def __init__(self, queue, name: str, batch_size: int = 100, flush_interval: float = 1.0):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.queue = queue
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.forwarded = 0
+        self._points = []
+        self._sent_at = monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        with self._lock:
+            self._points.append((measurement, tags, fields, timestamp))
+            if self._due():
+                self._send()
+
+    def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._points.extend((m, tags, fields, now if ts is None else ts) for m, tags, fields, ts in points)
+            if self._due():
+                self._send()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._send()
+
+    def stats(self) -> dict:
+        return {"forwarded": self.forwarded, "buffered": len(self._points)}
+
+    def _due(self) -> bool:
+        return len(self._points) >= self.batch_size or monotonic() - self._sent_at >= self.flush_interval
+
+    def _send(self) -> None:
+        self._sent_at = monotonic()
+        if not self._points:
+            return
+        points, self._points = self._points, []
+        self.queue.put(('points', self.name, points))
+        self.forwarded += len(points)
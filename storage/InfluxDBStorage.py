@@ -1,18 +1,144 @@
 import logging
+import threading
 from datetime import datetime, timezone
+from time import monotonic
 
-from influxdb_client_3 import InfluxDBClient3, Point
-
-from storage import AbstractStorage
+from storage import AbstractStorage, PointTable
 
 logger = logging.getLogger(__name__)
 
+TABLE_CHUNK_ROWS = 5000
+
+_MEASUREMENT_ESCAPES = {',': r'\,', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'}
+_KEY_ESCAPES = {**_MEASUREMENT_ESCAPES, '=': r'\='}
+_STRING_ESCAPES = {'\\': r'\\', '"': r'\"'}
+
 
 class InfluxDBStorage(AbstractStorage):
-    def __init__(self, host: str, database: str, token: str = ''):
+    def __init__(
+        self,
+        host: str,
+        database: str,
+        token: str = '',
+        batch_size: int = 1,
+        flush_interval: float | None = None,
+        max_buffer: int = 10000,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_buffer < batch_size:
+            raise ValueError("max_buffer must be at least batch_size")
+
+        from influxdb_client_3 import InfluxDBClient3
+
         self._client = InfluxDBClient3(host=host, database=database, token=token)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._points = []
+        self._unsent = 0
+        self._first_point_at = 0.0
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._flusher = None
+        if flush_interval is not None and batch_size > 1:
+            self._flusher = threading.Thread(target=self._flush_stale, name='InfluxDBFlush', daemon=True)
+            self._flusher.start()
 
     def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        point = self._point(measurement, tags, fields, timestamp)
+        if self.batch_size == 1:
+            self._client.write(record=point)
+            logger.info(f"influxdb write: {measurement} {fields}")
+            return
+
+        with self._lock:
+            if not self._points:
+                self._first_point_at = monotonic()
+            self._points.append(point)
+            self._unsent += 1
+            self._trim()
+            logger.info(f"influxdb write: {measurement} {fields}")
+
+            if self._unsent >= self.batch_size or self._is_stale():
+                try:
+                    self._flush()
+                except Exception as e:
+                    logger.warning(f"influxdb flush failed, keeping {len(self._points)} points: {e}")
+
+    def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        with self._lock:
+            self.flush()
+            self._client.write(record=[self._point(*point) for point in points])
+        logger.info(f"influxdb write batch: {len(points)} points")
+
+    def write_table(self, points: PointTable) -> None:
+        lines = self._lines(points)
+        with self._lock:
+            self.flush()
+            for start in range(0, len(lines), TABLE_CHUNK_ROWS):
+                self._client.write(record=lines[start:start + TABLE_CHUNK_ROWS].to_pylist())
+        logger.info(f"influxdb write table: {points.measurement} {len(lines)} points")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def stats(self) -> dict:
+        return {"buffered": len(self._points), "dropped": self.dropped}
+
+    def _flush(self) -> None:
+        if not self._points:
+            return
+
+        points, self._points = self._points, []
+        self._unsent = 0
+        try:
+            self._client.write(record=points[0] if len(points) == 1 else points)
+        except Exception:
+            self._points[:0] = points
+            self._first_point_at = monotonic()
+            self._trim()
+            raise
+        if len(points) > 1:
+            logger.info(f"influxdb flush: {len(points)} points")
+
+    def _trim(self) -> None:
+        excess = len(self._points) - self.max_buffer
+        if excess > 0:
+            del self._points[:excess]
+            self.dropped += excess
+            logger.warning(f"influxdb buffer full, dropped {excess} oldest points")
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"influxdb close: lost {len(self._points)} unsent points: {e}")
+        finally:
+            self._client.close()
+
+    def _flush_stale(self) -> None:
+        timeout = self.flush_interval
+        while not self._stopped.wait(timeout):
+            timeout = self.flush_interval
+            with self._lock:
+                try:
+                    if self._points and self._is_stale():
+                        self._flush()
+                    elif self._points:
+                        timeout = max(self._first_point_at + self.flush_interval - monotonic(), 0.0)
+                except Exception:
+                    logger.exception("influxdb flush failed")
+
+    @staticmethod
+    def _point(measurement: str, tags: dict, fields: dict, timestamp: datetime | None) -> 'Point':
+        from influxdb_client_3 import Point
+
         if timestamp is None:
             timestamp = datetime.now(timezone.utc)
 
@@ -21,6 +147,71 @@ class InfluxDBStorage(AbstractStorage):
             point = point.tag(key, value)
         for key, value in fields.items():
             point = point.field(key, value)
+        return point
+
+    @staticmethod
+    def _lines(points: PointTable) -> 'pyarrow.StringArray':
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = points.table.combine_chunks()
+        key = points.measurement.translate(str.maketrans(_MEASUREMENT_ESCAPES))
+        tags = []
+        for name in sorted(points.tags):
+            values = _escape(table.column(name).chunk(0).cast(pa.string()), _KEY_ESCAPES)
+            values = pc.if_else(pc.ends_with(values, '\\'), pc.binary_join_element_wise(values, ' ', ''), values)
+            values = pc.if_else(pc.equal(values, ''), pa.scalar(None, pa.string()), values)
+            tags.append(pc.binary_join_element_wise(f"{name.translate(str.maketrans(_KEY_ESCAPES))}=", values, ''))
+
+        fields = []
+        for name in sorted(points.fields):
+            column = table.column(name).chunk(0)
+            if pa.types.is_null(column.type):
+                continue
+            values = _field_values(column)
+            fields.append(pc.binary_join_element_wise(f"{name.translate(str.maketrans(_KEY_ESCAPES))}=", values, ''))
+        if not fields:
+            return pa.array([], type=pa.string())
+
+        keys = _join([key, *tags], ',')
+        fields = _join(fields, ',')
+        timestamps = pc.multiply(table.column('timestamp').chunk(0).cast(pa.int64()), 1000).cast(pa.string())
+        lines = pc.binary_join_element_wise(keys, fields, timestamps, ' ')
+        return pc.filter(lines, pc.is_valid(fields))
+
+    def _is_stale(self) -> bool:
+        return self.flush_interval is not None and monotonic() - self._first_point_at >= self.flush_interval
+
+
+def _escape(values, escapes: dict):
+    import pyarrow.compute as pc
+
+    for old, new in escapes.items():
+        values = pc.replace_substring(values, old, new)
+    return values
+
+
+def _join(values: list, separator: str):
+    import pyarrow.compute as pc
+
+    joined = values[0]
+    for value in values[1:]:
+        joined = pc.coalesce(pc.binary_join_element_wise(joined, value, separator), joined, value)
+    return joined
+
+
+def _field_values(column):
+    import pyarrow as pa
+    import pyarrow.compute as pc
 
-        self._client.write(record=point)
-        logger.info(f"influxdb write: {measurement} {fields}")
+    kind = column.type
+    if pa.types.is_floating(kind):
+        column = pc.if_else(pc.is_finite(column), column, pa.scalar(None, kind))
+        return column.cast(pa.string())
+    if pa.types.is_decimal(kind) or pa.types.is_boolean(kind):
+        return column.cast(pa.string())
+    if pa.types.is_integer(kind):
+        return pc.binary_join_element_wise(column.cast(pa.string()), 'i', '')
+    if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+        return pc.binary_join_element_wise('"', _escape(column, _STRING_ESCAPES), '"', '')
+    raise ValueError(f"unsupported field type {kind}")
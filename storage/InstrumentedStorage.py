@@ -0,0 +1,46 @@
+from datetime import datetime
+from time import perf_counter
+
+from metrics import Metrics
+from metrics.Histogram import SIZE_BUCKETS
+from storage import AbstractStorage, PointTable
+
+
+class InstrumentedStorage(AbstractStorage):
+    def __init__(self, storage: AbstractStorage, metrics: Metrics, name: str):
+        self.storage = storage
+        self._write_seconds = metrics.histogram(
+            'meteread_storage_write_seconds', 'Time spent in storage write, write_batch and write_table calls.', storage=name
+        )
+        self._batch_size = metrics.histogram(
+            'meteread_storage_batch_size', 'Points per storage write_batch or write_table call.', SIZE_BUCKETS, storage=name
+        )
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        started = perf_counter()
+        try:
+            self.storage.write(measurement, tags, fields, timestamp)
+        finally:
+            self._write_seconds.observe(perf_counter() - started)
+
+    def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        started = perf_counter()
+        try:
+            self.storage.write_batch(points)
+        finally:
+            self._write_seconds.observe(perf_counter() - started)
+            self._batch_size.observe(len(points))
+
+    def write_table(self, points: PointTable) -> None:
+        started = perf_counter()
+        try:
+            self.storage.write_table(points)
+        finally:
+            self._write_seconds.observe(perf_counter() - started)
+            self._batch_size.observe(len(points))
+
+    def flush(self) -> None:
+        self.storage.flush()
+
+    def close(self) -> None:
+        self.storage.close()
@@ -0,0 +1,154 @@
+import json
+import logging
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from time import monotonic
+
+from storage import AbstractStorage
+from storage.PointTable import TAGS_METADATA_KEY
+
+logger = logging.getLogger(__name__)
+
+
+class _Buffer:
+    __slots__ = ('tags', 'columns', 'rows')
+
+    def __init__(self):
+        self.tags: list[str] = []
+        self.columns: dict[str, list] = {'timestamp': []}
+        self.rows = 0
+
+    def append(self, tags: dict, fields: dict, timestamp: datetime) -> None:
+        for name in tags:
+            if name not in self.columns:
+                self.tags.append(name)
+        row = {'timestamp': timestamp, **{name: str(value) for name, value in tags.items()}}
+        for name, value in fields.items():
+            row[name] = float(value) if isinstance(value, Decimal) else value
+
+        for name, value in row.items():
+            column = self.columns.get(name)
+            if column is None:
+                column = self.columns[name] = [None] * self.rows
+            column.append(value)
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+
+
+class ParquetStorage(AbstractStorage):
+    def __init__(
+        self,
+        path: str,
+        row_group_size: int = 10_000,
+        flush_interval: float | None = 300.0,
+        compression: str = 'zstd',
+    ):
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be at least 1")
+
+        import pyarrow  # noqa: F401
+
+        self.path = Path(path)
+        self.row_group_size = row_group_size
+        self.flush_interval = flush_interval
+        self.compression = compression
+
+        self._buffers: dict[tuple[str, date], _Buffer] = {}
+        self._writers: dict[tuple[str, date], 'pyarrow.parquet.ParquetWriter'] = {}
+        self._first_row_at = 0.0
+        self._opened_at = 0.0
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        key = (measurement, timestamp.astimezone(timezone.utc).date())
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            self._close_older_days(*key)
+            buffer = self._buffers[key] = _Buffer()
+
+        if not any(b.rows for b in self._buffers.values()):
+            self._first_row_at = monotonic()
+        buffer.append(tags, fields, timestamp)
+
+        if buffer.rows >= self.row_group_size:
+            self._write_row_group(key)
+        self.flush()
+
+    def flush(self) -> None:
+        if self._is_stale():
+            self._write_row_groups()
+            self._close_writers()
+
+    def close(self) -> None:
+        self._write_row_groups()
+        self._close_writers()
+        self._buffers.clear()
+
+    def _close_writers(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def _write_row_groups(self) -> None:
+        for key in list(self._buffers):
+            self._write_row_group(key)
+
+    def _write_row_group(self, key: tuple[str, date]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        buffer = self._buffers[key]
+        if not buffer.rows:
+            return
+
+        arrays = {'timestamp': pa.array(buffer.columns['timestamp'], type=pa.timestamp('us', tz='UTC'))}
+        for name, values in buffer.columns.items():
+            if name != 'timestamp':
+                arrays[name] = pa.array(values, type=pa.string() if name in buffer.tags else None)
+        table = pa.table(arrays).replace_schema_metadata({TAGS_METADATA_KEY: json.dumps(buffer.tags)})
+
+        writer = self._writers.get(key)
+        if writer is not None and writer.schema != table.schema:
+            try:
+                table = table.cast(writer.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+                writer.close()
+                writer = None
+        if writer is None:
+            if not self._writers:
+                self._opened_at = monotonic()
+            writer = self._writers[key] = pq.ParquetWriter(self._new_file(*key), table.schema, compression=self.compression)
+
+        writer.write_table(table, row_group_size=self.row_group_size)
+        self._buffers[key] = _Buffer()
+        logger.info(f"parquet write: {key[0]} {table.num_rows} rows")
+
+    def _close_older_days(self, measurement: str, day: date) -> None:
+        for key in [key for key in (*self._buffers, *self._writers) if key[0] == measurement and key[1] < day]:
+            if key in self._buffers:
+                self._write_row_group(key)
+                del self._buffers[key]
+            writer = self._writers.pop(key, None)
+            if writer is not None:
+                writer.close()
+
+    def _new_file(self, measurement: str, day: date) -> Path:
+        directory = self.path / f"measurement={measurement}" / f"date={day.isoformat()}"
+        directory.mkdir(parents=True, exist_ok=True)
+        part = len(list(directory.glob('part-*.parquet')))
+        while (directory / f"part-{part:05d}.parquet").exists():
+            part += 1
+        return directory / f"part-{part:05d}.parquet"
+
+    def _is_stale(self) -> bool:
+        if self.flush_interval is None:
+            return False
+        started = [self._opened_at] if self._writers else []
+        if any(buffer.rows for buffer in self._buffers.values()):
+            started.append(self._first_row_at)
+        return bool(started) and monotonic() - min(started) >= self.flush_interval
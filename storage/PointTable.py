@@ -0,0 +1,55 @@
+import json
+from datetime import datetime, timezone
+from typing import Iterable
+
+TAGS_METADATA_KEY = b'meteread.tags'
+
+
+class PointTable:
+    def __init__(self, measurement: str, table: 'pyarrow.Table', tags: Iterable[str] | None = None):
+        if 'timestamp' not in table.column_names:
+            raise ValueError("table must have a timestamp column")
+        if tags is None:
+            tags = json.loads((table.schema.metadata or {}).get(TAGS_METADATA_KEY, b'[]'))
+
+        self.measurement = measurement
+        self.table = table
+        self.tags = [name for name in tags if name in table.column_names]
+        self.fields = [name for name in table.column_names if name != 'timestamp' and name not in self.tags]
+
+    @classmethod
+    def from_columns(
+        cls,
+        measurement: str,
+        timestamps: list[datetime | None],
+        tags: dict[str, list],
+        fields: dict[str, list],
+    ) -> 'PointTable':
+        import pyarrow as pa
+
+        if None in timestamps:
+            now = datetime.now(timezone.utc)
+            timestamps = [now if timestamp is None else timestamp for timestamp in timestamps]
+        arrays = {'timestamp': pa.array(timestamps, type=pa.timestamp('us', tz='UTC'))}
+        for name, values in tags.items():
+            arrays[name] = pa.array([None if value is None else str(value) for value in values], type=pa.string())
+        for name, values in fields.items():
+            arrays[name] = pa.array(values)
+        return cls(measurement, pa.table(arrays), tags)
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def points(self) -> list[tuple[str, dict, dict, datetime]]:
+        timestamps = self.table.column('timestamp').to_pylist()
+        tags = [(name, self.table.column(name).to_pylist()) for name in self.tags]
+        fields = [(name, self.table.column(name).to_pylist()) for name in self.fields]
+        return [
+            (
+                self.measurement,
+                {name: values[row] for name, values in tags if values[row] is not None},
+                {name: values[row] for name, values in fields if values[row] is not None},
+                timestamp,
+            )
+            for row, timestamp in enumerate(timestamps)
+        ]
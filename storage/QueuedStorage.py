@@ -0,0 +1,233 @@
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from time import monotonic, sleep
+
+from storage import AbstractStorage
+from storage.SegmentLog import SegmentLog
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'spill')
+
+_STOP = object()
+
+
+class QueuedStorage(AbstractStorage):
+    def __init__(
+        self,
+        storage: AbstractStorage,
+        maxsize: int = 1000,
+        overflow: str = 'block',
+        spill_path: str | None = None,
+        replay_batch_size: int = 500,
+        batch_size: int = 1,
+        retries: int = 0,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if overflow == 'spill' and spill_path is None:
+            raise ValueError("overflow='spill' requires spill_path")
+
+        self.storage = storage
+        self.overflow = overflow
+        self.replay_batch_size = replay_batch_size
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._spill_log = SegmentLog(spill_path) if spill_path else None
+
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.retried = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+        self._stats_lock = threading.Lock()
+        self._spill_pending = self._spill_log is not None and not self._spill_log.empty
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._storage_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name='QueuedStorage', daemon=True)
+        self._worker.start()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def mean_latency(self) -> float:
+        with self._stats_lock:
+            return self._mean_latency()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "depth": self.depth,
+                "written": self.written,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "spilled": self.spilled,
+                "retried": self.retried,
+                "last_latency": self.last_latency,
+                "mean_latency": self._mean_latency(),
+                "max_latency": self.max_latency,
+            }
+
+    def _mean_latency(self) -> float:
+        return self._total_latency / self.written if self.written else 0.0
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        item = (monotonic(), measurement, tags, fields, timestamp)
+        if self.overflow == 'block':
+            self._queue.put(item)
+            return
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow == 'spill':
+                self._spill(item[1:])
+            else:
+                self._drop_oldest(item)
+
+    def flush(self) -> None:
+        self._queue.join()
+        with self._storage_lock:
+            self.storage.flush()
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._worker.join()
+        if self._spill_log is not None:
+            self._spill_log.close()
+        self.storage.close()
+
+    def _drop_oldest(self, item: tuple) -> None:
+        while True:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                with self._stats_lock:
+                    self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                continue
+
+    def _spill(self, point: tuple) -> None:
+        self._spill_log.append([point])
+        with self._stats_lock:
+            self.spilled += 1
+            self._spill_pending = True
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                self._replay_spill()
+                self._flush_idle()
+                continue
+
+            items = [item]
+            while item is not _STOP and len(items) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                items.append(item)
+
+            try:
+                batch = [item for item in items if item is not _STOP]
+                if batch:
+                    self._write([point for _, *point in batch])
+                    written_at = monotonic()
+                    with self._stats_lock:
+                        for enqueued_at, *_ in batch:
+                            latency = written_at - enqueued_at
+                            self.last_latency = latency
+                            self.max_latency = max(self.max_latency, latency)
+                            self._total_latency += latency
+                if items[-1] is _STOP:
+                    self._replay_spill()
+                    return
+                if self._spill_pending:
+                    self._replay_spill_batch()
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    def _write(self, points: list) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                with self._storage_lock:
+                    if len(points) == 1:
+                        self.storage.write(*points[0])
+                    else:
+                        self.storage.write_batch(points)
+                with self._stats_lock:
+                    self.written += len(points)
+                return
+            except Exception as e:
+                if attempt < self.retries:
+                    delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+                    with self._stats_lock:
+                        self.retried += 1
+                    logger.warning(f"queued storage write failed, retrying in {delay:.1f}s: {e}")
+                    sleep(delay)
+                    continue
+                with self._stats_lock:
+                    self.failed += len(points)
+                logger.exception("queued storage write failed")
+
+    def _flush_idle(self) -> None:
+        try:
+            with self._storage_lock:
+                self.storage.flush()
+        except Exception:
+            logger.exception("queued storage flush failed")
+
+    def _replay_spill(self) -> None:
+        if self._spill_log is None:
+            return
+
+        while self._replay_spill_batch():
+            pass
+
+    def _replay_spill_batch(self) -> bool:
+        with self._stats_lock:
+            self._spill_pending = False
+        points, cursor = self._spill_log.read(self.replay_batch_size)
+        if not points:
+            return False
+
+        with self._stats_lock:
+            self._spill_pending = True
+        try:
+            with self._storage_lock:
+                self.storage.write_batch(points)
+        except Exception:
+            logger.exception("queued storage spill replay failed")
+            return False
+        self._spill_log.ack(cursor)
+        with self._stats_lock:
+            self.written += len(points)
+        logger.info(f"queued storage replayed {len(points)} spilled points")
+        return True
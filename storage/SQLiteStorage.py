@@ -0,0 +1,237 @@
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from time import monotonic
+from typing import Iterator
+
+from storage import AbstractStorage
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+TAGS_TABLE = '_meteread_tags'
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _micros(timestamp: datetime | str) -> int:
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - EPOCH) // timedelta(microseconds=1)
+
+
+class SQLiteStorage(AbstractStorage):
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 100,
+        flush_interval: float | None = 5.0,
+        synchronous: str = 'NORMAL',
+        max_buffer: int = 10000,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_buffer < batch_size:
+            raise ValueError("max_buffer must be at least batch_size")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(f'PRAGMA synchronous={synchronous}')
+        self._connection.execute(
+            f'CREATE TABLE IF NOT EXISTS {TAGS_TABLE} (measurement TEXT, name TEXT, PRIMARY KEY (measurement, name))'
+        )
+
+        self._columns: dict[str, set[str]] = {}
+        self._tags: dict[str, list[str]] = {}
+        self._points: list[tuple[str, dict, dict, datetime]] = []
+        self._unsent = 0
+        self._first_point_at = 0.0
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        if not self._points:
+            self._first_point_at = monotonic()
+        self._points.append((measurement, tags, fields, timestamp))
+        self._unsent += 1
+        self._trim()
+
+        if self._unsent >= self.batch_size or self._is_stale():
+            self._try_flush()
+
+    def write_batch(self, points: list[tuple[str, dict, dict, datetime | None]]) -> None:
+        now = datetime.now(timezone.utc)
+        if not self._points:
+            self._first_point_at = monotonic()
+        self._points.extend((m, tags, fields, now if ts is None else ts) for m, tags, fields, ts in points)
+        self._trim()
+        self._try_flush()
+
+    def stats(self) -> dict:
+        return {"buffered": len(self._points), "dropped": self.dropped}
+
+    def flush(self) -> None:
+        if not self._points:
+            return
+
+        points, self._points = self._points, []
+        self._unsent = 0
+        groups: dict[tuple, list[tuple]] = {}
+        for measurement, tags, fields, timestamp in points:
+            values = [_micros(timestamp)]
+            values.extend(str(value) for value in tags.values())
+            values.extend(float(value) if isinstance(value, Decimal) else value for value in fields.values())
+            groups.setdefault((measurement, tuple(tags), tuple(fields)), []).append(values)
+
+        with self._lock:
+            try:
+                self._connection.execute('BEGIN')
+                try:
+                    for (measurement, tags, fields), rows in groups.items():
+                        self._prepare(measurement, tags, fields)
+                        columns = ', '.join(_quote(name) for name in ('timestamp', *tags, *fields))
+                        placeholders = ', '.join('?' * (1 + len(tags) + len(fields)))
+                        self._connection.executemany(
+                            f'INSERT INTO {_quote(measurement)} ({columns}) VALUES ({placeholders})', rows
+                        )
+                    self._connection.execute('COMMIT')
+                except BaseException:
+                    self._connection.execute('ROLLBACK')
+                    for measurement, _, _ in groups:
+                        self._columns.pop(measurement, None)
+                        self._tags.pop(measurement, None)
+                    raise
+            except sqlite3.OperationalError:
+                # locked or full database: keep the batch for the next flush
+                self._points[:0] = points
+                self._first_point_at = monotonic()
+                self._trim()
+                raise
+        logger.info(f"sqlite write: {len(points)} points")
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"sqlite close: lost {len(self._points)} unsent points: {e}")
+        finally:
+            with self._lock:
+                self._connection.close()
+
+    def measurements(self) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name != ? ORDER BY name", (TAGS_TABLE,)
+            ).fetchall()
+        return [name for name, in rows]
+
+    def query(
+        self,
+        measurement: str,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        tags: dict | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[tuple[str, dict, dict, datetime]]:
+        self.flush()
+        if measurement not in self.measurements():
+            return
+
+        conditions = []
+        parameters = []
+        for name, value in (tags or {}).items():
+            conditions.append(f'{_quote(name)} = ?')
+            parameters.append(str(value))
+        if start is not None:
+            conditions.append('timestamp >= ?')
+            parameters.append(_micros(start))
+        if end is not None:
+            conditions.append('timestamp < ?')
+            parameters.append(_micros(end))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        with self._lock:
+            tag_names = set(self._load_tags(measurement))
+            cursor = self._connection.execute(
+                f'SELECT * FROM {_quote(measurement)}{where} ORDER BY timestamp', parameters
+            )
+            names = [column[0] for column in cursor.description]
+
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                point_tags = {}
+                fields = {}
+                for name, value in zip(names[1:], row[1:]):
+                    if name in tag_names:
+                        if value is not None:
+                            point_tags[name] = value
+                    elif value is not None:
+                        fields[name] = value
+                yield measurement, point_tags, fields, EPOCH + timedelta(microseconds=row[0])
+
+    def _prepare(self, measurement: str, tags: tuple, fields: tuple) -> None:
+        columns = self._columns.get(measurement)
+        if columns is None:
+            table = _quote(measurement)
+            self._connection.execute(f'CREATE TABLE IF NOT EXISTS {table} (timestamp INTEGER NOT NULL, sn TEXT)')
+            self._connection.execute(
+                f'CREATE INDEX IF NOT EXISTS {_quote(measurement + "_sn_timestamp")} ON {table} (sn, timestamp)'
+            )
+            columns = self._columns[measurement] = {
+                row[1] for row in self._connection.execute(f'PRAGMA table_info({table})')
+            }
+
+        known_tags = self._load_tags(measurement)
+        for name in tags:
+            if name not in known_tags:
+                self._connection.execute(f'INSERT OR IGNORE INTO {TAGS_TABLE} VALUES (?, ?)', (measurement, name))
+                known_tags.append(name)
+        for name in (*tags, *fields):
+            if name not in columns:
+                kind = 'TEXT' if name in tags else ''
+                self._connection.execute(f'ALTER TABLE {_quote(measurement)} ADD COLUMN {_quote(name)} {kind}')
+                columns.add(name)
+
+    def _load_tags(self, measurement: str) -> list[str]:
+        tags = self._tags.get(measurement)
+        if tags is None:
+            tags = self._tags[measurement] = [
+                name for name, in self._connection.execute(
+                    f'SELECT name FROM {TAGS_TABLE} WHERE measurement = ?', (measurement,)
+                )
+            ]
+        return tags
+
+    def _try_flush(self) -> None:
+        try:
+            self.flush()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"sqlite flush failed, keeping {len(self._points)} points: {e}")
+
+    def _trim(self) -> None:
+        excess = len(self._points) - self.max_buffer
+        if excess > 0:
+            del self._points[:excess]
+            self.dropped += excess
+            logger.warning(f"sqlite buffer full, dropped {excess} oldest points")
+
+    def _is_stale(self) -> bool:
+        return self.flush_interval is not None and monotonic() - self._first_point_at >= self.flush_interval
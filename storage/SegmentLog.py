@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CURSOR_FILE = 'cursor'
+
+
+class SegmentLog:
+    def __init__(self, path: str, segment_bytes: int = 16 * 1024 * 1024, sync_every: int = 1):
+        if sync_every < 0:
+            raise ValueError("sync_every must not be negative")
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.sync_every = sync_every
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._segments = sorted(int(p.stem) for p in self.path.glob('*.log'))
+        self._cursor = self._load_cursor()
+        self._next_id = max(self._segments + [self._cursor[0]]) + 1
+
+    @property
+    def empty(self) -> bool:
+        with self._lock:
+            return self._pending_bytes() == 0
+
+    @property
+    def pending_bytes(self) -> int:
+        with self._lock:
+            return self._pending_bytes()
+
+    def append(self, points: list[tuple]) -> None:
+        data = "".join(encode(point) + "\n" for point in points)
+        with self._lock:
+            if self._file is None or self._file.tell() >= self.segment_bytes:
+                self._roll()
+            self._file.write(data)
+            self._file.flush()
+            self._unsynced += 1
+            if self.sync_every and self._unsynced >= self.sync_every:
+                self._sync()
+
+    def read(self, limit: int) -> tuple[list[tuple], tuple[int, int]]:
+        points = []
+        with self._lock:
+            segment, offset = self._cursor
+            for segment in [s for s in self._segments if s >= self._cursor[0]]:
+                if segment != self._cursor[0]:
+                    offset = 0
+                with open(self._segment_path(segment), "rb") as f:
+                    f.seek(offset)
+                    while len(points) < limit:
+                        line = f.readline()
+                        if not line.endswith(b"\n"):
+                            break
+                        offset += len(line)
+                        try:
+                            points.append(decode(line))
+                        except (ValueError, TypeError):
+                            logger.warning(f"segment log skipping corrupt entry in segment {segment}")
+                if len(points) >= limit:
+                    break
+        return points, (segment, offset)
+
+    def ack(self, cursor: tuple[int, int]) -> None:
+        with self._lock:
+            segment, offset = cursor
+            for done in [s for s in self._segments if s < segment]:
+                self._delete(done)
+            if self._segments and segment == self._segments[-1] and offset >= self._segment_path(segment).stat().st_size:
+                self._delete(segment)
+                segment, offset = self._next_id, 0
+            if (segment, offset) != self._cursor:
+                self._cursor = (segment, offset)
+                self._save_cursor()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def _sync(self) -> None:
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _roll(self) -> None:
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+        segment = self._next_id
+        self._next_id += 1
+        self._segments.append(segment)
+        self._file = open(self._segment_path(segment), "a")
+
+    def _delete(self, segment: int) -> None:
+        if self._file is not None and self._segments[-1] == segment:
+            self._file.close()
+            self._file = None
+            self._unsynced = 0
+        self._segment_path(segment).unlink(missing_ok=True)
+        self._segments.remove(segment)
+
+    def _pending_bytes(self) -> int:
+        total = 0
+        for segment in self._segments:
+            if segment >= self._cursor[0]:
+                total += self._segment_path(segment).stat().st_size
+        if self._segments and self._cursor[0] in self._segments:
+            total -= self._cursor[1]
+        return total
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path / f"{segment:012d}.log"
+
+    def _load_cursor(self) -> tuple[int, int]:
+        try:
+            segment, offset = (self.path / CURSOR_FILE).read_text().split()
+            return int(segment), int(offset)
+        except (FileNotFoundError, ValueError):
+            return (self._segments[0] if self._segments else 0), 0
+
+    def _save_cursor(self) -> None:
+        tmp = self.path / f"{CURSOR_FILE}.tmp"
+        tmp.write_text(f"{self._cursor[0]} {self._cursor[1]}")
+        os.replace(tmp, self.path / CURSOR_FILE)
+
+
+def encode(point: tuple) -> str:
+    measurement, tags, fields, timestamp = point
+    return json.dumps(
+        [measurement, tags, fields, timestamp.isoformat()],
+        default=lambda value: {"__decimal__": str(value)} if isinstance(value, Decimal) else str(value),
+    )
+
+
+def decode(line: bytes | str) -> tuple:
+    measurement, tags, fields, timestamp = json.loads(
+        line,
+        object_hook=lambda obj: Decimal(obj["__decimal__"]) if "__decimal__" in obj else obj,
+    )
+    return measurement, tags, fields, datetime.fromisoformat(timestamp)
@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime, timezone
+from time import monotonic
+
+from storage import AbstractStorage
+from storage.SegmentLog import SegmentLog
+
+logger = logging.getLogger(__name__)
+
+
+class SpoolStorage(AbstractStorage):
+    def __init__(
+        self,
+        storage: AbstractStorage,
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float | None = 5.0,
+        segment_bytes: int = 16 * 1024 * 1024,
+        sync_every: int = 1,
+        backoff: float = 1.0,
+        max_backoff: float = 300.0,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.storage = storage
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.replayed = 0
+        self.failures = 0
+        self._log = SegmentLog(path, segment_bytes=segment_bytes, sync_every=sync_every)
+        self._unsent = 0 if self._log.empty else batch_size
+        self._first_unsent_at = monotonic()
+        self._retry_at = 0.0
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._log.pending_bytes
+
+    def write(self, measurement: str, tags: dict, fields: dict, timestamp: datetime | None = None) -> None:
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        self._log.append([(measurement, tags, fields, timestamp)])
+        if not self._unsent:
+            self._first_unsent_at = monotonic()
+        self._unsent += 1
+
+        if self._unsent >= self.batch_size or self._is_stale():
+            self.replay()
+
+    def flush(self) -> None:
+        self.replay()
+        self.storage.flush()
+
+    def close(self) -> None:
+        self.replay()
+        self._log.close()
+        self.storage.close()
+
+    def replay(self) -> bool:
+        if monotonic() < self._retry_at:
+            return False
+
+        while True:
+            points, cursor = self._log.read(self.batch_size)
+            if not points:
+                self._log.ack(cursor)
+                break
+            try:
+                self.storage.write_batch(points)
+                self.storage.flush()
+            except Exception as e:
+                self.failures += 1
+                delay = min(self.backoff * 2 ** (self.failures - 1), self.max_backoff)
+                self._retry_at = monotonic() + delay
+                logger.warning(f"spool replay failed, retrying in {delay:.1f}s: {e}")
+                return False
+            self._log.ack(cursor)
+            self.replayed += len(points)
+
+        self.failures = 0
+        self._unsent = 0
+        return True
+
+    def _is_stale(self) -> bool:
+        return self.flush_interval is not None and monotonic() - self._first_unsent_at >= self.flush_interval
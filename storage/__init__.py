@@ -1,3 +1,15 @@
 from storage.AbstractStorage import AbstractStorage
+from storage.PointTable import PointTable
+from storage.AbstractAsyncStorage import AbstractAsyncStorage
 from storage.CsvStorage import CsvStorage
 from storage.InfluxDBStorage import InfluxDBStorage
+from storage.ParquetStorage import ParquetStorage
+from storage.SQLiteStorage import SQLiteStorage
+from storage.QueuedStorage import QueuedStorage
+from storage.SpoolStorage import SpoolStorage
+from storage.FanoutStorage import FanoutStorage
+from storage.DeadbandStorage import DeadbandStorage
+from storage.AggregateStorage import AggregateStorage
+from storage.InstrumentedStorage import InstrumentedStorage
+from storage.ForwardingStorage import ForwardingStorage
+from storage.AsyncStorageAdapter import AsyncStorageAdapter
@@ -0,0 +1,322 @@
+import tomllib
+
+import pytest
+
+from config import ConfigError, MeterConfig
+from meter import GenericMeter
+from processor import ChainProcessor, DSMRElectricityProcessor
+from reader import BroadcastSubscriber, DelayReader, RandomReader
+from metrics import MetricsServer, StatsLogger
+from storage import CsvStorage, InstrumentedStorage, QueuedStorage
+
+
+def load(text: str) -> MeterConfig:
+    return MeterConfig(tomllib.loads(text))
+
+
+class TestMeterConfig:
+    def test_builds_meter_from_inline_components(self):
+        config = load('''
+            [meters.water]
+            name = "cold water"
+            reader = { type = "DelayReader", delay = 2.0, reader = { type = "RandomReader" } }
+            processor = { type = "PassProcessor" }
+        ''')
+        meter = config.build().meters["water"]
+        assert isinstance(meter, GenericMeter)
+        assert meter.name == "cold water"
+        assert isinstance(meter.reader, DelayReader)
+        assert meter.reader.delay == 2.0
+        assert isinstance(meter.reader.reader, RandomReader)
+
+    def test_meter_name_defaults_to_key(self):
+        config = load('''
+            [meters.water]
+            reader = { type = "ZeroReader" }
+            processor = { type = "PassProcessor" }
+        ''')
+        assert config.build().meters["water"].name == "water"
+
+    def test_meter_batch_size(self):
+        config = load('''
+            [meters.a]
+            reader = { type = "ZeroReader" }
+            processor = { type = "PassProcessor" }
+            batch_size = 1000
+
+            [meters.b]
+            reader = { type = "ZeroReader" }
+            processor = { type = "PassProcessor" }
+        ''')
+        meters = config.build().meters
+        assert (meters["a"].batch_size, meters["b"].batch_size) == (1000, None)
+
+    def test_passes_processors_as_positional_arguments(self):
+        config = load('''
+            [meters.m]
+            reader = { type = "ZeroReader" }
+            processor = { type = "ChainProcessor", processors = [
+                { type = "DSMRElectricityProcessor" },
+                { type = "DSMRGasProcessor" },
+            ] }
+        ''')
+        processor = config.build().meters["m"].processor
+        assert isinstance(processor, ChainProcessor)
+        assert isinstance(processor.processors[0], DSMRElectricityProcessor)
+        assert len(processor.processors) == 2
+
+    def test_named_components_are_shared(self, tmp_path):
+        config = load(f'''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+
+            [meters.a]
+            reader = {{ type = "ZeroReader" }}
+            processor = {{ type = "DSMRElectricityProcessor", storage = "csv" }}
+
+            [meters.b]
+            reader = {{ type = "ZeroReader" }}
+            processor = {{ type = "DSMRGasProcessor", storage = "csv" }}
+        ''')
+        meters = config.build().meters
+        assert isinstance(meters["a"].processor.storage, CsvStorage)
+        assert meters["a"].processor.storage is meters["b"].processor.storage
+
+    def test_broadcast_reader_is_subscribed_per_meter(self):
+        config = load('''
+            [readers.p1]
+            type = "BroadcastReader"
+            reader = { type = "ZeroReader" }
+
+            [meters.a]
+            reader = "p1"
+            processor = { type = "PassProcessor" }
+
+            [meters.b]
+            reader = "p1"
+            processor = { type = "PassProcessor" }
+        ''')
+        meters = config.build().meters
+        assert isinstance(meters["a"].reader, BroadcastSubscriber)
+        assert meters["a"].reader is not meters["b"].reader
+        assert meters["a"].reader.broadcast is meters["b"].reader.broadcast
+
+    def test_builds_only_selected_meters(self):
+        config = load('''
+            [meters.a]
+            reader = { type = "ZeroReader" }
+            processor = { type = "PassProcessor" }
+
+            [meters.b]
+            reader = { type = "ZeroReader" }
+            processor = { type = "PassProcessor" }
+        ''')
+        assert list(config.build(["b"]).meters) == ["b"]
+
+    def test_graph_close_closes_processors(self):
+        config = load('''
+            [meters.a]
+            reader = { type = "ZeroReader" }
+            processor = { type = "ChainProcessor", parallel = true, processors = [{ type = "PassProcessor" }] }
+        ''')
+        graph = config.build()
+        chain = graph.meters["a"].processor
+        graph.close()
+        assert chain._executor._shutdown
+
+    def test_graph_closes_outermost_storages_only(self, tmp_path):
+        config = load(f'''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+
+            [storages.queue]
+            type = "QueuedStorage"
+            storage = "csv"
+
+            [meters.a]
+            reader = {{ type = "ZeroReader" }}
+            processor = {{ type = "DSMRGasProcessor", storage = "queue" }}
+        ''')
+        graph = config.build()
+        assert len(graph.storages) == 1
+        assert isinstance(graph.storages[0], QueuedStorage)
+        graph.close()
+
+    def test_expands_environment_variables(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("CSV_BUFFER", "25")
+        monkeypatch.setenv("CSV_DIR", str(tmp_path))
+        config = load('''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "${CSV_DIR}/readings.csv"
+            buffer_size = "${CSV_BUFFER}"
+            fsync = "${CSV_FSYNC:-flush}"
+
+            [meters.a]
+            reader = { type = "ZeroReader" }
+            processor = { type = "DSMRGasProcessor", storage = "csv" }
+        ''')
+        storage = config.build().meters["a"].processor.storage
+        assert storage.buffer_size == 25
+        assert storage.fsync == "flush"
+        assert str(storage.path) == f"{tmp_path}/readings.csv"
+
+    def test_environment_values_follow_parameter_types(self, monkeypatch):
+        monkeypatch.setenv("P1_HOST", "007")
+        monkeypatch.setenv("P1_PORT", "2001")
+        monkeypatch.setenv("P1_BACKOFF", "2")
+        config = load('''
+            [readers.p1]
+            type = "P1TcpReader"
+            host = "${P1_HOST}"
+            port = "${P1_PORT}"
+
+            [storages.spool]
+            type = "SpoolStorage"
+            storage = { type = "CsvStorage", path = "readings.csv" }
+            path = "${SPOOL_PATH:-1e3}"
+            backoff = "${P1_BACKOFF}"
+
+            [metrics]
+            enabled = "${METRICS:-true}"
+        ''')
+        assert config.components[("reader", "p1")].kwargs == {"host": "007", "port": 2001}
+        spool = config.components[("storage", "spool")].kwargs
+        assert (spool["path"], spool["backoff"]) == ("1e3", 2.0)
+        assert config.metrics == {"enabled": True}
+
+    def test_named_storages_can_be_replaced(self, tmp_path):
+        config = load(f'''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+
+            [meters.a]
+            reader = {{ type = "ZeroReader" }}
+            processor = {{ type = "DSMRGasProcessor", storage = {{ type = "QueuedStorage", storage = "csv" }} }}
+        ''')
+        replacement = CsvStorage(str(tmp_path / "other.csv"))
+        graph = config.build(storages={"csv": replacement})
+        assert graph.meters["a"].processor.storage.storage is replacement
+        assert not (tmp_path / "readings.csv").exists()
+        graph.close()
+
+    def test_storage_references_stop_at_named_storages(self, tmp_path):
+        config = load(f'''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+
+            [storages.queue]
+            type = "QueuedStorage"
+            storage = "csv"
+
+            [processors.dsmr]
+            type = "ChainProcessor"
+            processors = [{{ type = "DSMRGasProcessor", storage = "queue" }}, {{ type = "DSMRElectricityProcessor", storage = "csv" }}]
+
+            [meters.a]
+            reader = {{ type = "ZeroReader" }}
+            processor = "dsmr"
+
+            [meters.b]
+            reader = {{ type = "ZeroReader" }}
+            processor = {{ type = "PassProcessor" }}
+        ''')
+        assert config.storage_references() == ["queue", "csv"]
+        assert config.storage_references(["b"]) == []
+
+        graph = config.build_storages()
+        assert isinstance(graph.named_storages["queue"], QueuedStorage)
+        assert graph.named_storages["queue"].storage is graph.named_storages["csv"]
+        assert graph.storages == [graph.named_storages["queue"]]
+        graph.close()
+
+    def test_metrics_are_disabled_without_section(self):
+        config = load('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }')
+        graph = config.build()
+        assert graph.metrics is None
+        assert graph.meters["a"].metrics is None
+
+    def test_metrics_instrument_meters_and_storages(self, tmp_path):
+        config = load(f'''
+            [metrics]
+            port = 0
+            log_interval = 60
+
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+
+            [storages.queue]
+            type = "QueuedStorage"
+            storage = "csv"
+
+            [meters.a]
+            reader = {{ type = "ZeroReader" }}
+            processor = {{ type = "DSMRGasProcessor", storage = "queue" }}
+        ''')
+        graph = config.build()
+        processor = graph.meters["a"].processor
+        assert graph.meters["a"].metrics is graph.metrics
+        assert isinstance(processor.storage, InstrumentedStorage)
+        assert isinstance(processor.storage.storage, QueuedStorage)
+        assert isinstance(processor.storage.storage.storage, InstrumentedStorage)
+        assert graph.storages == [processor.storage.storage]
+        assert [type(e) for e in graph.exporters] == [MetricsServer, StatsLogger]
+        assert 'meteread_storage_depth{kind="storage",component="queue"} 0' in graph.metrics.render()
+        graph.close()
+
+    def test_load_reads_the_current_file(self, tmp_path):
+        path = tmp_path / "meteread.toml"
+        path.write_text('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }\n')
+        assert list(MeterConfig.load(str(path)).meters) == ["a"]
+        path.write_text('[meters.b]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }\n')
+        assert list(MeterConfig.load(str(path)).meters) == ["b"]
+
+    def test_repository_config_is_valid(self):
+        config = MeterConfig.load("meteread.toml")
+        assert {"water", "electricity", "gas", "electricity_and_gas", "raw"} <= set(config.meters)
+
+
+class TestMeterConfigValidation:
+    @pytest.mark.parametrize("text, message", [
+        ('[sensors.a]\ntype = "X"', "unknown section"),
+        ('[meters.a]\nreader = { type = "ZeroReader" }', "missing processor"),
+        ('[meters.a]\nreader = { type = "NoSuchReader" }\nprocessor = { type = "PassProcessor" }', "unknown reader type"),
+        ('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor", colour = 1 }', "invalid arguments"),
+        ('[meters.a]\nreader = "p1"\nprocessor = { type = "PassProcessor" }', "unknown reader 'p1'"),
+        ('[meters.a]\nreader = { delay = 1 }\nprocessor = { type = "PassProcessor" }', "table with 'type'"),
+        ('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }\nstorage = "x"', "unknown key"),
+        (
+            '[storages.a]\ntype = "QueuedStorage"\nstorage = "b"\n'
+            '[storages.b]\ntype = "QueuedStorage"\nstorage = "a"',
+            "reference cycle",
+        ),
+        ('metrics = 1', "expected a table"),
+        ('[metrics]\ncolour = 1', "unknown key"),
+        ('[metrics]\nport = "x"', "invalid value"),
+        ('[metrics]\nlog_interval = 0', "must be positive"),
+        ('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }\nbatch_size = 0', "positive integer"),
+        ('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }\nbatch_size = "x"', "positive integer"),
+    ])
+    def test_rejects_invalid_config(self, text, message):
+        with pytest.raises(ConfigError, match=message):
+            load(text)
+
+    def test_rejects_unknown_meter_name(self):
+        config = load('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }')
+        with pytest.raises(ConfigError, match="unknown meter"):
+            config.build(["b"])
+
+    def test_rejects_missing_file(self, tmp_path):
+        with pytest.raises(ConfigError, match="not found"):
+            MeterConfig.load(str(tmp_path / "missing.toml"))
+
+    def test_rejects_malformed_toml(self, tmp_path):
+        path = tmp_path / "meteread.toml"
+        path.write_text("[meters\n")
+        with pytest.raises(ConfigError):
+            MeterConfig.load(str(path))
@@ -0,0 +1,249 @@
+import pickle
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from dsmr import (
+    ChecksumError, DSMRReading, FrameBuffer, MBusDevice, MBusReading, Telegram, TelegramError, TelegramParser,
+)
+from dsmr.TelegramParser import crc16
+
+
+@pytest.fixture
+def signed_telegram(raw_telegram_v5):
+    body = raw_telegram_v5[:raw_telegram_v5.index('!') + 1]
+    return raw_telegram_v5.replace('!0000', f'!{crc16(body.encode()):04X}')
+
+
+class TestCrc16:
+    def test_check_value(self):
+        assert crc16(b'123456789') == 0xBB3D
+
+    def test_is_incremental(self):
+        assert crc16(b'56789', crc16(b'1234')) == crc16(b'123456789')
+
+
+class TestTelegramParser:
+    def test_parses_telegram(self, signed_telegram):
+        telegram = TelegramParser().parse(signed_telegram)
+        assert isinstance(telegram, Telegram)
+        assert telegram.header == '/ISk5\\2MT382-1000'
+
+    def test_parses_quantities(self, signed_telegram):
+        telegram = TelegramParser().parse(signed_telegram)
+        assert telegram.ELECTRICITY_USED_TARIFF_2.value == Decimal('2345.678')
+        assert telegram.ELECTRICITY_USED_TARIFF_2.unit == 'kWh'
+        assert telegram.CURRENT_ELECTRICITY_USAGE.value == Decimal('1.500')
+        assert telegram.CURRENT_ELECTRICITY_USAGE.unit == 'kW'
+
+    def test_parses_text_and_integers(self, signed_telegram):
+        telegram = TelegramParser().parse(signed_telegram)
+        assert telegram.EQUIPMENT_IDENTIFIER.value == '4530303334303034363639353537343136'
+        assert telegram.ELECTRICITY_ACTIVE_TARIFF.value == '0002'
+        assert telegram.SHORT_POWER_FAILURE_COUNT.value == 0
+
+    def test_converts_timestamp_to_utc(self, signed_telegram):
+        telegram = TelegramParser().parse(signed_telegram)
+        assert telegram.P1_MESSAGE_TIMESTAMP.value == datetime(2020, 12, 31, 23, 0, tzinfo=timezone.utc)
+
+    def test_summer_time_timestamp(self, raw_telegram_v5):
+        raw = raw_telegram_v5.replace('0-0:1.0.0(210101000000W)', '0-0:1.0.0(210701000000S)')
+        telegram = TelegramParser(validate_checksum=False).parse(raw)
+        assert telegram.P1_MESSAGE_TIMESTAMP.value == datetime(2021, 6, 30, 22, 0, tzinfo=timezone.utc)
+
+    def test_groups_mbus_objects_by_channel(self, signed_telegram):
+        telegram = TelegramParser().parse(signed_telegram)
+        device, = telegram.MBUS_DEVICES
+        assert isinstance(device, MBusDevice)
+        assert device.channel_id == 1
+        assert device.MBUS_DEVICE_TYPE.value == 3
+        assert device.MBUS_EQUIPMENT_IDENTIFIER.value == '4730303233353631323930333635383137'
+        assert device.MBUS_METER_READING.value == Decimal('1234.567')
+        assert device.MBUS_METER_READING.unit == 'm3'
+        assert device.MBUS_METER_READING.datetime == datetime(2021, 1, 1, 11, 0, tzinfo=timezone.utc)
+
+    def test_matches_dsmr_parser(self, signed_telegram):
+        from dsmr_parser import telegram_specifications
+        from dsmr_parser.parsers import TelegramParser as DsmrTelegramParser
+
+        expected = DsmrTelegramParser(telegram_specifications.V5).parse(signed_telegram)
+        telegram = TelegramParser().parse(signed_telegram)
+        for name in ('P1_MESSAGE_TIMESTAMP', 'EQUIPMENT_IDENTIFIER', 'ELECTRICITY_USED_TARIFF_1',
+                     'CURRENT_ELECTRICITY_DELIVERY', 'INSTANTANEOUS_VOLTAGE_L2', 'LONG_POWER_FAILURE_COUNT'):
+            assert getattr(telegram, name).value == getattr(expected, name).value
+            assert getattr(telegram, name).unit == getattr(expected, name).unit
+
+    def test_converts_values_once(self, signed_telegram):
+        telegram = TelegramParser().parse(signed_telegram)
+        assert telegram.ELECTRICITY_USED_TARIFF_1 is telegram.ELECTRICITY_USED_TARIFF_1
+
+    def test_missing_object_raises_attribute_error(self, signed_telegram):
+        telegram = TelegramParser().parse(signed_telegram)
+        with pytest.raises(AttributeError):
+            telegram.ELECTRICITY_IMPORTED_TOTAL
+
+    def test_parses_only_requested_objects(self, signed_telegram):
+        telegram = TelegramParser(['ELECTRICITY_USED_TARIFF_1', 'MBUS_METER_READING']).parse(signed_telegram)
+        assert 'ELECTRICITY_USED_TARIFF_1' in telegram
+        assert 'ELECTRICITY_USED_TARIFF_2' not in telegram
+        assert 'MBUS_DEVICE_TYPE' not in telegram.MBUS_DEVICES[0]
+        assert telegram.MBUS_DEVICES[0].MBUS_METER_READING.value == Decimal('1234.567')
+
+    def test_rejects_unknown_objects(self):
+        with pytest.raises(ValueError, match="unknown DSMR object"):
+            TelegramParser(['NOT_AN_OBJECT'])
+
+    def test_rejects_unknown_error_policy(self):
+        with pytest.raises(ValueError):
+            TelegramParser(errors='ignore')
+
+    def test_rejects_unknown_output(self):
+        with pytest.raises(ValueError):
+            TelegramParser(output='dict')
+
+
+class TestTelegramParserErrors:
+    def test_checksum_mismatch(self, raw_telegram_v5):
+        with pytest.raises(ChecksumError, match="checksum mismatch"):
+            TelegramParser().parse(raw_telegram_v5)
+
+    def test_corrupted_line_fails_checksum(self, signed_telegram):
+        with pytest.raises(ChecksumError):
+            TelegramParser().parse(signed_telegram.replace('001234.567*kWh', '001234.568*kWh'))
+
+    def test_non_ascii_byte_fails_checksum(self, signed_telegram):
+        corrupted = signed_telegram.replace('001234.567', '001234.5\ufffd7')
+        with pytest.raises(ChecksumError, match="non-ASCII"):
+            TelegramParser().parse(corrupted)
+        assert TelegramParser(errors='skip').parse(corrupted) is None
+
+    def test_skips_checksum_validation(self, raw_telegram_v5):
+        assert TelegramParser(validate_checksum=False).parse(raw_telegram_v5) is not None
+
+    def test_invalid_start(self, signed_telegram):
+        with pytest.raises(TelegramError, match="start"):
+            TelegramParser().parse(signed_telegram[1:])
+
+    def test_truncated_telegram(self, signed_telegram):
+        with pytest.raises(TelegramError, match="checksum line"):
+            TelegramParser().parse(signed_telegram[:signed_telegram.index('!')])
+
+    def test_invalid_value_raises_on_access(self, raw_telegram_v5):
+        raw = raw_telegram_v5.replace('001234.567*kWh', 'garbage*kWh')
+        telegram = TelegramParser(validate_checksum=False).parse(raw)
+        with pytest.raises(TelegramError, match="ELECTRICITY_USED_TARIFF_1"):
+            telegram.ELECTRICITY_USED_TARIFF_1
+
+    def test_skip_policy_returns_none(self, raw_telegram_v5, caplog):
+        assert TelegramParser(errors='skip').parse(raw_telegram_v5) is None
+        assert "checksum mismatch" in caplog.text
+
+    def test_accepts_extra_dsmr_parser_arguments(self, signed_telegram):
+        assert TelegramParser().parse(signed_telegram, '', '') is not None
+
+
+class TestDSMRReading:
+    def test_parser_outputs_reading(self, signed_telegram):
+        reading = TelegramParser(output='reading').parse(signed_telegram)
+        assert reading == DSMRReading(
+            timestamp=datetime(2020, 12, 31, 23, 0, tzinfo=timezone.utc),
+            sn='4530303334303034363639353537343136',
+            t1=Decimal('1234.567'),
+            t2=Decimal('2345.678'),
+            current=Decimal('1.500'),
+            returned=Decimal('0.000'),
+            mbus={3: MBusReading(
+                channel=1,
+                type=3,
+                sn='4730303233353631323930333635383137',
+                reading=Decimal('1234.567'),
+                unit='m3',
+                timestamp=datetime(2021, 1, 1, 11, 0, tzinfo=timezone.utc),
+            )},
+        )
+
+    def test_reading_output_parses_only_reading_objects(self, signed_telegram):
+        parser = TelegramParser(output='reading')
+        assert {name for name, _ in parser._objects.values()} < set(DSMRReading.OBJECTS)
+
+    def test_from_dsmr_parser_telegram(self, signed_telegram):
+        from dsmr_parser import telegram_specifications
+        from dsmr_parser.parsers import TelegramParser as DsmrTelegramParser
+
+        telegram = DsmrTelegramParser(telegram_specifications.V5).parse(signed_telegram)
+        assert DSMRReading.from_telegram(telegram) == TelegramParser(output='reading').parse(signed_telegram)
+
+    def test_keeps_first_device_of_each_type(self):
+        first, second, water = MagicMock(), MagicMock(), MagicMock()
+        first.MBUS_DEVICE_TYPE.value = second.MBUS_DEVICE_TYPE.value = 3
+        water.MBUS_DEVICE_TYPE.value = 7
+        telegram = MagicMock()
+        telegram.MBUS_DEVICES = [first, water, second]
+        reading = DSMRReading.from_telegram(telegram)
+        assert reading.mbus[3].sn is first.MBUS_EQUIPMENT_IDENTIFIER.value
+        assert set(reading.mbus) == {3, 7}
+
+    def test_missing_objects_are_none(self, signed_telegram):
+        reading = TelegramParser(['EQUIPMENT_IDENTIFIER'], output='reading').parse(signed_telegram)
+        assert reading.sn == '4530303334303034363639353537343136'
+        assert reading.t1 is None
+        assert reading.mbus == {}
+
+    def test_invalid_value_is_skipped(self, raw_telegram_v5):
+        raw = raw_telegram_v5.replace('001234.567*kWh', 'garbage*kWh')
+        assert TelegramParser(validate_checksum=False, errors='skip', output='reading').parse(raw) is None
+
+    def test_pickles(self, signed_telegram):
+        reading = TelegramParser(output='reading').parse(signed_telegram)
+        assert pickle.loads(pickle.dumps(reading)) == reading
+
+
+class TestFrameBuffer:
+    FRAME = b"/ISk5\\2MT382-1000\r\n\r\n1-0:1.8.1(001234.567*kWh)\r\n!1234\r\n"
+
+    def test_yields_complete_frames(self):
+        buffer = FrameBuffer()
+        buffer.feed(self.FRAME + self.FRAME)
+        assert list(buffer.frames()) == [self.FRAME, self.FRAME]
+        assert len(buffer) == 0
+
+    def test_keeps_partial_frame_until_complete(self):
+        buffer = FrameBuffer()
+        for index in range(len(self.FRAME) - 1):
+            buffer.feed(self.FRAME[index:index + 1])
+            assert list(buffer.frames()) == []
+        buffer.feed(self.FRAME[-1:])
+        assert list(buffer.frames()) == [self.FRAME]
+
+    def test_discards_bytes_before_frame_start(self):
+        buffer = FrameBuffer()
+        buffer.feed(b"\x00garbage" + self.FRAME)
+        assert list(buffer.frames()) == [self.FRAME]
+
+    def test_resyncs_on_truncated_frame(self):
+        buffer = FrameBuffer()
+        buffer.feed(self.FRAME[:30] + self.FRAME)
+        assert list(buffer.frames()) == [self.FRAME]
+        assert buffer.dropped == 1
+
+    def test_reuses_buffer_across_many_frames(self):
+        buffer = FrameBuffer(1024)
+        for _ in range(100):
+            buffer.feed(self.FRAME)
+            assert list(buffer.frames()) == [self.FRAME]
+        assert buffer.dropped == 0
+
+    def test_drops_frame_larger_than_buffer(self):
+        buffer = FrameBuffer(1024)
+        buffer.feed(b"/" + b"x" * 1000)
+        assert list(buffer.frames()) == []
+        buffer.feed(b"x" * 100)
+        buffer.feed(self.FRAME)
+        assert list(buffer.frames()) == [self.FRAME]
+        assert buffer.dropped == 1
+
+    def test_rejects_small_buffer(self):
+        with pytest.raises(ValueError):
+            FrameBuffer(16)
@@ -0,0 +1,193 @@
+import os
+import signal
+import threading
+import time
+import tomllib
+
+import pytest
+
+from config import ConfigError, MeterConfig
+from fleet import Fleet
+
+
+def load(text: str) -> MeterConfig:
+    return MeterConfig(tomllib.loads(text))
+
+
+def wait_for(condition, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+class TestShard:
+    def test_keeps_meters_of_a_shared_reader_together(self):
+        config = load('''
+            [readers.p1]
+            type = "BroadcastReader"
+            reader = { type = "ZeroReader" }
+
+            [meters.a]
+            reader = "p1"
+            processor = { type = "PassProcessor" }
+
+            [meters.b]
+            reader = { type = "ZeroReader" }
+            processor = { type = "PassProcessor" }
+
+            [meters.c]
+            reader = "p1"
+            processor = { type = "PassProcessor" }
+        ''')
+        assert Fleet.shard(config, ["a", "b", "c"], 2) == [["a", "c"], ["b"]]
+
+    def test_balances_meters_across_workers(self):
+        config = load("\n".join(
+            f'[meters.m{i}]\nreader = {{ type = "ZeroReader" }}\nprocessor = {{ type = "PassProcessor" }}'
+            for i in range(5)
+        ))
+        assert Fleet.shard(config, list(config.meters), 2) == [["m0", "m2", "m4"], ["m1", "m3"]]
+
+    def test_uses_no_more_workers_than_meters(self):
+        config = load('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }')
+        assert Fleet.shard(config, ["a"], 8) == [["a"]]
+
+    def test_rejects_unknown_meter(self):
+        config = load('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }')
+        with pytest.raises(ConfigError, match="unknown meter"):
+            Fleet.shard(config, ["b"], 2)
+
+
+class TestFleet:
+    @pytest.fixture
+    def capture(self, tmp_path, raw_telegram_v5):
+        telegrams = [raw_telegram_v5.replace("210101000000W", f"2101010000{second:02d}W") for second in (0, 10, 30)]
+        path = tmp_path / "p1.log"
+        path.write_bytes("".join(telegrams).encode())
+        return path
+
+    def test_workers_feed_shared_storage(self, tmp_path, capture):
+        path = tmp_path / "meteread.toml"
+        path.write_text(f'''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+        ''' + "".join(f'''
+            [meters.m{i}]
+            reader = {{ type = "ReplayReader", path = "{capture}", validate_checksum = false }}
+            processor = {{ type = "DSMRElectricityProcessor", storage = "csv" }}
+        ''' for i in range(3)))
+
+        fleet = Fleet(str(path), workers=2, heartbeat=0.1, timeout=30)
+        fleet()
+
+        rows = (tmp_path / "readings.csv").read_text().splitlines()
+        assert len(rows) == 1 + 3 * 3
+        assert fleet.written == 9
+        assert [s["points"] for s in fleet.stats()] == [6, 3]
+        assert all(s["running"] == 0 for s in fleet.stats())
+
+    def test_restarts_crashed_worker(self, tmp_path):
+        path = tmp_path / "meteread.toml"
+        path.write_text('''
+            [meters.a]
+            reader = { type = "DelayReader", delay = 0.05, reader = { type = "ZeroReader" } }
+            processor = { type = "PassProcessor" }
+        ''')
+
+        fleet = Fleet(str(path), workers=4, heartbeat=0.1, timeout=30, backoff=0)
+        fleet.start()
+        try:
+            worker, = fleet._workers
+            wait_for(lambda: fleet.supervise() and "pid" in worker.health)
+            os.kill(worker.health["pid"], signal.SIGKILL)
+            wait_for(lambda: not worker.process.is_alive())
+
+            assert fleet.supervise()
+            assert fleet.supervise()
+            assert fleet.stats()[0]["restarts"] == 1
+            assert worker.process.is_alive()
+        finally:
+            fleet.stop()
+        assert fleet.stats()[0]["running"] == 0
+
+    def test_restarts_worker_whose_meter_failed(self, tmp_path):
+        path = tmp_path / "meteread.toml"
+        path.write_text(f'''
+            [meters.a]
+            reader = {{ type = "ReplayReader", path = "{tmp_path / 'missing.log'}" }}
+            processor = {{ type = "PassProcessor" }}
+        ''')
+
+        fleet = Fleet(str(path), heartbeat=0.1, timeout=30, backoff=0)
+        fleet.start()
+        try:
+            wait_for(lambda: fleet.supervise() and fleet.stats()[0]["restarts"] >= 1)
+            assert not fleet._workers[0].finished
+        finally:
+            fleet.stop()
+
+    def test_sigterm_stops_workers_and_flushes(self, tmp_path, capture):
+        path = tmp_path / "meteread.toml"
+        path.write_text(f'''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+            buffer_size = 1000
+
+            [meters.a]
+            reader = {{ type = "DelayReader", delay = 0.01, reader = {{ type = "ReplayReader", path = "{capture}", validate_checksum = false }} }}
+            processor = {{ type = "DSMRElectricityProcessor", storage = "csv" }}
+
+            [meters.b]
+            reader = {{ type = "DelayReader", delay = 60, reader = {{ type = "ZeroReader" }} }}
+            processor = {{ type = "PassProcessor" }}
+        ''')
+
+        fleet = Fleet(str(path), workers=2, heartbeat=0.1, timeout=30)
+        timer = threading.Timer(2.0, os.kill, (os.getpid(), signal.SIGTERM))
+        timer.start()
+        with pytest.raises(SystemExit):
+            fleet()
+        timer.join()
+        assert all(s["running"] == 0 for s in fleet.stats())
+        assert len((tmp_path / "readings.csv").read_text().splitlines()) == 1 + 3
+        assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+
+    def test_slow_storage_does_not_delay_heartbeats(self, tmp_path, capture):
+        path = tmp_path / "meteread.toml"
+        path.write_text(f'''
+            [storages.csv]
+            type = "CsvStorage"
+            path = "{tmp_path / 'readings.csv'}"
+
+            [meters.a]
+            reader = {{ type = "ReplayReader", path = "{capture}", validate_checksum = false }}
+            processor = {{ type = "DSMRElectricityProcessor", storage = "csv" }}
+
+            [meters.b]
+            reader = {{ type = "DelayReader", delay = 0.05, reader = {{ type = "ZeroReader" }} }}
+            processor = {{ type = "PassProcessor" }}
+        ''')
+
+        fleet = Fleet(str(path), workers=1, heartbeat=0.1, timeout=1.0)
+        fleet.start()
+        try:
+            storage = fleet._graph.named_storages["csv"]
+            write_batch = storage.write_batch
+            storage.write_batch = lambda points: (time.sleep(2.5), write_batch(points))
+            deadline = time.monotonic() + 3.5
+            while time.monotonic() < deadline:
+                fleet.supervise()
+                time.sleep(0.1)
+            assert fleet.stats()[0]["restarts"] == 0
+        finally:
+            fleet.stop()
+        assert fleet.written == 3
+
+    def test_rejects_timeout_shorter_than_heartbeat(self, tmp_path):
+        path = tmp_path / "meteread.toml"
+        path.write_text('[meters.a]\nreader = { type = "ZeroReader" }\nprocessor = { type = "PassProcessor" }')
+        with pytest.raises(ValueError):
+            Fleet(str(path), heartbeat=5, timeout=5)
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("influxdb_client_3", "pyarrow", "dsmr_parser", "serial")
+
+
+def test_read_flushes_storages_on_sigterm(tmp_path, raw_telegram_v5):
+    capture = tmp_path / "p1.log"
+    capture.write_text(raw_telegram_v5 * 1000)
+    config = tmp_path / "meteread.toml"
+    config.write_text(f'''
+        [meters.replay]
+        reader = {{ type = "DelayReader", delay = 0.01, reader = {{ type = "ReplayReader", path = "{capture}", validate_checksum = false }} }}
+        processor = {{ type = "DSMRElectricityProcessor", storage = {{ type = "CsvStorage", path = "{tmp_path / 'readings.csv'}", buffer_size = 100000 }} }}
+    ''')
+    process = subprocess.Popen([sys.executable, "main.py", "read", "-c", str(config)], cwd=ROOT, stderr=subprocess.PIPE)
+    while b"csv write" not in process.stderr.readline():
+        pass
+    process.terminate()
+    process.communicate(timeout=30)
+    assert process.returncode == 0
+    assert len((tmp_path / "readings.csv").read_text().splitlines()) > 1
+
+
+def test_import_main_does_not_load_heavy_backends():
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, main; print(*(m for m in {HEAVY_MODULES!r} if m in sys.modules))"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
@@ -1,6 +1,14 @@
+import asyncio
 from unittest.mock import MagicMock, call
 
+import pytest
+
+from meter.AsyncMeter import AsyncMeter
 from meter.GenericMeter import GenericMeter
+from meter.MeterRuntime import MeterRuntime
+from metrics import Metrics
+from processor import AbstractAsyncProcessor
+from reader import AbstractAsyncReader, AsyncDelayReader, DelayReader, ZeroReader
 
 
 class TestGenericMeter:
@@ -88,3 +96,179 @@ class TestGenericMeter:
             assert False, "Expected StopIteration"
         except StopIteration:
             pass
+
+    def test_records_stage_latency_with_metrics(self):
+        reader = MagicMock()
+        reader.__next__ = MagicMock(side_effect=[1.0, 2.0])
+        processor = MagicMock(side_effect=[True, None])
+        metrics = Metrics()
+
+        GenericMeter(name="test", reader=reader, processor=processor, metrics=metrics)()
+
+        counts = {labels["stage"]: h.count for _, labels, h in metrics.histograms()}
+        assert counts == {"read": 2, "process": 2}
+        assert processor.call_args_list == [call(1.0), call(2.0)]
+
+
+class TestGenericMeterBatch:
+    def test_reads_and_processes_one_batch(self):
+        processor = MagicMock()
+        GenericMeter(name="test", reader=ZeroReader(), processor=processor, batch_size=2)()
+        processor.process_batch.assert_called_once_with([0.0, 0.0])
+        processor.assert_not_called()
+
+    def test_stops_when_reader_is_exhausted(self):
+        reader = MagicMock()
+        reader.read_batch.side_effect = [[1.0, 2.0], [3.0], []]
+        processor = MagicMock()
+        meter = GenericMeter(name="test", reader=reader, processor=processor, batch_size=2)
+        meter()
+        meter()
+        with pytest.raises(StopIteration):
+            meter()
+        assert processor.process_batch.call_args_list == [call([1.0, 2.0]), call([3.0])]
+
+    def test_records_stage_latency_per_batch(self):
+        metrics = Metrics()
+        GenericMeter(name="test", reader=ZeroReader(), processor=MagicMock(), metrics=metrics, batch_size=10)()
+        assert {labels["stage"]: h.count for _, labels, h in metrics.histograms()} == {"read": 1, "process": 1}
+
+    def test_rejects_empty_batch_size(self):
+        with pytest.raises(ValueError):
+            GenericMeter(name="test", reader=ZeroReader(), processor=MagicMock(), batch_size=0)
+
+
+class ListReader(AbstractAsyncReader):
+    def __init__(self, values):
+        self.values = iter(values)
+
+    async def __anext__(self):
+        try:
+            return next(self.values)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class RecordingProcessor(AbstractAsyncProcessor):
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    async def __call__(self, data) -> None:
+        self.received.append(data)
+
+
+class BatchRecordingProcessor(RecordingProcessor):
+    async def process_batch(self, batch: list) -> None:
+        self.received.append(batch)
+
+
+class TestAsyncMeter:
+    def test_calls_async_reader_and_processor_once(self):
+        processor = RecordingProcessor()
+        meter = AsyncMeter(name="test", reader=ListReader([1.0, 2.0]), processor=processor)
+        asyncio.run(meter())
+        assert processor.received == [1.0]
+
+    def test_run_drains_reader(self):
+        processor = RecordingProcessor()
+        meter = AsyncMeter(name="test", reader=ListReader([1.0, 2.0, 3.0]), processor=processor)
+        asyncio.run(meter.run())
+        assert processor.received == [1.0, 2.0, 3.0]
+
+    def test_adapts_sync_reader_and_processor(self):
+        reader = MagicMock()
+        reader.__next__ = MagicMock(side_effect=[42.0, StopIteration])
+        processor = MagicMock(return_value=None)
+        meter = AsyncMeter(name="test", reader=reader, processor=processor)
+        asyncio.run(meter.run())
+        processor.assert_called_once_with(42.0)
+
+    def test_converts_delay_reader_to_async_delay_reader(self):
+        meter = AsyncMeter(name="test", reader=DelayReader(ZeroReader(), delay=2.0), processor=RecordingProcessor())
+        assert isinstance(meter.reader, AsyncDelayReader)
+        assert meter.reader.delay == 2.0
+
+    def test_from_meter_keeps_name(self):
+        meter = GenericMeter(name="water", reader=ZeroReader(), processor=MagicMock())
+        assert AsyncMeter.from_meter(meter).name == "water"
+
+    def test_records_stage_latency_with_metrics(self):
+        metrics = Metrics()
+        meter = AsyncMeter(name="test", reader=ListReader([1.0, 2.0]), processor=RecordingProcessor(), metrics=metrics)
+        asyncio.run(meter.run())
+        assert {labels["stage"]: h.count for _, labels, h in metrics.histograms()} == {"read": 2, "process": 2}
+
+    def test_run_drains_reader_in_batches(self):
+        processor = BatchRecordingProcessor()
+        meter = AsyncMeter(name="test", reader=ListReader([1.0, 2.0, 3.0]), processor=processor, batch_size=2)
+        asyncio.run(meter.run())
+        assert processor.received == [[1.0, 2.0], [3.0]]
+
+    def test_adapts_sync_processor_batch(self):
+        processor = MagicMock()
+        meter = AsyncMeter(name="test", reader=ListReader([1.0, 2.0]), processor=processor, batch_size=5)
+        asyncio.run(meter.run())
+        processor.process_batch.assert_called_once_with([1.0, 2.0])
+
+    def test_from_meter_keeps_batch_size(self):
+        meter = GenericMeter(name="water", reader=ZeroReader(), processor=MagicMock(), batch_size=100)
+        assert AsyncMeter.from_meter(meter).batch_size == 100
+
+    def test_from_meter_keeps_metrics(self):
+        metrics = Metrics()
+        meter = GenericMeter(name="water", reader=ZeroReader(), processor=MagicMock(), metrics=metrics)
+        assert AsyncMeter.from_meter(meter).metrics is metrics
+
+
+class TestMeterRuntime:
+    def test_runs_meters_concurrently(self):
+        order = []
+
+        class SlowReader(AbstractAsyncReader):
+            def __init__(self, name, delay):
+                self.name, self.delay, self.reads = name, delay, 0
+
+            async def __anext__(self):
+                if self.reads == 2:
+                    raise StopAsyncIteration
+                self.reads += 1
+                await asyncio.sleep(self.delay)
+                order.append(self.name)
+                return self.name
+
+        MeterRuntime(
+            AsyncMeter(name="slow", reader=SlowReader("slow", 0.03), processor=RecordingProcessor()),
+            AsyncMeter(name="fast", reader=SlowReader("fast", 0.01), processor=RecordingProcessor()),
+        )()
+        assert order[:2] == ["fast", "fast"]
+
+    def test_failing_meter_does_not_stop_others(self):
+        class FailingReader(AbstractAsyncReader):
+            async def __anext__(self):
+                raise RuntimeError("port gone")
+
+        processor = RecordingProcessor()
+        MeterRuntime(
+            AsyncMeter(name="broken", reader=FailingReader(), processor=RecordingProcessor()),
+            AsyncMeter(name="ok", reader=ListReader([1, 2]), processor=processor),
+        )()
+        assert processor.received == [1, 2]
+
+    def test_fail_fast_stops_runtime_on_first_failure(self):
+        class FailingReader(AbstractAsyncReader):
+            async def __anext__(self):
+                raise RuntimeError("port gone")
+
+        runtime = MeterRuntime(
+            AsyncMeter(name="broken", reader=FailingReader(), processor=RecordingProcessor()),
+            AsyncMeter(name="slow", reader=DelayReader(ZeroReader(), delay=60), processor=RecordingProcessor()),
+            fail_fast=True,
+        )
+        with pytest.raises(RuntimeError):
+            runtime()
+        assert runtime.failed == 1
+
+    def test_wraps_sync_meters(self):
+        meter = GenericMeter(name="water", reader=ZeroReader(), processor=MagicMock())
+        assert isinstance(MeterRuntime(meter).meters[0], AsyncMeter)
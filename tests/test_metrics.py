@@ -0,0 +1,119 @@
+import logging
+import urllib.error
+import urllib.request
+from unittest.mock import MagicMock
+
+import pytest
+
+from metrics import Histogram, Metrics, MetricsServer, StatsLogger
+
+
+class TestHistogram:
+    def test_counts_values_per_bucket(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 1, 3, 7, 20):
+            histogram.observe(value)
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.cumulative() == [2, 3, 4, 5]
+        assert (histogram.count, histogram.sum) == (5, 31.5)
+
+    def test_quantile_returns_bucket_upper_bound(self):
+        histogram = Histogram((1, 5, 10))
+        for value in range(1, 101):
+            histogram.observe(value / 20)
+        assert histogram.quantile(0.1) == 1
+        assert histogram.quantile(0.5) == 5
+        assert histogram.quantile(0.99) == 5
+
+    def test_quantile_of_empty_histogram_is_zero(self):
+        assert Histogram().quantile(0.99) == 0.0
+
+    def test_rejects_unsorted_buckets(self):
+        with pytest.raises(ValueError):
+            Histogram((5, 1))
+
+
+class TestMetrics:
+    def test_histogram_is_shared_per_labels(self):
+        metrics = Metrics()
+        assert metrics.histogram("latency", "", stage="read") is metrics.histogram("latency", "", stage="read")
+        assert metrics.histogram("latency", "", stage="read") is not metrics.histogram("latency", "", stage="process")
+
+    def test_renders_prometheus_histogram(self):
+        metrics = Metrics()
+        metrics.histogram("meteread_stage_seconds", "Stage time.", (0.1, 1.0), meter="gas", stage="read").observe(0.5)
+        lines = metrics.render().splitlines()
+        assert lines[:2] == ["# HELP meteread_stage_seconds Stage time.", "# TYPE meteread_stage_seconds histogram"]
+        assert 'meteread_stage_seconds_bucket{meter="gas",stage="read",le="0.1"} 0' in lines
+        assert 'meteread_stage_seconds_bucket{meter="gas",stage="read",le="+Inf"} 1' in lines
+        assert 'meteread_stage_seconds_count{meter="gas",stage="read"} 1' in lines
+
+    def test_renders_component_stats_as_gauges(self):
+        metrics = Metrics()
+        queue = MagicMock()
+        queue.stats.return_value = {"depth": 3, "written": 10}
+        chain = MagicMock()
+        chain.stats.return_value = [{"processor": "DSMRGasProcessor", "calls": 2}]
+        metrics.register("storage", "default", queue)
+        metrics.register("processor", "dsmr", chain)
+        text = metrics.render()
+        assert 'meteread_storage_depth{kind="storage",component="default"} 3' in text
+        assert (
+            'meteread_processor_calls{kind="processor",component="dsmr",child="0",processor="DSMRGasProcessor"} 2'
+            in text
+        )
+
+    def test_register_makes_names_unique(self):
+        metrics = Metrics()
+        assert metrics.register("storage", "QueuedStorage", MagicMock()) == "QueuedStorage"
+        assert metrics.register("storage", "QueuedStorage", MagicMock()) == "QueuedStorage_2"
+
+    def test_escapes_label_values(self):
+        metrics = Metrics()
+        metrics.histogram("latency", "", meter='say "hi"')
+        assert 'meter="say \\"hi\\""' in metrics.render()
+
+
+class TestMetricsServer:
+    def test_serves_metrics(self):
+        metrics = Metrics()
+        metrics.histogram("latency", "Latency.").observe(0.1)
+        server = MetricsServer(metrics, port=0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+                assert response.headers["Content-Type"].startswith("text/plain")
+                assert "latency_count 1" in response.read().decode()
+        finally:
+            server.close()
+
+    def test_unknown_path_is_not_found(self):
+        server = MetricsServer(Metrics(), port=0)
+        try:
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/")
+        finally:
+            server.close()
+
+
+class TestStatsLogger:
+    def test_logs_rate_and_percentiles(self, caplog):
+        metrics = Metrics()
+        histogram = metrics.histogram("meteread_stage_seconds", "", meter="gas", stage="read")
+        for _ in range(10):
+            histogram.observe(0.002)
+        queue = MagicMock()
+        queue.stats.return_value = {"depth": 4}
+        metrics.register("storage", "default", queue)
+
+        stats = StatsLogger(metrics, interval=3600)
+        with caplog.at_level(logging.INFO):
+            stats.log()
+        stats.close()
+        assert "meteread_stage_seconds meter=gas stage=read" in caplog.messages[0]
+        assert "p99=0.0025" in caplog.messages[0]
+        assert "count=10" in caplog.messages[0]
+        assert caplog.messages[1] == "stats: meteread_storage_depth component=default 4"
+
+    def test_rejects_non_positive_interval(self):
+        with pytest.raises(ValueError):
+            StatsLogger(Metrics(), interval=0)
@@ -1,11 +1,20 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import MagicMock
 
+import pytest
+
 from processor.NoneProcessor import NoneProcessor
 from processor.PassProcessor import PassProcessor
 from processor.DSMRElectricityProcessor import DSMRElectricityProcessor
 from processor.DSMRGasProcessor import DSMRGasProcessor
 from processor.ChainProcessor import ChainProcessor
+from processor.PointProcessor import PointProcessor
+from processor.AsyncProcessorAdapter import AsyncProcessorAdapter
+from reader.DSMRv5RawReader import DSMRv5RawReader
 
 
 class TestNoneProcessor:
@@ -85,6 +94,7 @@ class TestDSMRElectricityProcessor:
                 "current": Decimal("1.500"),
                 "returned": Decimal("0.000"),
             },
+            datetime(2020, 12, 31, 23, 0, tzinfo=timezone.utc),
         )
 
     def test_does_not_write_to_storage_when_none(self, telegram):
@@ -92,6 +102,33 @@ class TestDSMRElectricityProcessor:
         DSMRElectricityProcessor()(telegram)
         storage.write.assert_not_called()
 
+    def test_accepts_full_telegram(self, raw_telegram_v5):
+        storage = MagicMock()
+        DSMRElectricityProcessor(storage=storage)(next(DSMRv5RawReader(raw_telegram_v5, output='telegram')))
+        assert storage.write.call_args.args[2]["t1"] == Decimal("1234.567")
+
+    def test_leaves_timestamp_to_storage_without_message_timestamp(self, raw_telegram_v5):
+        storage = MagicMock()
+        reader = DSMRv5RawReader(raw_telegram_v5, objects=['EQUIPMENT_IDENTIFIER', 'ELECTRICITY_USED_TARIFF_1'])
+        DSMRElectricityProcessor(storage=storage)(next(reader))
+        assert storage.write.call_args.args[3] is None
+
+    def test_process_batch_writes_one_table(self, telegram):
+        storage = MagicMock()
+        DSMRElectricityProcessor(storage=storage).process_batch([telegram, telegram])
+        table, = storage.write_table.call_args.args
+        assert table.measurement == "electricity"
+        assert table.points() == [(
+            "electricity",
+            {"sn": "4530303334303034363639353537343136"},
+            {"t1": Decimal("1234.567"), "t2": Decimal("2345.678"), "current": Decimal("1.500"), "returned": Decimal("0.000")},
+            datetime(2020, 12, 31, 23, 0, tzinfo=timezone.utc),
+        )] * 2
+
+    def test_process_batch_logs_one_line(self, telegram, caplog):
+        DSMRElectricityProcessor().process_batch([telegram] * 3)
+        assert caplog.messages == ["electricity batch: 3 readings"]
+
 
 class TestDSMRGasProcessor:
     def test_returns_none(self, telegram):
@@ -116,6 +153,7 @@ class TestDSMRGasProcessor:
             "gas",
             {"sn": "4730303233353631323930333635383137"},
             {"reading": Decimal("1234.567")},
+            datetime(2020, 12, 31, 23, 0, tzinfo=timezone.utc),
         )
 
     def test_does_not_write_to_storage_when_none(self, telegram):
@@ -123,6 +161,11 @@ class TestDSMRGasProcessor:
         DSMRGasProcessor()(telegram)
         storage.write.assert_not_called()
 
+    def test_accepts_full_telegram(self, raw_telegram_v5):
+        storage = MagicMock()
+        DSMRGasProcessor(storage=storage)(next(DSMRv5RawReader(raw_telegram_v5, output='telegram')))
+        assert storage.write.call_args.args[2] == {"reading": Decimal("1234.567")}
+
     def test_no_output_for_non_gas_device(self, caplog):
         water_device = MagicMock()
         water_device.MBUS_DEVICE_TYPE.value = 7
@@ -132,6 +175,20 @@ class TestDSMRGasProcessor:
         assert caplog.messages == []
 
 
+class TestDSMRGasProcessorBatch:
+    def test_process_batch_writes_gas_table(self, telegram):
+        storage = MagicMock()
+        DSMRGasProcessor(storage=storage).process_batch([telegram, telegram])
+        table, = storage.write_table.call_args.args
+        assert (table.measurement, len(table), table.tags, table.fields) == ("gas", 2, ["sn"], ["reading"])
+
+    def test_process_batch_without_gas_device_writes_nothing(self, raw_telegram_v5):
+        storage = MagicMock()
+        reader = DSMRv5RawReader(raw_telegram_v5, objects=['EQUIPMENT_IDENTIFIER'])
+        DSMRGasProcessor(storage=storage).process_batch([next(reader)])
+        storage.write_table.assert_not_called()
+
+
 class TestChainProcessor:
     def test_calls_all_processors(self):
         a, b, c = MagicMock(), MagicMock(), MagicMock()
@@ -159,3 +216,157 @@ class TestChainProcessor:
         obj = object()
         ChainProcessor(p, p)(obj)
         assert received == [obj, obj]
+
+    def test_process_batch_calls_child_process_batch(self):
+        a, b = MagicMock(), MagicMock()
+        ChainProcessor(a, b).process_batch([1, 2])
+        a.process_batch.assert_called_once_with([1, 2])
+        b.process_batch.assert_called_once_with([1, 2])
+        a.assert_not_called()
+
+
+class TestParallelChainProcessor:
+    def test_calls_all_processors(self):
+        a, b = MagicMock(), MagicMock()
+        ChainProcessor(a, b, parallel=True)('data')
+        a.assert_called_once_with('data')
+        b.assert_called_once_with('data')
+
+    def test_process_batch_calls_all_processors(self):
+        a, b = MagicMock(), MagicMock()
+        ChainProcessor(a, b, parallel=True).process_batch([1, 2])
+        a.process_batch.assert_called_once_with([1, 2])
+        b.process_batch.assert_called_once_with([1, 2])
+
+    def test_runs_processors_concurrently(self):
+        barrier = threading.Barrier(2, timeout=2)
+        a = MagicMock(side_effect=lambda d: barrier.wait())
+        b = MagicMock(side_effect=lambda d: barrier.wait())
+        chain = ChainProcessor(a, b, parallel=True)
+        chain('data')
+        assert chain.errors == [0, 0]
+
+    def test_isolates_failing_processor(self, caplog):
+        a = MagicMock(side_effect=RuntimeError("boom"))
+        b = MagicMock()
+        chain = ChainProcessor(a, b, parallel=True)
+        chain('data')
+        b.assert_called_once_with('data')
+        assert chain.errors == [1, 0]
+        assert "MagicMock failed" in caplog.text
+
+    def test_nested_parallel_chains_do_not_starve(self):
+        barrier = threading.Barrier(40, timeout=5)
+        inner = [ChainProcessor(MagicMock(side_effect=lambda d: barrier.wait()), parallel=True) for _ in range(40)]
+        ChainProcessor(*inner, parallel=True)('data')
+        assert [chain.errors for chain in inner] == [[0]] * 40
+
+    def test_timeout_does_not_wait_for_slow_processor(self):
+        release = threading.Event()
+        slow = MagicMock(side_effect=lambda d: release.wait(2))
+        chain = ChainProcessor(slow, MagicMock(), parallel=True, timeout=0.05)
+        started = time.perf_counter()
+        chain('data')
+        assert time.perf_counter() - started < 1
+        assert chain.timeouts == [1, 0]
+        release.set()
+
+    def test_skips_processor_still_busy(self, caplog):
+        release = threading.Event()
+        slow = MagicMock(side_effect=lambda d: release.wait(2))
+        chain = ChainProcessor(slow, parallel=True, timeout=0.05)
+        chain('first')
+        chain('second')
+        release.set()
+        slow.assert_called_once_with('first')
+        assert chain.skipped == [1]
+        assert [r.levelname for r in caplog.records if "still busy" in r.message] == ["WARNING"]
+
+    def test_timeout_applies_per_child(self):
+        release = threading.Event()
+        stuck = MagicMock(side_effect=lambda d: release.wait(2))
+        slow = MagicMock(side_effect=lambda d: time.sleep(0.15))
+        chain = ChainProcessor(stuck, slow, parallel=True, timeout=0.2)
+        chain('data')
+        release.set()
+        assert chain.timeouts == [1, 0]
+
+    def test_close_shuts_down_pool_and_closes_children(self):
+        child = MagicMock()
+        chain = ChainProcessor(child, parallel=True)
+        chain('data')
+        chain.close()
+        child.close.assert_called_once()
+        assert chain._executor._shutdown
+
+    def test_collects_latency_per_processor(self):
+        slow = MagicMock(side_effect=lambda d: time.sleep(0.02))
+        chain = ChainProcessor(slow, MagicMock(), parallel=True)
+        chain('data')
+        slow_stats, fast_stats = chain.stats()
+        assert slow_stats['calls'] == 1
+        assert slow_stats['last_latency'] >= 0.02
+        assert fast_stats['last_latency'] < slow_stats['last_latency']
+
+    def test_sequential_mode_collects_latency(self):
+        chain = ChainProcessor(MagicMock(), MagicMock())
+        chain('data')
+        assert chain.calls == [1, 1]
+
+    def test_sequential_mode_propagates_errors(self):
+        chain = ChainProcessor(MagicMock(side_effect=RuntimeError("boom")), MagicMock())
+        with pytest.raises(RuntimeError):
+            chain('data')
+
+    def test_timeout_requires_parallel(self):
+        with pytest.raises(ValueError):
+            ChainProcessor(MagicMock(), timeout=1.0)
+
+
+class TestPointProcessor:
+    def test_writes_point_to_storage(self):
+        storage = MagicMock()
+        point = ("electricity", {"sn": "abc"}, {"t1": 1.0}, None)
+        assert PointProcessor(storage=storage)(point) is None
+        storage.write.assert_called_once_with(*point)
+
+    def test_without_storage_does_nothing(self):
+        assert PointProcessor()(("electricity", {}, {}, None)) is None
+
+    def test_process_batch_writes_batch(self):
+        storage = MagicMock()
+        points = [("electricity", {"sn": "abc"}, {"t1": 1.0}, None)] * 2
+        PointProcessor(storage=storage).process_batch(points)
+        storage.write_batch.assert_called_once_with(points)
+
+    def test_default_process_batch_calls_processor_per_item(self):
+        class Recording(NoneProcessor):
+            def __init__(self):
+                super().__init__()
+                self.received = []
+
+            def __call__(self, data) -> None:
+                self.received.append(data)
+
+        processor = Recording()
+        processor.process_batch([1, 2])
+        assert processor.received == [1, 2]
+
+
+class TestAsyncProcessorAdapter:
+    def test_calls_wrapped_processor(self):
+        inner = MagicMock(return_value=None)
+        asyncio.run(AsyncProcessorAdapter(inner)('data'))
+        inner.assert_called_once_with('data')
+
+    def test_returns_wrapped_result(self):
+        assert asyncio.run(AsyncProcessorAdapter(MagicMock(return_value=True))('data')) is True
+
+    def test_process_batch_calls_wrapped_process_batch(self):
+        inner = MagicMock()
+        asyncio.run(AsyncProcessorAdapter(inner).process_batch([1, 2]))
+        inner.process_batch.assert_called_once_with([1, 2])
+
+    def test_wrap_returns_async_processor_unchanged(self):
+        processor = AsyncProcessorAdapter(PassProcessor())
+        assert AsyncProcessorAdapter.wrap(processor) is processor
@@ -1,11 +1,31 @@
+import asyncio
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
 
-from dsmr_parser.objects import Telegram
+import pytest
+
+from dsmr import DSMRReading, Telegram, TelegramParser
 
 from reader.ZeroReader import ZeroReader
 from reader.RandomReader import RandomReader
 from reader.DelayReader import DelayReader
+from reader.PollSchedule import PollSchedule
 from reader.DSMRv5RawReader import DSMRv5RawReader
+from reader.DSMRv5SerialReader import DSMRv5SerialReader
+from reader.P1SerialReader import P1SerialReader
+from reader.P1ConnectionPool import P1ConnectionPool
+from reader.P1TcpReader import P1TcpReader
+from reader.AsyncP1TcpReader import AsyncP1TcpReader
+from reader.AsyncDelayReader import AsyncDelayReader
+from reader.BroadcastReader import BroadcastReader
+from reader.ParquetReader import ParquetReader
+from reader.SQLiteReader import SQLiteReader
+from reader.ReplayReader import ReplayReader
+from reader.AsyncReaderAdapter import AsyncReaderAdapter
+from processor.AsyncProcessorAdapter import AsyncProcessorAdapter
 
 
 class TestZeroReader:
@@ -26,6 +46,9 @@ class TestZeroReader:
         reader = ZeroReader()
         assert iter(reader) is reader
 
+    def test_read_batch_returns_size_values(self):
+        assert ZeroReader().read_batch(3) == [0.0, 0.0, 0.0]
+
 
 class TestRandomReader:
     def test_returns_float(self):
@@ -119,15 +142,75 @@ class TestDelayReader:
         reader = DelayReader(inner, delay=0)
         assert next(reader) == 0.0
 
+    @patch("reader.DelayReader.sleep")
+    def test_adaptive_mode_feeds_values_to_schedule(self, mock_sleep):
+        reader = DelayReader(ZeroReader(), delay=1.0, mode="adaptive", max_delay=8.0)
+        for _ in range(3):
+            next(reader)
+        assert reader.stats() == {"interval": 4.0, "late": 0}
+
     def test_is_iterator(self):
         inner = MagicMock()
         reader = DelayReader(inner)
         assert iter(reader) is reader
 
 
+class TestPollSchedule:
+    @patch("reader.PollSchedule.monotonic")
+    def test_rate_mode_subtracts_read_time(self, mock_monotonic):
+        mock_monotonic.side_effect = [0.0, 1.3, 2.9]
+        schedule = PollSchedule(1.0, mode="rate")
+        assert [schedule.wait(), schedule.wait(), schedule.wait()] == pytest.approx([1.0, 0.7, 0.1])
+        assert schedule.late == 0
+
+    @patch("reader.PollSchedule.monotonic")
+    def test_rate_mode_reads_immediately_when_late(self, mock_monotonic):
+        mock_monotonic.side_effect = [0.0, 3.5, 3.6]
+        schedule = PollSchedule(1.0, mode="rate")
+        assert [schedule.wait(), schedule.wait(), schedule.wait()] == pytest.approx([1.0, 0.0, 0.9])
+        assert schedule.late == 1
+
+    def test_adaptive_mode_backs_off_while_stable_and_tightens_on_change(self):
+        schedule = PollSchedule(1.0, mode="adaptive", max_delay=4.0)
+        intervals = []
+        for value in (5, 5, 5, 5, 9, 9):
+            schedule.update(value)
+            intervals.append(schedule.interval)
+        assert intervals == [1.0, 2.0, 4.0, 4.0, 2.0, 4.0]
+
+    def test_adaptive_mode_compares_fields_within_tolerance(self):
+        schedule = PollSchedule(1.0, mode="adaptive", fields=["t1"], tolerance=0.01)
+        schedule.update({"t1": 1.000, "timestamp": 1})
+        schedule.update({"t1": 1.005, "timestamp": 2})
+        assert schedule.interval == 2.0
+        schedule.update({"t1": 1.100, "timestamp": 3})
+        assert schedule.interval == 1.0
+
+    @patch("reader.PollSchedule.uniform", return_value=0.3)
+    def test_jitter_offsets_first_read_only(self, mock_uniform):
+        schedule = PollSchedule(1.0, jitter=0.5)
+        assert [schedule.wait(), schedule.wait()] == [1.3, 1.0]
+        mock_uniform.assert_called_once_with(0, 0.5)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"mode": "cron"},
+        {"delay": -1},
+        {"jitter": -1},
+        {"mode": "adaptive", "min_delay": 2.0},
+        {"mode": "adaptive", "factor": 1.0},
+    ])
+    def test_rejects_invalid_options(self, kwargs):
+        with pytest.raises(ValueError):
+            PollSchedule(**{"delay": 1.0, **kwargs})
+
+
 class TestDSMRv5RawReader:
-    def test_returns_telegram(self, raw_telegram_v5):
+    def test_returns_reading(self, raw_telegram_v5):
         reader = DSMRv5RawReader(raw_telegram_v5)
+        assert isinstance(next(reader), DSMRReading)
+
+    def test_returns_telegram(self, raw_telegram_v5):
+        reader = DSMRv5RawReader(raw_telegram_v5, output='telegram')
         assert isinstance(next(reader), Telegram)
 
     def test_returns_same_object_each_time(self, raw_telegram_v5):
@@ -139,19 +222,19 @@ class TestDSMRv5RawReader:
         assert iter(reader) is reader
 
     def test_parses_electricity_identifier(self, raw_telegram_v5):
-        reader = DSMRv5RawReader(raw_telegram_v5)
+        reader = DSMRv5RawReader(raw_telegram_v5, output='telegram')
         t = next(reader)
         assert t.EQUIPMENT_IDENTIFIER.value == '4530303334303034363639353537343136'
 
     def test_parses_electricity_tariff_1(self, raw_telegram_v5):
         from decimal import Decimal
-        reader = DSMRv5RawReader(raw_telegram_v5)
+        reader = DSMRv5RawReader(raw_telegram_v5, output='telegram')
         t = next(reader)
         assert t.ELECTRICITY_USED_TARIFF_1.value == Decimal('1234.567')
         assert t.ELECTRICITY_USED_TARIFF_1.unit == 'kWh'
 
     def test_parses_mbus_gas_device(self, raw_telegram_v5):
-        reader = DSMRv5RawReader(raw_telegram_v5)
+        reader = DSMRv5RawReader(raw_telegram_v5, output='telegram')
         t = next(reader)
         assert hasattr(t, 'MBUS_DEVICES')
         assert len(t.MBUS_DEVICES) == 1
@@ -160,8 +243,649 @@ class TestDSMRv5RawReader:
 
     def test_parses_gas_reading(self, raw_telegram_v5):
         from decimal import Decimal
-        reader = DSMRv5RawReader(raw_telegram_v5)
+        reader = DSMRv5RawReader(raw_telegram_v5, output='telegram')
         t = next(reader)
         device = t.MBUS_DEVICES[0]
         assert device.MBUS_METER_READING.value == Decimal('1234.567')
         assert device.MBUS_METER_READING.unit == 'm3'
+
+    def test_parses_only_requested_objects(self, raw_telegram_v5):
+        t = next(DSMRv5RawReader(raw_telegram_v5, objects=['EQUIPMENT_IDENTIFIER'], output='telegram'))
+        assert t.EQUIPMENT_IDENTIFIER.value == '4530303334303034363639353537343136'
+        assert not hasattr(t, 'ELECTRICITY_USED_TARIFF_1')
+        assert t.MBUS_DEVICES == []
+
+    def test_reading_has_electricity_fields(self, raw_telegram_v5):
+        from decimal import Decimal
+        reading = next(DSMRv5RawReader(raw_telegram_v5))
+        assert reading.sn == '4530303334303034363639353537343136'
+        assert reading.t1 == Decimal('1234.567')
+        assert reading.returned == Decimal('0.000')
+
+    def test_reading_indexes_mbus_devices_by_type(self, raw_telegram_v5):
+        from decimal import Decimal
+        reading = next(DSMRv5RawReader(raw_telegram_v5))
+        assert reading.mbus[3].sn == '4730303233353631323930333635383137'
+        assert reading.mbus[3].reading == Decimal('1234.567')
+
+
+class TestDSMRv5SerialReader:
+    @patch("dsmr_parser.clients.SerialReader")
+    def test_skips_telegrams_that_failed_to_parse(self, mock_serial_reader):
+        telegram = MagicMock()
+        mock_serial_reader.return_value.read_as_object.return_value = iter([None, telegram])
+        assert next(DSMRv5SerialReader('/dev/null')) is telegram
+
+    @patch("dsmr_parser.clients.SerialReader")
+    def test_uses_native_parser(self, mock_serial_reader):
+        reader = DSMRv5SerialReader('/dev/null')
+        assert isinstance(reader.reader.telegram_parser, TelegramParser)
+        assert reader.reader.telegram_parser.errors == 'skip'
+        assert reader.reader.telegram_parser.output == 'reading'
+
+
+class TestParquetReader:
+    START = datetime(2024, 1, 15, 23, 59, 0, tzinfo=timezone.utc)
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        from storage.ParquetStorage import ParquetStorage
+
+        storage = ParquetStorage(str(tmp_path))
+        for i in range(4):
+            storage.write("electricity", {"sn": "abc"}, {"t1": float(i)}, self.START + timedelta(seconds=30 * i))
+        storage.write("gas", {"sn": "g1"}, {"reading": 12.5}, self.START + timedelta(seconds=45))
+        storage.close()
+        return tmp_path
+
+    def test_replays_points_in_time_order(self, archive):
+        points = list(ParquetReader(str(archive)))
+        assert [(p[0], p[3]) for p in points] == [
+            ("electricity", self.START),
+            ("electricity", self.START + timedelta(seconds=30)),
+            ("gas", self.START + timedelta(seconds=45)),
+            ("electricity", self.START + timedelta(seconds=60)),
+            ("electricity", self.START + timedelta(seconds=90)),
+        ]
+        assert points[2][1:3] == ({"sn": "g1"}, {"reading": 12.5})
+
+    def test_filters_by_measurement(self, archive):
+        assert {p[0] for p in ParquetReader(str(archive), measurements=["gas"])} == {"gas"}
+
+    def test_filters_by_time_range(self, archive):
+        reader = ParquetReader(str(archive), measurements=["electricity"], start="2024-01-16T00:00:00", end=self.START + timedelta(seconds=90))
+        assert [p[2]["t1"] for p in reader] == [2.0]
+
+    def test_table_returns_filtered_columns(self, archive):
+        table = ParquetReader(str(archive), start=self.START + timedelta(seconds=30)).table("electricity")
+        assert table.column("t1").to_pylist() == [1.0, 2.0, 3.0]
+
+    def test_skips_unreadable_files(self, archive):
+        (archive / "measurement=gas" / "date=2024-01-15" / "part-00001.parquet").write_bytes(b"PAR1")
+        assert len(list(ParquetReader(str(archive), measurements=["gas"]))) == 1
+
+    def test_empty_archive_stops(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        with pytest.raises(StopIteration):
+            next(ParquetReader(str(tmp_path)))
+
+
+class TestSQLiteReader:
+    START = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+    @pytest.fixture
+    def database(self, tmp_path):
+        from storage.SQLiteStorage import SQLiteStorage
+
+        path = str(tmp_path / "meteread.db")
+        storage = SQLiteStorage(path)
+        for i in range(3):
+            storage.write("electricity", {"sn": "abc"}, {"t1": float(i)}, self.START + timedelta(minutes=i))
+        storage.write("gas", {"sn": "g1"}, {"reading": 12.5}, self.START + timedelta(seconds=90))
+        storage.close()
+        return path
+
+    def test_replays_points_in_time_order(self, database):
+        assert [(p[0], p[3]) for p in SQLiteReader(database)] == [
+            ("electricity", self.START),
+            ("electricity", self.START + timedelta(minutes=1)),
+            ("gas", self.START + timedelta(seconds=90)),
+            ("electricity", self.START + timedelta(minutes=2)),
+        ]
+
+    def test_filters_by_measurement_and_range(self, database):
+        reader = SQLiteReader(database, measurements=["electricity"], start=self.START + timedelta(minutes=1))
+        assert [p[2]["t1"] for p in reader] == [1.0, 2.0]
+
+
+class TestReplayReader:
+    @pytest.fixture
+    def capture(self, tmp_path, raw_telegram_v5):
+        telegrams = [raw_telegram_v5.replace("210101000000W", f"2101010000{second:02d}W") for second in (0, 10, 30)]
+        path = tmp_path / "p1.log"
+        path.write_bytes(("noise\r\n" + telegrams[0] + telegrams[1][:80] + telegrams[1] + telegrams[2]).encode())
+        return path
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        from storage.CsvStorage import CsvStorage
+
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path))
+        storage.write("electricity", {"sn": "abc"}, {"t1": 1234.567, "tariff": 2}, datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc))
+        storage.write("electricity", {"sn": "abc"}, {"t1": 1234.568, "tariff": 1}, datetime(2024, 1, 15, 12, 1, tzinfo=timezone.utc))
+        storage.close()
+        return path
+
+    def test_streams_telegrams_from_capture(self, capture):
+        reader = ReplayReader(str(capture), validate_checksum=False)
+        readings = list(reader)
+        assert [r.timestamp.second for r in readings] == [0, 10, 30]
+        assert all(isinstance(r, DSMRReading) for r in readings)
+        assert reader.skipped == 1
+
+    def test_streams_telegram_objects(self, capture):
+        telegram = next(ReplayReader(str(capture), validate_checksum=False, output="telegram"))
+        assert isinstance(telegram, Telegram)
+
+    def test_skips_telegrams_with_bad_checksum(self, capture):
+        assert list(ReplayReader(str(capture))) == []
+
+    def test_skips_telegram_with_corrupted_byte(self, tmp_path, raw_telegram_v5):
+        from dsmr.TelegramParser import crc16
+
+        body = raw_telegram_v5[:raw_telegram_v5.index("!") + 1]
+        signed = raw_telegram_v5.replace("!0000", f"!{crc16(body.encode()):04X}").encode()
+        path = tmp_path / "p1.log"
+        path.write_bytes(signed.replace(b"1234.567", b"1234.5\xff7") + signed)
+        reader = ReplayReader(str(path))
+        assert len(list(reader)) == 1
+        assert reader.skipped == 1
+
+    def test_streams_points_from_csv(self, archive):
+        points = list(ReplayReader(str(archive)))
+        assert points[0] == ("electricity", {"sn": "abc"}, {"t1": 1234.567, "tariff": 2}, datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc))
+        assert points[1][3] == datetime(2024, 1, 15, 12, 1, tzinfo=timezone.utc)
+
+    def test_round_trips_mixed_measurements_from_csv(self, tmp_path):
+        from storage.CsvStorage import CsvStorage
+
+        timestamp = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+        points = [
+            ("electricity", {"sn": "abc"}, {"t1": 1234.567, "t2": 2345.678}, timestamp),
+            ("gas", {"sn": "def"}, {"reading": 5}, timestamp),
+            ("electricity", {"sn": "abc"}, {"t1": 1234.568, "t2": 2345.678}, timestamp),
+        ]
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path))
+        storage.write_batch(points[:2])
+        storage.close()
+        storage = CsvStorage(str(path))
+        storage.write_batch(points[2:])
+        storage.close()
+        assert list(ReplayReader(str(path))) == points
+
+    def test_csv_without_header_raises(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        path.write_text("2024-01-15T12:00:00+00:00,electricity,abc,1.0\n")
+        with pytest.raises(ValueError):
+            next(ReplayReader(str(path)))
+
+    def test_empty_file_stops(self, tmp_path):
+        path = tmp_path / "p1.log"
+        path.write_bytes(b"")
+        with pytest.raises(StopIteration):
+            next(ReplayReader(str(path)))
+
+    @patch("reader.ReplayReader.sleep")
+    def test_replays_as_fast_as_possible_by_default(self, mock_sleep, capture):
+        list(ReplayReader(str(capture), validate_checksum=False))
+        mock_sleep.assert_not_called()
+
+    @patch("reader.ReplayReader.monotonic", return_value=100.0)
+    @patch("reader.ReplayReader.sleep")
+    def test_scales_original_intervals(self, mock_sleep, mock_monotonic, capture):
+        list(ReplayReader(str(capture), validate_checksum=False, speed=10.0))
+        assert [c.args[0] for c in mock_sleep.call_args_list] == pytest.approx([1.0, 3.0])
+
+    @pytest.mark.parametrize("kwargs", [{"speed": 0}, {"format": "json"}])
+    def test_rejects_invalid_arguments(self, tmp_path, kwargs):
+        with pytest.raises(ValueError):
+            ReplayReader(str(tmp_path / "p1.log"), **kwargs)
+
+
+class FakePort:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks and isinstance(self.chunks[0], bytes) else 0
+
+    def read(self, size):
+        if not self.chunks:
+            return b""
+        chunk = self.chunks[0]
+        if isinstance(chunk, Exception):
+            self.chunks.pop(0)
+            raise chunk
+        self.chunks[0] = chunk[size:]
+        if not self.chunks[0]:
+            self.chunks.pop(0)
+        return chunk[:size]
+
+    def close(self):
+        self.closed = True
+
+
+class TestP1SerialReader:
+    @pytest.fixture
+    def signed(self, raw_telegram_v5):
+        from dsmr.TelegramParser import crc16
+
+        body = raw_telegram_v5[:raw_telegram_v5.index("!") + 1]
+        return raw_telegram_v5.replace("!0000", f"!{crc16(body.encode()):04X}").encode()
+
+    @pytest.fixture
+    def serial_for_url(self):
+        pytest.importorskip("serial")
+        with patch("serial.serial_for_url") as serial_for_url:
+            yield serial_for_url
+
+    def test_reads_telegrams_split_across_chunks(self, serial_for_url, signed):
+        serial_for_url.return_value = FakePort([signed[:100], signed[100:] + signed[:50], signed[50:]])
+        reader = P1SerialReader("/dev/ttyUSB0")
+        assert isinstance(next(reader), DSMRReading)
+        assert isinstance(next(reader), DSMRReading)
+        assert reader.telegrams == 2
+        serial_for_url.assert_called_once_with("/dev/ttyUSB0", baudrate=115200, timeout=1.0)
+
+    def test_skips_and_counts_bad_frames(self, serial_for_url, signed, raw_telegram_v5):
+        serial_for_url.return_value = FakePort([b"noise" + signed[:200] + raw_telegram_v5.encode() + signed])
+        reader = P1SerialReader("/dev/ttyUSB0", output="telegram")
+        assert isinstance(next(reader), Telegram)
+        assert reader.bad_frames == 2
+        assert reader.stats()["bad_frames"] == 2
+
+    def test_skips_frame_with_corrupted_byte(self, serial_for_url, signed):
+        corrupted = signed.replace(b"1234.567", b"1234.5\xff7")
+        serial_for_url.return_value = FakePort([corrupted + signed])
+        reader = P1SerialReader("/dev/ttyUSB0", output="telegram")
+        assert isinstance(next(reader), Telegram)
+        assert reader.bad_frames == 1
+
+    @patch("reader.P1SerialReader.sleep")
+    def test_reopens_device_after_disconnect(self, mock_sleep, serial_for_url, signed):
+        first = FakePort([signed[:300], OSError("device disconnected")])
+        second = FakePort([signed])
+        serial_for_url.side_effect = [OSError("no such device"), first, second]
+        reader = P1SerialReader("/dev/ttyUSB0", backoff=0.5)
+        assert isinstance(next(reader), DSMRReading)
+        assert first.closed
+        assert reader.reconnects == 2
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 0.5]
+
+    @patch("reader.P1SerialReader.sleep")
+    def test_backs_off_while_device_is_missing(self, mock_sleep, serial_for_url, signed):
+        serial_for_url.side_effect = [OSError(), OSError(), OSError(), FakePort([signed])]
+        next(P1SerialReader("/dev/ttyUSB0", backoff=1.0, max_backoff=3.0))
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0, 3.0]
+
+
+class TelegramServer:
+    def __init__(self, telegram, interval=0.01):
+        self.telegram = telegram
+        self.interval = interval
+        self.accepted = 0
+        self.clients = []
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            self.accepted += 1
+            self.clients.append(client)
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client):
+        try:
+            while True:
+                client.sendall(self.telegram[:50])
+                client.sendall(self.telegram[50:])
+                time.sleep(self.interval)
+        except OSError:
+            pass
+
+    def drop(self):
+        for client in self.clients:
+            client.close()
+        self.clients = []
+
+    def close(self):
+        self.listener.close()
+        self.drop()
+
+
+class TestP1TcpReader:
+    @pytest.fixture
+    def signed(self, raw_telegram_v5):
+        from dsmr.TelegramParser import crc16
+
+        body = raw_telegram_v5[:raw_telegram_v5.index("!") + 1]
+        return raw_telegram_v5.replace("!0000", f"!{crc16(body.encode()):04X}").encode()
+
+    @pytest.fixture
+    def server(self, signed):
+        server = TelegramServer(signed)
+        yield server
+        server.close()
+
+    @pytest.fixture
+    def pool(self):
+        pool = P1ConnectionPool(backoff=0.01, max_backoff=0.05)
+        yield pool
+        pool.close()
+
+    def test_reads_telegrams_from_server(self, server, pool):
+        reader = P1TcpReader("127.0.0.1", server.port, pool=pool)
+        assert isinstance(next(reader), DSMRReading)
+        assert isinstance(next(reader), DSMRReading)
+        assert reader.telegrams == 2
+        reader.close()
+
+    def test_readers_share_one_connection_per_endpoint(self, server, pool):
+        first = P1TcpReader("127.0.0.1", server.port, pool=pool)
+        second = P1TcpReader("127.0.0.1", server.port, output="telegram", pool=pool)
+        assert isinstance(next(first), DSMRReading)
+        assert isinstance(next(second), Telegram)
+        assert server.accepted == 1
+        assert pool.stats()[0]["subscribers"] == 2
+
+    def test_one_pool_serves_many_endpoints(self, signed, pool):
+        servers = [TelegramServer(signed) for _ in range(5)]
+        try:
+            readers = [P1TcpReader("127.0.0.1", server.port, pool=pool) for server in servers]
+            assert all(isinstance(next(reader), DSMRReading) for reader in readers)
+            assert len(pool.stats()) == 5
+        finally:
+            for server in servers:
+                server.close()
+
+    def test_reconnects_after_server_drops_connection(self, server, pool):
+        reader = P1TcpReader("127.0.0.1", server.port, pool=pool)
+        next(reader)
+        server.drop()
+        deadline = time.monotonic() + 5
+        while server.accepted < 2 and time.monotonic() < deadline:
+            next(reader)
+        assert server.accepted == 2
+        assert pool.stats()[0]["reconnects"] >= 1
+
+    def test_retries_until_server_is_listening(self, signed, pool):
+        listener = socket.create_server(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+        listener.close()
+        frames = []
+        pool.subscribe("127.0.0.1", port, frames.append)
+        time.sleep(0.1)
+        assert pool.stats()[0]["connected"] is False
+        assert pool.stats()[0]["reconnects"] >= 2
+
+        server = TelegramServer(signed)
+        pool.unsubscribe("127.0.0.1", port, frames.append)
+        pool.subscribe("127.0.0.1", server.port, frames.append)
+        deadline = time.monotonic() + 5
+        while not frames and time.monotonic() < deadline:
+            time.sleep(0.01)
+        server.close()
+        assert frames[0] == signed
+
+    @pytest.fixture
+    def noisy(self, signed):
+        server = TelegramServer(signed.replace(b"1234.567", b"1234.5\xff7") + signed)
+        yield server
+        server.close()
+
+    def test_skips_frame_with_corrupted_byte(self, noisy, pool):
+        reader = P1TcpReader("127.0.0.1", noisy.port, output="telegram", pool=pool)
+        assert isinstance(next(reader), Telegram)
+        assert isinstance(next(reader), Telegram)
+        assert reader.invalid >= 1
+        reader.close()
+
+    def test_async_reader_skips_frame_with_corrupted_byte(self, noisy, pool):
+        async def read():
+            reader = AsyncP1TcpReader("127.0.0.1", noisy.port, output="telegram", pool=pool)
+            items = [await anext(reader), await anext(reader)]
+            reader.close()
+            return items, reader.invalid
+
+        items, invalid = asyncio.run(read())
+        assert all(isinstance(item, Telegram) for item in items)
+        assert invalid >= 1
+
+    def test_failing_subscriber_does_not_stop_others(self, server, pool):
+        def fail(frame):
+            raise RuntimeError("boom")
+
+        frames = []
+        pool.subscribe("127.0.0.1", server.port, fail)
+        pool.subscribe("127.0.0.1", server.port, frames.append)
+        deadline = time.monotonic() + 5
+        while len(frames) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(frames) >= 2
+        assert pool.stats()[0]["reconnects"] == 0
+
+    def test_slow_lookup_does_not_block_other_endpoints(self, server, pool):
+        getaddrinfo = socket.getaddrinfo
+        release = threading.Event()
+
+        def lookup(host, *args, **kwargs):
+            if host == "slow.example":
+                release.wait(5)
+            return getaddrinfo("127.0.0.1", *args, **kwargs)
+
+        frames = []
+        with patch("socket.getaddrinfo", side_effect=lookup):
+            pool.subscribe("slow.example", server.port, frames.append)
+            pool.subscribe("127.0.0.1", server.port, frames.append)
+            deadline = time.monotonic() + 5
+            while not frames and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert frames and server.accepted == 1
+            release.set()
+            while server.accepted < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert server.accepted == 2
+
+    def test_drops_oldest_frame_when_queue_is_full(self, pool):
+        reader = P1TcpReader("127.0.0.1", 1, maxsize=2, pool=pool)
+        for frame in (b"1", b"2", b"3"):
+            reader._receive(frame)
+        assert reader.dropped == 1
+        assert reader.stats()["queued"] == 2
+
+    def test_unsubscribing_last_reader_closes_connection(self, server, pool):
+        reader = P1TcpReader("127.0.0.1", server.port, pool=pool)
+        next(reader)
+        reader.close()
+        deadline = time.monotonic() + 5
+        while pool.stats() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.stats() == []
+
+    def test_async_reader_reads_telegrams(self, server, pool):
+        async def read():
+            reader = AsyncP1TcpReader("127.0.0.1", server.port, pool=pool)
+            items = [await anext(reader), await anext(reader)]
+            reader.close()
+            return items
+
+        assert all(isinstance(item, DSMRReading) for item in asyncio.run(read()))
+
+    def test_adapter_wraps_tcp_reader_without_a_thread(self, pool):
+        reader = AsyncReaderAdapter.wrap(P1TcpReader("10.0.0.5", 2001, output="telegram", maxsize=5, pool=pool))
+        assert isinstance(reader, AsyncP1TcpReader)
+        assert (reader.host, reader.port, reader.maxsize, reader.pool) == ("10.0.0.5", 2001, 5, pool)
+
+    def test_rejects_empty_queue(self):
+        with pytest.raises(ValueError):
+            P1TcpReader("127.0.0.1", 2001, maxsize=0)
+
+
+class TestBroadcastReader:
+    @pytest.fixture
+    def source(self):
+        source = MagicMock()
+        source.__next__ = MagicMock(side_effect=range(100))
+        return source
+
+    def test_every_subscriber_gets_every_value(self, source):
+        broadcast = BroadcastReader(source)
+        a, b = broadcast.subscribe(), broadcast.subscribe()
+        assert [next(a), next(a)] == [0, 1]
+        assert [next(b), next(b)] == [0, 1]
+
+    def test_reads_source_once_per_value(self, source):
+        broadcast = BroadcastReader(source)
+        a, b = broadcast.subscribe(), broadcast.subscribe()
+        next(a)
+        next(b)
+        assert source.__next__.call_count == 1
+
+    def test_shares_the_same_object(self):
+        obj = object()
+        source = MagicMock()
+        source.__next__ = MagicMock(return_value=obj)
+        broadcast = BroadcastReader(source)
+        a, b = broadcast.subscribe(), broadcast.subscribe()
+        assert next(a) is next(b) is obj
+
+    def test_slow_subscriber_drops_oldest(self, source):
+        broadcast = BroadcastReader(source, maxsize=2)
+        fast, slow = broadcast.subscribe(), broadcast.subscribe()
+        for _ in range(5):
+            next(fast)
+        assert slow.dropped == 3
+        assert [next(slow), next(slow)] == [3, 4]
+
+    def test_subscriber_with_buffered_values_does_not_read_source(self, source):
+        broadcast = BroadcastReader(source)
+        a, b = broadcast.subscribe(), broadcast.subscribe()
+        next(a)
+        next(a)
+        calls = source.__next__.call_count
+        next(b)
+        assert source.__next__.call_count == calls
+
+    def test_subscribe_uses_own_maxsize(self, source):
+        broadcast = BroadcastReader(source, maxsize=2)
+        assert broadcast.subscribe(maxsize=5).buffer.maxlen == 5
+
+    def test_unsubscribed_reader_stops_receiving(self, source):
+        broadcast = BroadcastReader(source)
+        a, b = broadcast.subscribe(), broadcast.subscribe()
+        broadcast.unsubscribe(b)
+        next(a)
+        assert len(b.buffer) == 0
+
+    def test_propagates_stop_iteration(self):
+        source = MagicMock()
+        source.__next__ = MagicMock(side_effect=StopIteration)
+        subscriber = BroadcastReader(source).subscribe()
+        try:
+            next(subscriber)
+            assert False, "Expected StopIteration"
+        except StopIteration:
+            pass
+
+    def test_subscriber_is_iterator(self, source):
+        subscriber = BroadcastReader(source).subscribe()
+        assert iter(subscriber) is subscriber
+
+
+class TestAsyncReaderAdapter:
+    def test_returns_wrapped_reader_value(self):
+        reader = AsyncReaderAdapter(ZeroReader())
+        assert asyncio.run(anext(reader)) == 0.0
+
+    def test_raises_stop_async_iteration_when_exhausted(self):
+        inner = MagicMock()
+        inner.__next__ = MagicMock(side_effect=StopIteration)
+        reader = AsyncReaderAdapter(inner)
+        try:
+            asyncio.run(anext(reader))
+            assert False, "Expected StopAsyncIteration"
+        except StopAsyncIteration:
+            pass
+
+    def test_wrap_returns_async_reader_unchanged(self):
+        reader = AsyncDelayReader(AsyncReaderAdapter(ZeroReader()))
+        assert AsyncReaderAdapter.wrap(reader) is reader
+
+    def test_wrap_converts_delay_reader(self):
+        reader = AsyncReaderAdapter.wrap(DelayReader(ZeroReader(), delay=3.0))
+        assert isinstance(reader, AsyncDelayReader)
+        assert isinstance(reader.reader, AsyncReaderAdapter)
+
+    def test_wrap_keeps_delay_reader_schedule(self):
+        delay_reader = DelayReader(ZeroReader(), delay=3.0, mode="rate", jitter=1.0)
+        assert AsyncReaderAdapter.wrap(delay_reader).schedule is delay_reader.schedule
+
+    def test_is_async_iterator(self):
+        reader = AsyncReaderAdapter(ZeroReader())
+        assert reader.__aiter__() is reader
+
+    def test_blocking_readers_do_not_hold_the_default_executor(self):
+        release = threading.Event()
+
+        class BlockingReader(ZeroReader):
+            def __next__(self):
+                release.wait(5)
+                return 1.0
+
+        processor = MagicMock()
+
+        async def run():
+            readers = [asyncio.ensure_future(anext(AsyncReaderAdapter(BlockingReader()))) for _ in range(40)]
+            await asyncio.sleep(0.05)
+            await asyncio.wait_for(AsyncProcessorAdapter(processor)("data"), 2)
+            release.set()
+            return await asyncio.gather(*readers)
+
+        assert asyncio.run(run()) == [1.0] * 40
+        processor.assert_called_once_with("data")
+
+    def test_propagates_reader_errors(self):
+        inner = MagicMock()
+        inner.__next__ = MagicMock(side_effect=OSError("device gone"))
+        with pytest.raises(OSError):
+            asyncio.run(anext(AsyncReaderAdapter(inner)))
+
+    def test_read_batch_stops_at_exhausted_reader(self):
+        inner = MagicMock()
+        inner.read_batch.return_value = [1.0]
+        assert asyncio.run(AsyncReaderAdapter(inner).read_batch(5)) == [1.0]
+        inner.read_batch.assert_called_once_with(5)
+
+
+class TestAsyncDelayReader:
+    @patch("reader.AsyncDelayReader.asyncio.sleep")
+    def test_sleeps_with_configured_delay(self, mock_sleep):
+        reader = AsyncDelayReader(AsyncReaderAdapter(ZeroReader()), delay=2.5)
+        assert asyncio.run(anext(reader)) == 0.0
+        mock_sleep.assert_called_once_with(2.5)
+
+    @patch("reader.AsyncDelayReader.asyncio.sleep")
+    def test_default_delay_is_one_second(self, mock_sleep):
+        reader = AsyncDelayReader(AsyncReaderAdapter(ZeroReader()))
+        asyncio.run(anext(reader))
+        mock_sleep.assert_called_once_with(1.0)
@@ -1,12 +1,30 @@
+import asyncio
 import csv
+import sqlite3
+import threading
+import time
 from datetime import datetime, timezone
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from metrics import Metrics
 from storage.AbstractStorage import AbstractStorage
+from storage.AggregateStorage import AggregateStorage
+from storage.AsyncStorageAdapter import AsyncStorageAdapter
 from storage.CsvStorage import CsvStorage
+from storage.DeadbandStorage import DeadbandStorage
+from storage.FanoutStorage import FanoutStorage
+from storage.ForwardingStorage import ForwardingStorage
 from storage.InfluxDBStorage import InfluxDBStorage
+from storage.InstrumentedStorage import InstrumentedStorage
+from storage.ParquetStorage import ParquetStorage
+from storage.PointTable import PointTable
+from storage.QueuedStorage import QueuedStorage
+from storage.SegmentLog import SegmentLog
+from storage.SQLiteStorage import SQLiteStorage
+from storage.SpoolStorage import SpoolStorage
 
 TIMESTAMP = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
 MEASUREMENT = "electricity"
@@ -27,6 +45,57 @@ class TestAbstractStorage:
             Incomplete()
 
 
+class TestAbstractStorageWriteBatch:
+    def test_default_write_batch_calls_write_per_point(self):
+        class Recording(AbstractStorage):
+            def __init__(self):
+                self.points = []
+
+            def write(self, measurement, tags, fields, timestamp=None):
+                self.points.append((measurement, tags, fields, timestamp))
+
+        storage = Recording()
+        points = [(MEASUREMENT, TAGS, FIELDS, TIMESTAMP), ("gas", TAGS, {"reading": 1.0}, TIMESTAMP)]
+        storage.write_batch(points)
+        assert storage.points == points
+
+
+class TestPointTable:
+    def test_from_columns_round_trips_points(self):
+        table = PointTable.from_columns(
+            MEASUREMENT,
+            [TIMESTAMP, TIMESTAMP],
+            {"sn": ["abc123", None]},
+            {"t1": [Decimal("1.5"), None], "t2": [2.0, 3.0]},
+        )
+        assert (len(table), table.tags, table.fields) == (2, ["sn"], ["t1", "t2"])
+        assert table.points() == [
+            (MEASUREMENT, {"sn": "abc123"}, {"t1": Decimal("1.5"), "t2": 2.0}, TIMESTAMP),
+            (MEASUREMENT, {}, {"t2": 3.0}, TIMESTAMP),
+        ]
+
+    def test_from_columns_fills_missing_timestamps(self):
+        before = datetime.now(timezone.utc)
+        (_, _, _, timestamp), = PointTable.from_columns(MEASUREMENT, [None], {}, {"t1": [1.0]}).points()
+        assert before <= timestamp <= datetime.now(timezone.utc)
+
+    def test_reads_tags_from_schema_metadata(self):
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP], {"sn": ["abc123"]}, {"t1": [1.0]})
+        assert PointTable(MEASUREMENT, table.table.replace_schema_metadata({b"meteread.tags": b'["sn"]'})).tags == ["sn"]
+
+    def test_requires_timestamp_column(self):
+        import pyarrow as pa
+
+        with pytest.raises(ValueError):
+            PointTable(MEASUREMENT, pa.table({"t1": [1.0]}))
+
+    def test_default_write_table_writes_points(self):
+        storage = MagicMock(spec=AbstractStorage)
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP], {"sn": ["abc123"]}, {"t1": [1.0]})
+        AbstractStorage.write_table(storage, table)
+        storage.write_batch.assert_called_once_with([(MEASUREMENT, TAGS, {"t1": 1.0}, TIMESTAMP)])
+
+
 class TestCsvStorage:
     def test_creates_file_on_first_write(self, tmp_path):
         path = tmp_path / "readings.csv"
@@ -76,11 +145,157 @@ class TestCsvStorage:
         result = CsvStorage(str(path)).write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
         assert result is None
 
+    def test_write_table_matches_write(self, tmp_path):
+        points = [(MEASUREMENT, TAGS, FIELDS, TIMESTAMP), (MEASUREMENT, TAGS, {"t1": 1.5, "t2": 2.5}, TIMESTAMP)]
+        CsvStorage(str(tmp_path / "points.csv")).write_batch(points)
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP] * 2, {"sn": ["abc123"] * 2}, {"t1": [1234.567, 1.5], "t2": [2345.678, 2.5]})
+        storage = CsvStorage(str(tmp_path / "table.csv"))
+        storage.write_table(table)
+        storage.write_table(table)
+        with open(tmp_path / "points.csv") as f:
+            expected = list(csv.DictReader(f))
+        with open(tmp_path / "table.csv") as f:
+            assert list(csv.DictReader(f)) == expected * 2
+
+
+    def test_write_table_repeats_header_when_layout_changes(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path))
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write_table(PointTable.from_columns("gas", [TIMESTAMP], {"sn": ["abc123"]}, {"reading": [12.5]}))
+        storage.write("gas", TAGS, {"reading": 12.6}, TIMESTAMP)
+        storage.write_table(PointTable.from_columns(MEASUREMENT, [TIMESTAMP], {"sn": ["abc123"]}, {"t1": [1.0], "t2": [2.0]}))
+        lines = path.read_text().splitlines()
+        assert [line for line in lines if line.startswith("timestamp")] == [
+            "timestamp,measurement,sn,t1,t2",
+            "timestamp,measurement,sn,reading",
+            "timestamp,measurement,sn,t1,t2",
+        ]
+        assert len(lines) == 7
+
+
+class TestCsvStorageBuffering:
+    def test_rejects_unknown_fsync_policy(self, tmp_path):
+        with pytest.raises(ValueError):
+            CsvStorage(str(tmp_path / "readings.csv"), fsync="sometimes")
+
+    def test_rejects_buffer_size_below_one(self, tmp_path):
+        with pytest.raises(ValueError):
+            CsvStorage(str(tmp_path / "readings.csv"), buffer_size=0)
+
+    def test_buffers_rows_until_buffer_is_full(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path), buffer_size=3)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert not path.exists()
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        with open(path) as f:
+            assert len(f.readlines()) == 4
+
+    def test_flushes_when_oldest_row_is_stale(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path), buffer_size=100, flush_interval=5.0)
+        with patch("storage.CsvStorage.monotonic", side_effect=[0.0, 1.0, 6.0]):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            assert not path.exists()
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        with open(path) as f:
+            assert len(f.readlines()) == 3
+
+    def test_close_flushes_buffered_rows(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path), buffer_size=100)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        with open(path) as f:
+            assert len(f.readlines()) == 2
+
+    def test_keeps_file_open_between_writes(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path))
+        with patch("storage.CsvStorage.open", create=True, wraps=open) as mock_open:
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        mock_open.assert_called_once()
+
+    def test_does_not_repeat_header_for_existing_file(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        CsvStorage(str(path)).write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        CsvStorage(str(path)).write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        with open(path) as f:
+            assert len(f.readlines()) == 3
+
+    def test_writes_header_when_layout_changes(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path))
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write("gas", TAGS, {"reading": 12.5}, TIMESTAMP)
+        storage.write("gas", TAGS, {"reading": 12.6}, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        lines = path.read_text().splitlines()
+        assert lines[0] == lines[5] == "timestamp,measurement,sn,t1,t2"
+        assert lines[2] == "timestamp,measurement,sn,reading"
+        assert len(lines) == 7
+
+    def test_continues_with_last_header_of_existing_file(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path))
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write("gas", TAGS, {"reading": 12.5}, TIMESTAMP)
+        storage.close()
+        storage = CsvStorage(str(path))
+        storage.write("gas", TAGS, {"reading": 12.6}, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        assert [line.split(",")[0] for line in path.read_text().splitlines()].count("timestamp") == 3
+
+    def test_fsync_on_flush(self, tmp_path):
+        storage = CsvStorage(str(tmp_path / "readings.csv"), fsync="flush")
+        with patch("storage.CsvStorage.os.fsync") as mock_fsync:
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        mock_fsync.assert_called_once()
+
+    def test_no_fsync_by_default(self, tmp_path):
+        storage = CsvStorage(str(tmp_path / "readings.csv"))
+        with patch("storage.CsvStorage.os.fsync") as mock_fsync:
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            storage.close()
+        mock_fsync.assert_not_called()
+
+    def test_rotates_daily(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path), rotate_daily=True)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(day=16))
+        storage.close()
+        with open(tmp_path / "readings.csv.2024-01-15") as f:
+            assert next(csv.DictReader(f))["timestamp"] == TIMESTAMP.isoformat()
+        with open(path) as f:
+            assert next(csv.DictReader(f))["timestamp"] == TIMESTAMP.replace(day=16).isoformat()
+
+    def test_rotates_by_size(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path), max_bytes=1)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert (tmp_path / "readings.csv.1").exists()
+        assert (tmp_path / "readings.csv.2").exists()
+        assert not path.exists()
+
+    def test_rotated_files_start_with_header(self, tmp_path):
+        path = tmp_path / "readings.csv"
+        storage = CsvStorage(str(path), max_bytes=1)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        with open(tmp_path / "readings.csv.2") as f:
+            assert f.readline().strip() == "timestamp,measurement,sn,t1,t2"
+
 
 class TestInfluxDBStorage:
     @pytest.fixture
     def mock_client(self):
-        with patch("storage.InfluxDBStorage.InfluxDBClient3") as mock:
+        with patch("influxdb_client_3.InfluxDBClient3") as mock:
             yield mock
 
     @pytest.fixture
@@ -100,7 +315,7 @@ class TestInfluxDBStorage:
         mock_client.return_value.write.assert_called_once()
 
     def test_write_point_has_correct_measurement(self, storage, mock_client):
-        with patch("storage.InfluxDBStorage.Point") as mock_point:
+        with patch("influxdb_client_3.Point") as mock_point:
             mock_point.return_value.time.return_value = mock_point.return_value
             mock_point.return_value.tag.return_value = mock_point.return_value
             mock_point.return_value.field.return_value = mock_point.return_value
@@ -108,7 +323,7 @@ class TestInfluxDBStorage:
         mock_point.assert_called_once_with(MEASUREMENT)
 
     def test_write_point_has_correct_tags(self, storage, mock_client):
-        with patch("storage.InfluxDBStorage.Point") as mock_point:
+        with patch("influxdb_client_3.Point") as mock_point:
             mock_point.return_value.time.return_value = mock_point.return_value
             mock_point.return_value.tag.return_value = mock_point.return_value
             mock_point.return_value.field.return_value = mock_point.return_value
@@ -116,7 +331,7 @@ class TestInfluxDBStorage:
         mock_point.return_value.tag.assert_called_once_with("sn", "abc123")
 
     def test_write_point_has_correct_fields(self, storage, mock_client):
-        with patch("storage.InfluxDBStorage.Point") as mock_point:
+        with patch("influxdb_client_3.Point") as mock_point:
             mock_point.return_value.time.return_value = mock_point.return_value
             mock_point.return_value.tag.return_value = mock_point.return_value
             mock_point.return_value.field.return_value = mock_point.return_value
@@ -125,7 +340,7 @@ class TestInfluxDBStorage:
         assert calls == {("t1", 1234.567), ("t2", 2345.678)}
 
     def test_write_point_has_correct_timestamp(self, storage, mock_client):
-        with patch("storage.InfluxDBStorage.Point") as mock_point:
+        with patch("influxdb_client_3.Point") as mock_point:
             mock_point.return_value.time.return_value = mock_point.return_value
             mock_point.return_value.tag.return_value = mock_point.return_value
             mock_point.return_value.field.return_value = mock_point.return_value
@@ -133,7 +348,7 @@ class TestInfluxDBStorage:
         mock_point.return_value.time.assert_called_once_with(TIMESTAMP)
 
     def test_uses_current_time_when_timestamp_is_none(self, storage, mock_client):
-        with patch("storage.InfluxDBStorage.Point") as mock_point:
+        with patch("influxdb_client_3.Point") as mock_point:
             mock_point.return_value.time.return_value = mock_point.return_value
             mock_point.return_value.tag.return_value = mock_point.return_value
             mock_point.return_value.field.return_value = mock_point.return_value
@@ -146,3 +361,1082 @@ class TestInfluxDBStorage:
     def test_returns_none(self, storage, mock_client):
         result = storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
         assert result is None
+
+
+class TestInfluxDBStorageTable:
+    @pytest.fixture
+    def mock_client(self):
+        with patch("influxdb_client_3.InfluxDBClient3") as mock:
+            yield mock
+
+    def test_lines_match_point_line_protocol(self, mock_client):
+        from influxdb_client_3 import Point
+
+        points = [
+            ("elec tric,ity", {"s n": "a=b", "phase": None}, {"t1": 1.5, "count": 3, "ok": True, "note": 'say "hi"'}, TIMESTAMP),
+            ("elec tric,ity", {"s n": "c"}, {"t1": Decimal("2.25"), "count": None, "ok": False, "note": None}, TIMESTAMP),
+        ]
+        table = PointTable.from_columns(
+            points[0][0],
+            [TIMESTAMP, TIMESTAMP],
+            {"s n": ["a=b", "c"], "phase": [None, None]},
+            {"t1": [1.5, 2.25], "count": [3, None], "ok": [True, False], "note": ['say "hi"', None]},
+        )
+        expected = []
+        for measurement, tags, fields, timestamp in points:
+            point = Point(measurement).time(timestamp)
+            for key, value in tags.items():
+                if value is not None:
+                    point = point.tag(key, value)
+            for key, value in fields.items():
+                if value is not None:
+                    point = point.field(key, float(value) if isinstance(value, Decimal) else value)
+            expected.append(point.to_line_protocol())
+        assert InfluxDBStorage._lines(table).to_pylist() == expected
+
+    def test_lines_skip_rows_without_fields(self, mock_client):
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP, TIMESTAMP], {"sn": ["a", "b"]}, {"t1": [None, 1.0]})
+        assert InfluxDBStorage._lines(table).to_pylist() == ["electricity,sn=b t1=1 1705320000000000000"]
+
+    def test_lines_skip_fields_that_are_null_in_every_row(self, mock_client):
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP], {"sn": ["a"]}, {"t1": [1.5], "returned": [None]})
+        assert InfluxDBStorage._lines(table).to_pylist() == ["electricity,sn=a t1=1.5 1705320000000000000"]
+
+    def test_lines_of_table_without_values_are_empty(self, mock_client):
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP], {"sn": ["a"]}, {"t1": [None]})
+        assert InfluxDBStorage._lines(table).to_pylist() == []
+
+    def test_write_table_writes_lines_in_chunks(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", token="my-token", database="my-database")
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP] * 3, {"sn": ["a", "b", "c"]}, {"t1": [1.0, 2.0, 3.0]})
+        with patch("storage.InfluxDBStorage.TABLE_CHUNK_ROWS", 2):
+            storage.write_table(table)
+        calls = mock_client.return_value.write.call_args_list
+        assert [len(c.kwargs["record"]) for c in calls] == [2, 1]
+        assert calls[0].kwargs["record"][0] == "electricity,sn=a t1=1 1705320000000000000"
+
+
+class TestInfluxDBStorageBatching:
+    @pytest.fixture
+    def mock_client(self):
+        with patch("influxdb_client_3.InfluxDBClient3") as mock:
+            yield mock
+
+    def test_rejects_batch_size_below_one(self, mock_client):
+        with pytest.raises(ValueError):
+            InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=0)
+
+    def test_rejects_max_buffer_below_batch_size(self, mock_client):
+        with pytest.raises(ValueError):
+            InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=10, max_buffer=5)
+
+    def test_buffers_until_batch_is_full(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=3)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        mock_client.return_value.write.assert_not_called()
+
+    def test_writes_full_batch_in_one_call(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=3)
+        for _ in range(3):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        mock_client.return_value.write.assert_called_once()
+        assert len(mock_client.return_value.write.call_args.kwargs["record"]) == 3
+
+    def test_flushes_when_oldest_point_is_stale(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=100, flush_interval=5.0)
+        with patch("storage.InfluxDBStorage.monotonic", side_effect=[0.0, 0.0, 1.0, 6.0]):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            mock_client.return_value.write.assert_not_called()
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert len(mock_client.return_value.write.call_args.kwargs["record"]) == 3
+
+    def test_flush_writes_partial_batch(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=10)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.flush()
+        assert len(mock_client.return_value.write.call_args.kwargs["record"]) == 2
+
+    def test_failed_flush_keeps_points_for_next_batch(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=2)
+        mock_client.return_value.write.side_effect = [OSError("unreachable"), None]
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert mock_client.return_value.write.call_count == 1
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert len(mock_client.return_value.write.call_args.kwargs["record"]) == 4
+
+    def test_drops_oldest_points_beyond_max_buffer(self, mock_client, caplog):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=2, max_buffer=3)
+        mock_client.return_value.write.side_effect = OSError("unreachable")
+        for minute in range(10):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(minute=minute))
+        assert storage.stats() == {"buffered": 3, "dropped": 7}
+        assert max(len(c.kwargs["record"]) for c in mock_client.return_value.write.call_args_list) == 3
+        assert "dropped" in caplog.text
+
+    def test_unbuffered_write_raises_without_keeping_the_point(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db")
+        mock_client.return_value.write.side_effect = [OSError("unreachable"), None]
+        with pytest.raises(OSError):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert not isinstance(mock_client.return_value.write.call_args.kwargs["record"], list)
+        assert storage.stats()["buffered"] == 0
+
+    def test_close_with_backend_down_closes_client(self, mock_client, caplog):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=10)
+        mock_client.return_value.write.side_effect = OSError("unreachable")
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        mock_client.return_value.close.assert_called_once()
+        assert "lost 1 unsent points" in caplog.text
+
+    def test_flushes_stale_points_without_further_writes(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=100, flush_interval=0.05)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        deadline = time.monotonic() + 5
+        while not mock_client.return_value.write.called:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        storage.close()
+        mock_client.return_value.write.assert_called_once()
+
+    def test_flush_without_points_does_not_write(self, mock_client):
+        InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=10).flush()
+        mock_client.return_value.write.assert_not_called()
+
+    def test_write_batch_sends_one_request(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db")
+        storage.write_batch([(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)] * 4)
+        mock_client.return_value.write.assert_called_once()
+        assert len(mock_client.return_value.write.call_args.kwargs["record"]) == 4
+
+    def test_write_batch_flushes_buffered_points_first(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=10)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write_batch([(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)] * 2)
+        records = [c.kwargs["record"] for c in mock_client.return_value.write.call_args_list]
+        assert [len(r) if isinstance(r, list) else 1 for r in records] == [1, 2]
+
+    def test_close_flushes_and_closes_client(self, mock_client):
+        storage = InfluxDBStorage(host="http://localhost:8086", database="db", batch_size=10)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        mock_client.return_value.write.assert_called_once()
+        mock_client.return_value.close.assert_called_once()
+
+
+class TestQueuedStorage:
+    @pytest.fixture
+    def blocked(self):
+        """An inner storage whose writes wait until the event is set."""
+        release = threading.Event()
+        inner = MagicMock()
+        inner.write.side_effect = lambda *args: release.wait(5)
+        yield inner, release
+        release.set()
+
+    def test_rejects_unknown_overflow_policy(self):
+        with pytest.raises(ValueError):
+            QueuedStorage(MagicMock(), overflow="explode")
+
+    def test_spill_requires_path(self):
+        with pytest.raises(ValueError):
+            QueuedStorage(MagicMock(), overflow="spill")
+
+    def test_forwards_writes_to_inner_storage(self):
+        inner = MagicMock()
+        storage = QueuedStorage(inner)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.flush()
+        inner.write.assert_called_once_with(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+
+    def test_stamps_timestamp_at_enqueue(self):
+        inner = MagicMock()
+        storage = QueuedStorage(inner)
+        before = datetime.now(timezone.utc)
+        storage.write(MEASUREMENT, TAGS, FIELDS)
+        after = datetime.now(timezone.utc)
+        storage.close()
+        assert before <= inner.write.call_args.args[3] <= after
+
+    def test_write_does_not_wait_for_inner_storage(self, blocked):
+        inner, release = blocked
+        storage = QueuedStorage(inner, maxsize=10)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert storage.depth >= 1
+        release.set()
+        storage.close()
+        assert inner.write.call_count == 2
+
+    def test_drop_oldest_discards_when_full(self, blocked):
+        inner, release = blocked
+        storage = QueuedStorage(inner, maxsize=1, overflow="drop_oldest")
+        for minute in range(5):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(minute=minute))
+        assert storage.dropped >= 1
+        release.set()
+        storage.close()
+        assert inner.write.call_args.args[3] == TIMESTAMP.replace(minute=4)
+
+    def test_spill_writes_overflow_to_disk_and_replays(self, tmp_path, blocked):
+        inner, release = blocked
+        spill_path = tmp_path / "spill"
+        storage = QueuedStorage(inner, maxsize=1, overflow="spill", spill_path=str(spill_path))
+        fields = {"t1": Decimal("1234.567")}
+        for _ in range(4):
+            storage.write(MEASUREMENT, TAGS, fields, TIMESTAMP)
+        assert storage.spilled >= 1
+        assert list(spill_path.glob("*.log"))
+        release.set()
+        storage.close()
+        replayed = inner.write_batch.call_args.args[0]
+        assert inner.write.call_count + len(replayed) == 4
+        assert replayed[-1] == (MEASUREMENT, TAGS, fields, TIMESTAMP)
+        assert not list(spill_path.glob("*.log"))
+
+    def test_replays_spill_between_live_writes(self, tmp_path):
+        spilled = [(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(minute=minute)) for minute in range(3)]
+        log = SegmentLog(str(tmp_path))
+        log.append(spilled)
+        log.close()
+        inner = MagicMock()
+        storage = QueuedStorage(inner, overflow="spill", spill_path=str(tmp_path), replay_batch_size=2)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.flush()
+        inner.write_batch.assert_called_once_with(spilled[:2])
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.flush()
+        assert inner.write_batch.call_args.args[0] == spilled[2:]
+        assert storage.stats()["written"] == 5
+        storage.close()
+
+    def test_inner_failure_does_not_stop_worker(self):
+        inner = MagicMock()
+        inner.write.side_effect = [RuntimeError("down"), None]
+        storage = QueuedStorage(inner)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        assert storage.failed == 1
+        assert storage.written == 1
+
+    def test_reports_latency(self):
+        storage = QueuedStorage(MagicMock())
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        stats = storage.stats()
+        assert stats["written"] == 1
+        assert stats["depth"] == 0
+        assert stats["max_latency"] >= stats["mean_latency"] > 0
+
+    def test_close_closes_inner_storage(self):
+        inner = MagicMock()
+        QueuedStorage(inner).close()
+        inner.close.assert_called_once()
+
+    def test_batches_queued_points(self, blocked):
+        inner, release = blocked
+        storage = QueuedStorage(inner, batch_size=3)
+        for minute in range(4):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(minute=minute))
+        release.set()
+        storage.close()
+        batches = [[p[3].minute for p in c.args[0]] for c in inner.write_batch.call_args_list]
+        written = [c.args[3].minute for c in inner.write.call_args_list]
+        assert sorted(written + [m for batch in batches for m in batch]) == [0, 1, 2, 3]
+        assert all(len(batch) <= 3 for batch in batches)
+        assert storage.written == 4
+
+    @patch("storage.QueuedStorage.sleep")
+    def test_retries_failed_writes(self, mock_sleep):
+        inner = MagicMock()
+        inner.write.side_effect = [ConnectionError("down"), ConnectionError("down"), None]
+        storage = QueuedStorage(inner, retries=2, backoff=0.5)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+        assert storage.written == 1
+        assert storage.retried == 2
+        assert storage.failed == 0
+
+    @patch("storage.QueuedStorage.sleep")
+    def test_gives_up_after_retries(self, mock_sleep):
+        inner = MagicMock()
+        inner.write.side_effect = ConnectionError("down")
+        storage = QueuedStorage(inner, retries=1)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        assert inner.write.call_count == 2
+        assert storage.failed == 1
+
+    def test_rejects_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            QueuedStorage(MagicMock(), batch_size=0)
+
+
+class TestFanoutStorage:
+    def test_writes_every_point_to_every_storage(self):
+        a, b = MagicMock(), MagicMock()
+        storage = FanoutStorage([a, b])
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        a.write.assert_called_once_with(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        b.write.assert_called_once_with(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+
+    def test_stamps_one_timestamp_for_all_storages(self):
+        a, b = MagicMock(), MagicMock()
+        storage = FanoutStorage([a, b])
+        storage.write(MEASUREMENT, TAGS, FIELDS)
+        storage.close()
+        assert a.write.call_args.args[3] is b.write.call_args.args[3]
+
+    def test_fast_storage_does_not_wait_for_slow_one(self):
+        release = threading.Event()
+        slow, fast = MagicMock(), MagicMock()
+        slow.write.side_effect = lambda *args: release.wait(5)
+        storage = FanoutStorage([QueuedStorage(slow, maxsize=1, overflow="drop_oldest"), fast])
+        for _ in range(5):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.storages[1].flush()
+        assert fast.write.call_count == 5
+        release.set()
+        storage.close()
+
+    def test_failing_storage_does_not_affect_others(self):
+        failing, healthy = MagicMock(), MagicMock()
+        failing.write.side_effect = ConnectionError("down")
+        storage = FanoutStorage([failing, healthy])
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        healthy.write.assert_called_once()
+        assert [s["failed"] for s in storage.stats()] == [1, 0]
+
+    def test_keeps_configured_queues(self):
+        queued = QueuedStorage(MagicMock(), batch_size=10)
+        storage = FanoutStorage([queued, MagicMock()], batch_size=2)
+        assert storage.storages[0] is queued
+        assert storage.storages[1].batch_size == 2
+        storage.close()
+
+    def test_write_batch_reaches_every_storage(self):
+        a, b = MagicMock(), MagicMock()
+        storage = FanoutStorage([a, b], batch_size=10)
+        storage.write_batch([(MEASUREMENT, TAGS, FIELDS, TIMESTAMP), (MEASUREMENT, TAGS, FIELDS, None)])
+        storage.close()
+        for inner in (a, b):
+            points = [p for c in inner.write_batch.call_args_list for p in c.args[0]]
+            points += [c.args for c in inner.write.call_args_list]
+            assert len(points) == 2
+            assert all(p[3] is not None for p in points)
+
+    def test_close_closes_every_storage(self):
+        a, b = MagicMock(), MagicMock()
+        FanoutStorage([a, b]).close()
+        a.close.assert_called_once()
+        b.close.assert_called_once()
+
+    def test_rejects_empty_storages(self):
+        with pytest.raises(ValueError):
+            FanoutStorage([])
+
+
+class TestSegmentLog:
+    POINT = (MEASUREMENT, TAGS, {"t1": Decimal("1234.567"), "count": 3}, TIMESTAMP)
+
+    def test_starts_empty(self, tmp_path):
+        assert SegmentLog(str(tmp_path)).empty
+
+    def test_reads_appended_points_in_order(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        points = [(MEASUREMENT, TAGS, {"n": n}, TIMESTAMP) for n in range(5)]
+        log.append(points)
+        read, _ = log.read(10)
+        assert read == points
+
+    def test_round_trips_decimal_fields(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        log.append([self.POINT])
+        read, _ = log.read(1)
+        assert read == [self.POINT]
+        assert isinstance(read[0][2]["t1"], Decimal)
+
+    def test_read_respects_limit(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        log.append([self.POINT] * 5)
+        read, _ = log.read(2)
+        assert len(read) == 2
+
+    def test_ack_advances_cursor(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        log.append([(MEASUREMENT, TAGS, {"n": n}, TIMESTAMP) for n in range(3)])
+        _, cursor = log.read(2)
+        log.ack(cursor)
+        read, _ = log.read(10)
+        assert [p[2]["n"] for p in read] == [2]
+
+    def test_unacked_points_are_read_again(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        log.append([self.POINT] * 2)
+        log.read(2)
+        read, _ = log.read(2)
+        assert len(read) == 2
+
+    def test_fsyncs_each_append(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        with patch("storage.SegmentLog.os.fsync") as fsync:
+            log.append([self.POINT])
+            log.append([self.POINT])
+        assert fsync.call_count == 2
+
+    def test_batches_fsync(self, tmp_path):
+        log = SegmentLog(str(tmp_path), sync_every=3)
+        with patch("storage.SegmentLog.os.fsync") as fsync:
+            for _ in range(4):
+                log.append([self.POINT])
+            assert fsync.call_count == 1
+            log.close()
+        assert fsync.call_count == 2
+
+    def test_rolls_over_to_new_segment(self, tmp_path):
+        log = SegmentLog(str(tmp_path), segment_bytes=1)
+        log.append([self.POINT])
+        log.append([self.POINT])
+        assert len(list(tmp_path.glob("*.log"))) == 2
+        read, _ = log.read(10)
+        assert len(read) == 2
+
+    def test_ack_deletes_consumed_segments(self, tmp_path):
+        log = SegmentLog(str(tmp_path), segment_bytes=1)
+        log.append([self.POINT])
+        log.append([self.POINT])
+        _, cursor = log.read(10)
+        log.ack(cursor)
+        assert list(tmp_path.glob("*.log")) == []
+        assert log.empty
+
+    def test_appends_after_full_ack_are_readable(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        log.append([self.POINT])
+        log.ack(log.read(10)[1])
+        log.append([(MEASUREMENT, TAGS, {"n": 1}, TIMESTAMP)])
+        read, _ = log.read(10)
+        assert read == [(MEASUREMENT, TAGS, {"n": 1}, TIMESTAMP)]
+
+    def test_cursor_survives_reopen(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        log.append([(MEASUREMENT, TAGS, {"n": n}, TIMESTAMP) for n in range(3)])
+        log.ack(log.read(1)[1])
+        log.close()
+        read, _ = SegmentLog(str(tmp_path)).read(10)
+        assert [p[2]["n"] for p in read] == [1, 2]
+
+    def test_skips_corrupt_entries(self, tmp_path):
+        log = SegmentLog(str(tmp_path))
+        log.append([self.POINT])
+        with open(next(tmp_path.glob("*.log")), "a") as f:
+            f.write("not json\n")
+        log.append([self.POINT])
+        read, _ = log.read(10)
+        assert len(read) == 2
+
+
+class TestSpoolStorage:
+    def test_sends_batches_to_inner_storage(self, tmp_path):
+        inner = MagicMock()
+        storage = SpoolStorage(inner, str(tmp_path), batch_size=2)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        inner.write_batch.assert_not_called()
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        inner.write_batch.assert_called_once_with([(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)] * 2)
+
+    def test_does_not_raise_when_inner_storage_fails(self, tmp_path):
+        inner = MagicMock()
+        inner.write_batch.side_effect = ConnectionError("unreachable")
+        storage = SpoolStorage(inner, str(tmp_path), batch_size=1)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert storage.failures == 1
+        assert storage.pending_bytes > 0
+
+    def test_backs_off_after_failure(self, tmp_path):
+        inner = MagicMock()
+        inner.write_batch.side_effect = ConnectionError("unreachable")
+        storage = SpoolStorage(inner, str(tmp_path), batch_size=1, backoff=60.0)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert inner.write_batch.call_count == 1
+
+    def test_replays_backlog_once_backend_recovers(self, tmp_path):
+        inner = MagicMock()
+        inner.write_batch.side_effect = [ConnectionError("unreachable"), None, None, None]
+        storage = SpoolStorage(inner, str(tmp_path), batch_size=2, backoff=0.0)
+        for minute in range(5):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(minute=minute))
+        storage.flush()
+        sent = [p for c in inner.write_batch.call_args_list[1:] for p in c.args[0]]
+        assert [p[3].minute for p in sent] == [0, 1, 2, 3, 4]
+        assert storage.pending_bytes == 0
+
+    def test_compacts_acknowledged_segments(self, tmp_path):
+        storage = SpoolStorage(MagicMock(), str(tmp_path), batch_size=1, segment_bytes=1)
+        for _ in range(3):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert list(tmp_path.glob("*.log")) == []
+
+    def test_replays_points_left_by_previous_run(self, tmp_path):
+        failing = MagicMock()
+        failing.write_batch.side_effect = ConnectionError("unreachable")
+        SpoolStorage(failing, str(tmp_path), batch_size=1).write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+
+        inner = MagicMock()
+        SpoolStorage(inner, str(tmp_path), batch_size=10).write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert len(inner.write_batch.call_args.args[0]) == 2
+
+    def test_saves_cursor_once_per_replay(self, tmp_path):
+        storage = SpoolStorage(MagicMock(), str(tmp_path), batch_size=1)
+        with patch("storage.SegmentLog.os.replace") as replace:
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert replace.call_count == 1
+
+    def test_stamps_missing_timestamp(self, tmp_path):
+        inner = MagicMock()
+        storage = SpoolStorage(inner, str(tmp_path), batch_size=1)
+        storage.write(MEASUREMENT, TAGS, FIELDS)
+        assert isinstance(inner.write_batch.call_args.args[0][0][3], datetime)
+
+    def test_close_replays_and_closes_inner(self, tmp_path):
+        inner = MagicMock()
+        storage = SpoolStorage(inner, str(tmp_path), batch_size=10)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        inner.write_batch.assert_called_once()
+        inner.close.assert_called_once()
+
+
+class TestDeadbandStorage:
+    def at(self, seconds: int) -> datetime:
+        return datetime.fromtimestamp(TIMESTAMP.timestamp() + seconds, timezone.utc)
+
+    def test_writes_first_point_of_each_series(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, {"sn": "other"}, FIELDS, TIMESTAMP)
+        storage.write("gas", TAGS, FIELDS, TIMESTAMP)
+        assert inner.write.call_count == 3
+
+    def test_suppresses_unchanged_point(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, self.at(1))
+        inner.write.assert_called_once_with(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert storage.suppressed == 1
+
+    def test_writes_whole_point_when_any_field_changes(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        changed = {**FIELDS, "t2": 2345.679}
+        storage.write(MEASUREMENT, TAGS, changed, self.at(1))
+        inner.write.assert_called_with(MEASUREMENT, TAGS, changed, self.at(1))
+
+    def test_absolute_deadband(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner, absolute=0.5)
+        storage.write("power", TAGS, {"current": Decimal("1.000")}, TIMESTAMP)
+        storage.write("power", TAGS, {"current": Decimal("1.400")}, self.at(1))
+        storage.write("power", TAGS, {"current": Decimal("1.300")}, self.at(2))
+        assert inner.write.call_count == 1
+        storage.write("power", TAGS, {"current": Decimal("1.600")}, self.at(3))
+        assert inner.write.call_count == 2
+
+    def test_compares_with_last_written_value(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner, absolute=0.5)
+        for second, value in enumerate([1.0, 1.2, 1.4, 1.6]):
+            storage.write("power", TAGS, {"current": value}, self.at(second))
+        assert [c.args[2]["current"] for c in inner.write.call_args_list] == [1.0, 1.6]
+
+    def test_relative_deadband(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner, relative=0.1)
+        storage.write("power", TAGS, {"current": 100.0}, TIMESTAMP)
+        storage.write("power", TAGS, {"current": 109.0}, self.at(1))
+        assert inner.write.call_count == 1
+        storage.write("power", TAGS, {"current": 111.0}, self.at(2))
+        assert inner.write.call_count == 2
+
+    def test_per_field_deadband(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner, absolute={"current": 1.0})
+        storage.write("power", TAGS, {"current": 1.0, "t1": 10.0}, TIMESTAMP)
+        storage.write("power", TAGS, {"current": 1.5, "t1": 10.0}, self.at(1))
+        assert inner.write.call_count == 1
+        storage.write("power", TAGS, {"current": 1.5, "t1": 10.001}, self.at(2))
+        assert inner.write.call_count == 2
+
+    def test_non_numeric_fields_compare_by_equality(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner, absolute=100.0)
+        storage.write("tariff", TAGS, {"active": "0001"}, TIMESTAMP)
+        storage.write("tariff", TAGS, {"active": "0001"}, self.at(1))
+        storage.write("tariff", TAGS, {"active": "0002"}, self.at(2))
+        assert inner.write.call_count == 2
+
+    def test_heartbeat_writes_unchanged_point(self):
+        inner = MagicMock()
+        storage = DeadbandStorage(inner, heartbeat=60.0)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, self.at(59))
+        assert inner.write.call_count == 1
+        storage.write(MEASUREMENT, TAGS, FIELDS, self.at(60))
+        assert inner.write.call_count == 2
+
+    @patch("storage.DeadbandStorage.time")
+    def test_heartbeat_uses_clock_without_timestamp(self, mock_time):
+        mock_time.side_effect = [0.0, 10.0, 400.0]
+        inner = MagicMock()
+        storage = DeadbandStorage(inner)
+        for _ in range(3):
+            storage.write(MEASUREMENT, TAGS, FIELDS)
+        assert inner.write.call_count == 2
+
+    def test_rejects_negative_deadband(self):
+        with pytest.raises(ValueError):
+            DeadbandStorage(MagicMock(), absolute={"current": -1.0})
+
+    def test_rejects_non_positive_heartbeat(self):
+        with pytest.raises(ValueError):
+            DeadbandStorage(MagicMock(), heartbeat=0)
+
+    def test_close_closes_inner(self):
+        inner = MagicMock()
+        DeadbandStorage(inner).close()
+        inner.close.assert_called_once()
+
+
+class TestAggregateStorage:
+    def at(self, seconds: float) -> datetime:
+        return datetime.fromtimestamp(TIMESTAMP.timestamp() + seconds, timezone.utc)
+
+    def write_series(self, storage, values, step=10, measurement="power"):
+        for i, value in enumerate(values):
+            storage.write(measurement, TAGS, {"current": value}, self.at(i * step))
+
+    def test_emits_once_per_tumbling_window(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60)
+        self.write_series(storage, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        inner.write.assert_not_called()
+        storage.write("power", TAGS, {"current": 7.0}, self.at(60))
+        inner.write.assert_called_once_with(
+            "power",
+            TAGS,
+            {"current_min": 1.0, "current_max": 6.0, "current_mean": 3.5, "current_last": 6.0, "count": 6},
+            TIMESTAMP,
+        )
+
+    def test_windows_are_aligned_to_epoch(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60)
+        storage.write("power", TAGS, {"current": 1.0}, self.at(30))
+        storage.write("power", TAGS, {"current": 1.0}, self.at(60))
+        assert inner.write.call_args.args[3] == TIMESTAMP
+
+    def test_selected_aggregates(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=["mean"])
+        self.write_series(storage, [1.0, 3.0, 0.0], step=30)
+        assert inner.write.call_args.args[2] == {"current_mean": 2.0}
+
+    def test_converts_decimals(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=["max"])
+        self.write_series(storage, [Decimal("1.5"), Decimal("0.5"), Decimal("0")], step=30)
+        assert inner.write.call_args.args[2] == {"current_max": 1.5}
+
+    def test_keeps_last_non_numeric_value(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=["count"])
+        storage.write("tariff", TAGS, {"active": "0001"}, self.at(0))
+        storage.write("tariff", TAGS, {"active": "0002"}, self.at(30))
+        storage.write("tariff", TAGS, {"active": "0002"}, self.at(60))
+        assert inner.write.call_args.args[2] == {"active": "0002", "count": 2}
+
+    def test_integrates_energy(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=3600, aggregates=[], integrate=["current"])
+        self.write_series(storage, [1.0, 1.0, 3.0, 0.0], step=1800)
+        assert inner.write.call_args.args[2] == {"current_energy": 1.5}
+        storage.close()
+        assert inner.write.call_args.args[2] == {"current_energy": 0.75}
+
+    def test_splits_energy_at_window_boundary(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=[], integrate=["current"])
+        self.write_series(storage, [0.0, 7.2], step=90)
+        storage.close()
+        energies = [c.args[2]["current_energy"] for c in inner.write.call_args_list]
+        assert energies == pytest.approx([0.04, 0.05])
+
+    def test_energy_carries_across_windows(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=[], integrate=["current"])
+        self.write_series(storage, [3.6] * 13)
+        energies = [c.args[2]["current_energy"] for c in inner.write.call_args_list]
+        assert energies == pytest.approx([0.06, 0.06])
+
+    def test_splits_energy_across_skipped_windows(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=["count"], integrate=["current"])
+        self.write_series(storage, [3.6, 3.6], step=180)
+        storage.close()
+        emitted = [(c.args[3], c.args[2]) for c in inner.write.call_args_list]
+        assert [timestamp for timestamp, _ in emitted] == [self.at(0), self.at(60), self.at(120), self.at(180)]
+        assert [fields["count"] for _, fields in emitted] == [1, 0, 0, 1]
+        assert [fields["current_energy"] for _, fields in emitted] == pytest.approx([0.06, 0.06, 0.06, 0.0])
+
+    def test_sliding_window(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, slide=30, aggregates=["min", "max"])
+        self.write_series(storage, [1.0, 2.0, 3.0, 4.0], step=30)
+        emitted = [(c.args[3], c.args[2]) for c in inner.write.call_args_list]
+        assert emitted == [
+            (self.at(-30), {"current_min": 1.0, "current_max": 1.0}),
+            (self.at(0), {"current_min": 1.0, "current_max": 2.0}),
+            (self.at(30), {"current_min": 2.0, "current_max": 3.0}),
+        ]
+
+    def test_sliding_window_expires_panes_after_gap(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, slide=30, aggregates=["count"])
+        storage.write("power", TAGS, {"current": 1.0}, self.at(0))
+        storage.write("power", TAGS, {"current": 1.0}, self.at(300))
+        storage.write("power", TAGS, {"current": 1.0}, self.at(330))
+        assert [c.args[2]["count"] for c in inner.write.call_args_list] == [1, 1, 1]
+
+    def test_keeps_series_apart(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=["count"])
+        storage.write("power", {"sn": "a"}, {"current": 1.0}, self.at(0))
+        storage.write("power", {"sn": "b"}, {"current": 1.0}, self.at(0))
+        storage.write("power", {"sn": "a"}, {"current": 1.0}, self.at(60))
+        inner.write.assert_called_once_with("power", {"sn": "a"}, {"count": 1}, TIMESTAMP)
+
+    def test_close_emits_partial_windows(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60, aggregates=["count"])
+        storage.write("power", TAGS, {"current": 1.0}, self.at(0))
+        storage.close()
+        inner.write.assert_called_once_with("power", TAGS, {"count": 1}, TIMESTAMP)
+        inner.close.assert_called_once()
+
+    def test_flush_does_not_close_windows(self):
+        inner = MagicMock()
+        storage = AggregateStorage(inner, window=60)
+        storage.write("power", TAGS, {"current": 1.0}, self.at(0))
+        storage.flush()
+        inner.write.assert_not_called()
+        inner.flush.assert_called_once()
+
+    @pytest.mark.parametrize("kwargs", [
+        {"window": 0},
+        {"window": 60, "slide": 25},
+        {"window": 60, "slide": 120},
+        {"aggregates": ["median"]},
+    ])
+    def test_rejects_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            AggregateStorage(MagicMock(), **kwargs)
+
+
+class TestParquetStorage:
+    @pytest.fixture(autouse=True)
+    def pq(self):
+        return pytest.importorskip("pyarrow.parquet")
+
+    def test_rejects_row_group_size_below_one(self, tmp_path):
+        with pytest.raises(ValueError):
+            ParquetStorage(str(tmp_path), row_group_size=0)
+
+    def test_partitions_by_measurement_and_day(self, tmp_path):
+        storage = ParquetStorage(str(tmp_path))
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write("gas", TAGS, {"reading": 12.5}, TIMESTAMP)
+        storage.close()
+        assert (tmp_path / "measurement=electricity" / "date=2024-01-15" / "part-00000.parquet").exists()
+        assert (tmp_path / "measurement=gas" / "date=2024-01-15" / "part-00000.parquet").exists()
+
+    def test_writes_columns(self, tmp_path, pq):
+        storage = ParquetStorage(str(tmp_path))
+        storage.write(MEASUREMENT, TAGS, {"t1": Decimal("1234.567"), "t2": 2345.678}, TIMESTAMP)
+        storage.close()
+        table = pq.read_table(tmp_path / "measurement=electricity" / "date=2024-01-15" / "part-00000.parquet")
+        assert table.to_pylist() == [{"timestamp": TIMESTAMP, "sn": "abc123", "t1": 1234.567, "t2": 2345.678}]
+
+    def test_buffers_until_row_group_is_full(self, tmp_path, pq):
+        storage = ParquetStorage(str(tmp_path), row_group_size=2, flush_interval=None)
+        for _ in range(3):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.flush()
+        storage.close()
+        metadata = pq.ParquetFile(tmp_path / "measurement=electricity" / "date=2024-01-15" / "part-00000.parquet").metadata
+        assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [2, 1]
+
+    def test_flush_writes_only_stale_buffers(self, tmp_path, pq):
+        storage = ParquetStorage(str(tmp_path), flush_interval=5.0)
+        with patch("storage.ParquetStorage.monotonic", side_effect=[0.0, 1.0, 2.0, 6.0, 6.0]):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            storage.flush()
+            assert not list(tmp_path.iterdir())
+            storage.flush()
+        assert not storage._writers
+        assert pq.read_table(tmp_path / "measurement=electricity").num_rows == 1
+
+    def test_closes_open_file_after_flush_interval(self, tmp_path, pq):
+        storage = ParquetStorage(str(tmp_path), row_group_size=1, flush_interval=5.0)
+        with patch("storage.ParquetStorage.monotonic", side_effect=[0.0, 0.0, 1.0, 2.0, 6.0]):
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            storage.flush()
+            assert storage._writers
+            storage.flush()
+        assert not storage._writers
+        assert pq.read_table(tmp_path / "measurement=electricity").num_rows == 1
+
+    def test_closes_previous_day_file(self, tmp_path, pq):
+        storage = ParquetStorage(str(tmp_path))
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(day=16))
+        table = pq.read_table(tmp_path / "measurement=electricity" / "date=2024-01-15" / "part-00000.parquet")
+        assert table.num_rows == 1
+        storage.close()
+
+    def test_fills_missing_fields_with_null(self, tmp_path, pq):
+        storage = ParquetStorage(str(tmp_path))
+        storage.write(MEASUREMENT, TAGS, {"t1": 1.0}, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, {"t2": 2.0}, TIMESTAMP)
+        storage.close()
+        table = pq.read_table(tmp_path / "measurement=electricity")
+        assert table.column("t1").to_pylist() == [1.0, None]
+        assert table.column("t2").to_pylist() == [None, 2.0]
+
+    def test_starts_new_file_on_schema_change(self, tmp_path):
+        storage = ParquetStorage(str(tmp_path), row_group_size=1)
+        storage.write(MEASUREMENT, TAGS, {"t1": 1.0}, TIMESTAMP)
+        storage.write(MEASUREMENT, TAGS, {"t1": 1.0, "t3": 3.0}, TIMESTAMP)
+        storage.close()
+        assert len(list((tmp_path / "measurement=electricity" / "date=2024-01-15").iterdir())) == 2
+
+    def test_does_not_overwrite_existing_parts(self, tmp_path):
+        for _ in range(2):
+            storage = ParquetStorage(str(tmp_path))
+            storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+            storage.close()
+        assert len(list((tmp_path / "measurement=electricity" / "date=2024-01-15").iterdir())) == 2
+
+
+class TestSQLiteStorage:
+    @pytest.fixture
+    def storage(self, tmp_path):
+        storage = SQLiteStorage(str(tmp_path / "meteread.db"))
+        yield storage
+        storage.close()
+
+    def test_rejects_batch_size_below_one(self, tmp_path):
+        with pytest.raises(ValueError):
+            SQLiteStorage(str(tmp_path / "meteread.db"), batch_size=0)
+
+    def test_uses_wal_journal(self, storage):
+        assert storage._connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    def test_creates_table_per_measurement_with_index(self, storage):
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.write("gas", TAGS, {"reading": 12.5}, TIMESTAMP)
+        storage.flush()
+        assert storage.measurements() == ["electricity", "gas"]
+        indexes = storage._connection.execute("PRAGMA index_list(electricity)").fetchall()
+        index = indexes[0][1]
+        assert [row[2] for row in storage._connection.execute(f"PRAGMA index_info({index})")] == ["sn", "timestamp"]
+
+    def test_query_round_trips_points(self, storage):
+        storage.write(MEASUREMENT, TAGS, {"t1": Decimal("1234.567"), "t2": 2345.678}, TIMESTAMP)
+        assert list(storage.query(MEASUREMENT)) == [(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)]
+
+    def test_buffers_until_batch_is_full(self, tmp_path):
+        path = str(tmp_path / "meteread.db")
+        storage = SQLiteStorage(path, batch_size=2, flush_interval=None)
+        other = SQLiteStorage(path)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert other.measurements() == []
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert len(list(other.query(MEASUREMENT))) == 2
+        storage.close()
+        other.close()
+
+    def test_write_batch_inserts_in_one_transaction(self, storage):
+        storage.write_batch([(MEASUREMENT, TAGS, FIELDS, TIMESTAMP), ("gas", TAGS, {"reading": 1.0}, None)])
+        assert storage._points == []
+        assert len(list(storage.query("gas"))) == 1
+
+    def test_query_filters_by_time_range_and_tags(self, storage):
+        for minute in range(4):
+            storage.write(MEASUREMENT, TAGS, {"t1": float(minute)}, TIMESTAMP.replace(minute=minute))
+        storage.write(MEASUREMENT, {"sn": "other"}, {"t1": 9.0}, TIMESTAMP.replace(minute=1))
+        points = storage.query(MEASUREMENT, start=TIMESTAMP.replace(minute=1), end="2024-01-15T12:03:00+00:00", tags=TAGS)
+        assert [p[2]["t1"] for p in points] == [1.0, 2.0]
+
+    def test_adds_columns_for_new_fields(self, storage):
+        storage.write(MEASUREMENT, TAGS, {"t1": 1.0}, TIMESTAMP)
+        storage.flush()
+        storage.write(MEASUREMENT, TAGS, {"t3": 3.0}, TIMESTAMP)
+        assert [p[2] for p in storage.query(MEASUREMENT)] == [{"t1": 1.0}, {"t3": 3.0}]
+
+    def test_writes_after_failed_flush(self, storage):
+        storage.write(MEASUREMENT, TAGS, {"t1": [1.0]}, TIMESTAMP)
+        with pytest.raises(sqlite3.Error):
+            storage.flush()
+        storage.write(MEASUREMENT, TAGS, {"t1": 1.0}, TIMESTAMP)
+        storage.flush()
+        assert list(storage.query(MEASUREMENT)) == [(MEASUREMENT, TAGS, {"t1": 1.0}, TIMESTAMP)]
+
+    def test_failed_transaction_keeps_points_for_retry(self, storage):
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        with patch.object(storage, "_prepare", side_effect=sqlite3.OperationalError("database is locked")):
+            with pytest.raises(sqlite3.OperationalError):
+                storage.flush()
+        assert storage.stats()["buffered"] == 1
+        storage.write(MEASUREMENT, TAGS, {"t1": 1.0}, TIMESTAMP)
+        assert [p[2] for p in storage.query(MEASUREMENT)] == [FIELDS, {"t1": 1.0}]
+
+    def test_write_keeps_points_when_database_is_locked(self, tmp_path, caplog):
+        storage = SQLiteStorage(str(tmp_path / "meteread.db"), batch_size=2, max_buffer=3)
+        with patch.object(storage, "_prepare", side_effect=sqlite3.OperationalError("database is locked")):
+            for minute in range(5):
+                storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP.replace(minute=minute))
+        assert storage.stats() == {"buffered": 3, "dropped": 2}
+        assert "dropped 1 oldest points" in caplog.text
+        storage.flush()
+        assert [p[3].minute for p in storage.query(MEASUREMENT)] == [2, 3, 4]
+        storage.close()
+
+    def test_query_unknown_measurement_is_empty(self, storage):
+        assert list(storage.query("water")) == []
+
+    def test_reopens_existing_database(self, tmp_path):
+        path = str(tmp_path / "meteread.db")
+        storage = SQLiteStorage(path)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        storage.close()
+        storage = SQLiteStorage(path)
+        storage.write(MEASUREMENT, TAGS, {"t1": 1.0, "t3": 3.0}, TIMESTAMP)
+        assert [p[1] for p in storage.query(MEASUREMENT)] == [TAGS, TAGS]
+        storage.close()
+
+
+class TestForwardingStorage:
+    def test_sends_full_batches(self):
+        queue = MagicMock()
+        storage = ForwardingStorage(queue, "csv", batch_size=2, flush_interval=60)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        queue.put.assert_not_called()
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        queue.put.assert_called_once_with(("points", "csv", [(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)] * 2))
+        assert storage.forwarded == 2
+
+    @patch("storage.ForwardingStorage.monotonic")
+    def test_sends_partial_batch_after_flush_interval(self, mock_monotonic):
+        mock_monotonic.side_effect = [0, 0.5, 2, 2]
+        queue = MagicMock()
+        storage = ForwardingStorage(queue, "csv", batch_size=100, flush_interval=1.0)
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        queue.put.assert_not_called()
+        storage.write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert len(queue.put.call_args.args[0][2]) == 2
+
+    def test_fills_in_missing_timestamp(self):
+        queue = MagicMock()
+        storage = ForwardingStorage(queue, "csv", batch_size=1)
+        storage.write(MEASUREMENT, TAGS, FIELDS)
+        (_, _, [point]), = queue.put.call_args.args
+        assert point[3].tzinfo is timezone.utc
+
+    def test_flush_sends_buffered_points_once(self):
+        queue = MagicMock()
+        storage = ForwardingStorage(queue, "csv", batch_size=100, flush_interval=60)
+        storage.write_batch([(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)] * 3)
+        storage.flush()
+        storage.close()
+        queue.put.assert_called_once()
+        assert storage.stats() == {"forwarded": 3, "buffered": 0}
+
+    def test_rejects_empty_batch(self):
+        with pytest.raises(ValueError):
+            ForwardingStorage(MagicMock(), "csv", batch_size=0)
+
+
+class TestInstrumentedStorage:
+    def test_write_delegates_and_records_latency(self):
+        inner = MagicMock()
+        metrics = Metrics()
+        InstrumentedStorage(inner, metrics, "csv").write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        inner.write.assert_called_once_with(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        (name, labels, histogram), _ = metrics.histograms()
+        assert (name, labels, histogram.count) == ("meteread_storage_write_seconds", {"storage": "csv"}, 1)
+
+    def test_write_batch_records_batch_size(self):
+        inner = MagicMock()
+        metrics = Metrics()
+        InstrumentedStorage(inner, metrics, "csv").write_batch([(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)] * 3)
+        inner.write_batch.assert_called_once()
+        sizes = metrics.histogram("meteread_storage_batch_size", "", storage="csv")
+        assert (sizes.count, sizes.sum) == (1, 3)
+
+    def test_write_table_delegates_and_records_rows(self):
+        inner = MagicMock()
+        metrics = Metrics()
+        table = PointTable.from_columns(MEASUREMENT, [TIMESTAMP] * 4, {}, {"t1": [1.0] * 4})
+        InstrumentedStorage(inner, metrics, "csv").write_table(table)
+        inner.write_table.assert_called_once_with(table)
+        sizes = metrics.histogram("meteread_storage_batch_size", "", storage="csv")
+        assert (sizes.count, sizes.sum) == (1, 4)
+
+    def test_records_failed_writes(self):
+        inner = MagicMock()
+        inner.write.side_effect = OSError
+        metrics = Metrics()
+        with pytest.raises(OSError):
+            InstrumentedStorage(inner, metrics, "csv").write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+        assert metrics.histograms()[0][2].count == 1
+
+    def test_flush_and_close_delegate(self):
+        inner = MagicMock()
+        storage = InstrumentedStorage(inner, Metrics(), "csv")
+        storage.flush()
+        storage.close()
+        inner.flush.assert_called_once()
+        inner.close.assert_called_once()
+
+
+class TestAsyncStorageAdapter:
+    def test_write_calls_wrapped_storage(self):
+        inner = MagicMock()
+        asyncio.run(AsyncStorageAdapter(inner).write(MEASUREMENT, TAGS, FIELDS, TIMESTAMP))
+        inner.write.assert_called_once_with(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)
+
+    def test_write_batch_calls_wrapped_storage(self):
+        inner = MagicMock()
+        points = [(MEASUREMENT, TAGS, FIELDS, TIMESTAMP)]
+        asyncio.run(AsyncStorageAdapter(inner).write_batch(points))
+        inner.write_batch.assert_called_once_with(points)
+
+    def test_close_closes_wrapped_storage(self):
+        inner = MagicMock()
+        asyncio.run(AsyncStorageAdapter(inner).close())
+        inner.close.assert_called_once()